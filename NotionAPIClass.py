@@ -1,7 +1,13 @@
 import os, requests
 from dotenv import load_dotenv
 from notion_client import Client
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
+from app.services.ratelimit import NotionLimiter, get_notion_limiter
+from app.services.query import compile_conditions
+from app.services.records import TaskRecord
+from app.services.schema import PROP_CATEGORY, PROP_DATE, PROP_NOTES, PROP_STATUS, PROP_TITLE
+
+_ROW_FIELDS = ("page_id", "title", "status", "category", "date", "url")
 
 # =========================
 # Agent‑friendly Notion Todo Client
@@ -11,30 +17,21 @@ class NotionTodoClient:
     It exposes clean methods Agent code can call, and an executor for JSON plans
     produced by the planner prompt (intent/create/update/delete/query).
     """
-    def __init__(self, notion_client: Client, database_id: str):
+    def __init__(self, notion_client: Client, database_id: str, limiter: Optional[NotionLimiter] = None):
         self.notion = notion_client
         self.database_id = database_id.replace("-", "")
+        # Shared token bucket + 429-aware retry (same budget as the FastAPI service)
+        self.limiter = limiter or get_notion_limiter()
+
+    def _call(self, method: str, **kwargs: Any) -> Any:
+        endpoint, action = method.split(".")
+        fn = getattr(getattr(self.notion, endpoint), action)
+        return self.limiter.call(fn, idempotent=method != "pages.create", **kwargs)
 
     # ---- Utility ----
     @staticmethod
     def _extract_rows(resp: Dict[str, Any]) -> List[Dict[str, Any]]:
-        rows: List[Dict[str, Any]] = []
-        for page in resp.get("results", []):
-            props = page.get("properties", {})
-            title_parts = (props.get("할 일", {}) or {}).get("title", [])
-            title = "".join([t.get("plain_text", "") for t in title_parts])
-            status = ((props.get("상태") or {}).get("status") or {}).get("name")
-            category = ((props.get("카테고리") or {}).get("select") or {}).get("name")
-            date = ((props.get("날짜") or {}).get("date") or {}).get("start")
-            rows.append({
-                "page_id": page.get("id"),
-                "title": title,
-                "status": status,
-                "category": category,
-                "date": date,
-                "url": page.get("url"),
-            })
-        return rows
+        return [TaskRecord.from_page(page).as_dict(_ROW_FIELDS) for page in resp.get("results", [])]
 
     # ---- Query ----
     def list_tasks(self, *, filter: Optional[Dict[str, Any]] = None, sorts: Optional[List[Dict[str, Any]]] = None, page_size: int = 50) -> List[Dict[str, Any]]:
@@ -43,16 +40,31 @@ class NotionTodoClient:
             payload["filter"] = filter
         if sorts:
             payload["sorts"] = sorts
-        resp = self.notion.databases.query(database_id=self.database_id, **payload)
+        resp = self._call("databases.query", database_id=self.database_id, **payload)
         return self._extract_rows(resp)
 
+    def iter_tasks(self, *, filter: Optional[Dict[str, Any]] = None, sorts: Optional[List[Dict[str, Any]]] = None, page_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """Yield rows across all result pages, following next_cursor lazily."""
+        payload: Dict[str, Any] = {"page_size": page_size}
+        if filter:
+            payload["filter"] = filter
+        if sorts:
+            payload["sorts"] = sorts
+        while True:
+            resp = self._call("databases.query", database_id=self.database_id, **payload)
+            yield from self._extract_rows(resp)
+            if not resp.get("has_more") or not resp.get("next_cursor"):
+                return
+            payload["start_cursor"] = resp["next_cursor"]
+
     def find_by_title(self, title: str, *, date_equals: Optional[str] = None, page_size: int = 5) -> List[Dict[str, Any]]:
         and_filters: List[Dict[str, Any]] = [
-            {"property": "할 일", "title": {"equals": title}}
+            {"property": PROP_TITLE, "title": {"equals": title}}
         ]
         if date_equals:
-            and_filters.append({"property": "날짜", "date": {"equals": date_equals}})
-        resp = self.notion.databases.query(
+            and_filters.append({"property": PROP_DATE, "date": {"equals": date_equals}})
+        resp = self._call(
+            "databases.query",
             database_id=self.database_id,
             filter={"and": and_filters},
             page_size=page_size,
@@ -62,34 +74,34 @@ class NotionTodoClient:
     # ---- Create ----
     def create_task(self, *, title: str, status: str = "시작 전", date: Optional[str] = None, category: Optional[str] = None, memo: Optional[str] = None) -> Dict[str, Any]:
         props: Dict[str, Any] = {
-            "할 일": {"title": [{"type": "text", "text": {"content": title}}]},
-            "상태": {"status": {"name": status}},
+            PROP_TITLE: {"title": [{"type": "text", "text": {"content": title}}]},
+            PROP_STATUS: {"status": {"name": status}},
         }
         if date:
-            props["날짜"] = {"date": {"start": date}}
+            props[PROP_DATE] = {"date": {"start": date}}
         if category:
-            props["카테고리"] = {"select": {"name": category}}
+            props[PROP_CATEGORY] = {"select": {"name": category}}
         if memo:
-            props["메모"] = {"rich_text": [{"type": "text", "text": {"content": memo}}]}
-        return self.notion.pages.create(parent={"database_id": self.database_id}, properties=props)
+            props[PROP_NOTES] = {"rich_text": [{"type": "text", "text": {"content": memo}}]}
+        return self._call("pages.create", parent={"database_id": self.database_id}, properties=props)
 
     # ---- Update/Delete ----
     def update_task(self, page_id: str, *, status: Optional[str] = None, date: Optional[str] = None, memo: Optional[str] = None, category: Optional[str] = None) -> Optional[Dict[str, Any]]:
         props: Dict[str, Any] = {}
         if status is not None:
-            props["상태"] = {"status": {"name": status}}
+            props[PROP_STATUS] = {"status": {"name": status}}
         if date is not None:
-            props["날짜"] = {"date": {"start": date}}
+            props[PROP_DATE] = {"date": {"start": date}}
         if memo is not None:
-            props["메모"] = {"rich_text": [{"type": "text", "text": {"content": memo}}]}
+            props[PROP_NOTES] = {"rich_text": [{"type": "text", "text": {"content": memo}}]}
         if category is not None:
-            props["카테고리"] = {"select": {"name": category}}
+            props[PROP_CATEGORY] = {"select": {"name": category}}
         if not props:
             return None
-        return self.notion.pages.update(page_id=page_id, properties=props)
+        return self._call("pages.update", page_id=page_id, properties=props)
 
     def archive_task(self, page_id: str) -> Dict[str, Any]:
-        return self.notion.pages.update(page_id=page_id, archived=True)
+        return self._call("pages.update", page_id=page_id, archived=True)
 
     # ---- Plan executor (runs planner JSON) ----
     def run_plan(self, plan: Dict[str, Any]) -> Dict[str, Any]:
@@ -110,7 +122,7 @@ class NotionTodoClient:
                 date_equals: Optional[str] = None
                 # try to extract date equals from filters
                 for f in filters:
-                    if (f.get("property") == "이벤트 날짜" or f.get("property") == "날짜") and (f.get("operator") in ("equals", "on_or_before", "on_or_after")):
+                    if (f.get("property") == "이벤트 날짜" or f.get("property") == PROP_DATE) and (f.get("operator") in ("equals", "on_or_before", "on_or_after")):
                         date_equals = f.get("value")
                 if title:
                     candidates = self.find_by_title(title, date_equals=date_equals, page_size=5)
@@ -124,40 +136,28 @@ class NotionTodoClient:
             if intent == "query":
                 # Use body as query body if given; else build from selection.filters
                 if not body:
-                    and_filters: List[Dict[str, Any]] = []
-                    for f in selection.get("filters") or []:
-                        prop = f.get("property")
-                        op = f.get("operator")
-                        val = f.get("value")
-                        if prop in ("날짜", "이벤트 날짜"):
-                            and_filters.append({"property": prop, "date": {"equals": val}})
-                        elif prop in ("카테고리", "상태", "장소"):
-                            # select/status handled via equals name
-                            key = "status" if prop == "상태" else "select"
-                            and_filters.append({"property": prop, key: {"equals": val}})
-                        else:
-                            and_filters.append({"property": prop, "title": {"contains": val}})
-                    body = {"filter": {"and": and_filters}} if and_filters else {}
-                resp = self.notion.databases.query(database_id=self.database_id, **body)
+                    flt = compile_conditions(selection.get("filters") or [])
+                    body = {"filter": flt} if flt else {}
+                resp = self._call("databases.query", database_id=self.database_id, **body)
                 return {"ok": True, "result": self._extract_rows(resp)}
 
             if intent == "create":
                 props = (body or {}).get("properties") or {}
                 # Ensure parent database
-                result = self.notion.pages.create(parent={"database_id": self.database_id}, properties=props, children=(body or {}).get("children"))
+                result = self._call("pages.create", parent={"database_id": self.database_id}, properties=props, children=(body or {}).get("children"))
                 return {"ok": True, "result": result}
 
             if intent == "update":
                 if not page_id:
                     return {"ok": False, "error": "missing_page_id", "result": None}
                 props = (body or {}).get("properties") or {}
-                result = self.notion.pages.update(page_id=page_id, properties=props)
+                result = self._call("pages.update", page_id=page_id, properties=props)
                 return {"ok": True, "result": result}
 
             if intent == "delete":
                 if not page_id:
                     return {"ok": False, "error": "missing_page_id", "result": None}
-                result = self.notion.pages.update(page_id=page_id, archived=True)
+                result = self._call("pages.update", page_id=page_id, archived=True)
                 return {"ok": True, "result": result}
 
             return {"ok": False, "error": f"unknown_intent:{intent}", "result": None}
@@ -3,20 +3,45 @@
 - Notion/Tasks 관련 API 라우트의 v1 엔드포인트 파일.
 - 현재 단계에서는 서버 기동 확인을 위해 간단한 헬스체크 엔드포인트만을 제공
 - 2단계에서 실제 CRUD 엔드포인트(예: /tasks/list, /tasks/create ..)를 여기에 추가
+- 모든 라우트는 async로 동작하며 AsyncNotionTaskService를 통해 Notion을 호출(스레드풀 점유 없음)
+- Task 응답은 평평한 TaskRecord 형태가 기본이며, raw=true면 Notion 원본 페이지를 그대로 돌려준다
+- 쓰기 엔드포인트는 async_write=true면 저널에 기록하고 202 + op_id로 바로 응답한다(/ops/{op_id}로 결과 조회)
+- 에이전트(LangChain) 모듈은 첫 /agent 요청에서 import한다(app.interface.loader) → REST 경로는 LangChain을 불러오지 않음
 """
 
+import asyncio
+import json
+import os
+from datetime import date
+from typing import AsyncIterator, Literal, Optional
 from fastapi import APIRouter
-from fastapi import Body
-from app.services.notion_service import NotionTaskService
+from fastapi import BackgroundTasks, Body, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from app.services.notion_service import (
+    AsyncNotionTaskService,
+    get_async_notion_service,
+    get_notion_service,
+)
+from app.services.change_feed import get_change_feed, verify_signature
+from app.services.mirror import get_task_mirror, is_mirror_cursor
+from app.services.query import OPTION_SORT_KEYS, TaskQuery, parse_fields, parse_sort
+from app.services.records import project_list, project_page
+from app.services.schema import PROP_CATEGORY, PROP_STATUS
+from app.services.write_queue import get_write_queue
 from app.llm.schemas import (
     CreateTaskInput,
     UpdateTaskInput,
     CompleteTaskInput,
     DeleteTaskInput,
     ListTasksInput,
+    BatchInput,
 )
 from fastapi import HTTPException
-from app.interface.agent import run_agent
+from notion_client.errors import APIResponseError
+from app.core.config import get_settings
+from app.interface.loader import aload_agent
+from app.llm.decision_cache import get_decision_cache
+from app.llm.fastpath import get_fastpath_stats
 
 router = APIRouter(prefix="/notion", tags=["notion"])
 
@@ -28,24 +53,146 @@ def notion_health_check() -> dict:
   """
   return {"ok": True, "service": "notion", "stage": 1}
 
+def _enqueue_write(op: dict, response: Response) -> dict:
+    """
+    지연 쓰기: 저널에 기록하고 202로 op_id를 돌려준다.
+    """
+    queue = get_write_queue()
+    if queue is None:
+        raise HTTPException(status_code=409, detail="WRITE_JOURNAL_PATH가 설정되지 않아 지연 쓰기를 사용할 수 없습니다.")
+    try:
+        ack = queue.enqueue(op)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    response.status_code = 202
+    return {"ok": True, "data": ack}
+
 @router.get("/tasks/list")
-def list_tasks(page_size: int = 10) -> dict:
+async def list_tasks(
+    page_size: int = 10,
+    start_cursor: Optional[str] = None,
+    source: Literal["auto", "notion", "mirror"] = "auto",
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    title: Optional[str] = None,
+    sort: Optional[str] = None,
+    fields: Optional[str] = None,
+    raw: bool = False,
+    svc: AsyncNotionTaskService = Depends(get_async_notion_service),
+) -> dict:
     """
-    최소 목록 조회(LLM 우회).
+    목록 조회(LLM 우회). 조건은 Notion filter/sorts로 컴파일되거나, 미러가 있으면 SQLite에서 처리된다.
     - page_size: 1~100 권장(기본 10)
+    - start_cursor: 이전 응답의 next_cursor(다음 페이지 조회). 다른 출처(미러 'm:…' ↔ Notion)의 커서면 422
+    - source: auto(미러가 동기화돼 있고 MIRROR_SERVE_READS면 로컬) / notion / mirror
+    - status/category: 옵션 라벨(별칭 허용: done → 완료, work → 💪 Work)
+    - date_from/date_to: 날짜 범위(YYYY-MM-DD, 양 끝 포함), title: 제목 포함 문자열
+    - sort: 쉼표 구분 키, '-'는 내림차순. 예) sort=date,-last_edited_time
+    - fields: 응답에 담을 레코드 필드. 예) fields=title,status,date
+    - raw: true면 Notion 원본 페이지(기본은 TaskRecord, fields는 무시)
     """
-    svc = NotionTaskService()
     page_size = max(1, min(100, page_size))
-    data = svc.list_tasks(page_size=page_size)
-    return {"ok": True, "data": data}
+    try:
+        sort_keys = parse_sort(sort)
+        projection = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    option_order = None
+    if status or category or any(key in OPTION_SORT_KEYS for key, _ in sort_keys):
+        # 라벨은 스키마로 실제 옵션명에 맞춘다(없는 옵션은 SchemaError → 422)
+        schema = await svc.schema()
+        status = schema.property(PROP_STATUS).option(status) if status else None
+        category = schema.property(PROP_CATEGORY).option(category) if category else None
+        # 미러의 상태/카테고리 정렬을 Notion과 같은 옵션 순서로
+        option_order = {
+            "status": schema.property(PROP_STATUS).options,
+            "category": schema.property(PROP_CATEGORY).options,
+        }
+    query = TaskQuery(
+        status=status,
+        category=category,
+        date_from=date_from.isoformat() if date_from else None,
+        date_to=date_to.isoformat() if date_to else None,
+        title_contains=title or None,
+        sort=sort_keys,
+        option_order=option_order,
+    )
+
+    mirror = get_task_mirror()
+    if source == "mirror" and (mirror is None or not mirror.synced):
+        raise HTTPException(status_code=409, detail="로컬 미러가 비활성이거나 아직 동기화되지 않았습니다.")
+    use_mirror = mirror is not None and source != "notion" and mirror.synced and (
+        source == "mirror" or get_settings().mirror_serve_reads
+    )
+    if start_cursor and is_mirror_cursor(start_cursor) != use_mirror:
+        origin = "미러" if is_mirror_cursor(start_cursor) else "Notion"
+        raise HTTPException(status_code=422, detail=f"start_cursor는 {origin} 응답의 커서입니다. 같은 source로 조회하세요.")
+    if use_mirror:
+        try:
+            data = mirror.list_tasks(page_size=page_size, start_cursor=start_cursor, query=query)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    else:
+        data = await svc.list_tasks(
+            page_size=page_size,
+            start_cursor=start_cursor,
+            filter=query.notion_filter(),
+            sorts=query.notion_sorts(),
+        )
+    return {"ok": True, "data": data if raw else project_list(data, projection)}
+
+@router.get("/tasks/stream")
+async def stream_tasks(
+    limit: Optional[int] = Query(None, ge=1),
+    raw: bool = False,
+    svc: AsyncNotionTaskService = Depends(get_async_notion_service),
+) -> StreamingResponse:
+    """
+    전체 Task를 NDJSON(한 줄에 페이지 하나)으로 스트리밍.
+    - Notion 페이지(최대 100개)가 도착하는 대로 내보내므로 DB 크기와 무관하게 메모리가 일정.
+    - 첫 페이지는 응답 헤더를 보내기 전에 조회한다(Notion 오류는 200 스트림이 아니라 공통 오류 응답으로).
+    - limit: 최대 항목 수(없으면 전체). 필요한 만큼만 조회한다(page_size=min(limit, 100)).
+    - raw: true면 줄마다 Notion 원본 페이지(기본은 TaskRecord)
+    """
+    pages = svc.iter_tasks(page_size=min(limit, 100) if limit else 100)
+    first = await anext(pages, None)
+
+    async def lines() -> AsyncIterator[bytes]:
+        try:
+            page, count = first, 0
+            while page is not None:
+                item = page if raw else project_page(page)
+                yield (json.dumps(item, ensure_ascii=False) + "\n").encode("utf-8")
+                count += 1
+                if limit is not None and count >= limit:
+                    break  # 다음 항목을 당기면 다음 페이지를 조회할 수 있으므로 바로 멈춘다
+                page = await anext(pages, None)
+        finally:
+            await pages.aclose()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 @router.post("/tasks/create")
-def create_task(payload: CreateTaskInput = Body(...)) -> dict:
+async def create_task(
+    response: Response,
+    payload: CreateTaskInput = Body(...),
+    raw: bool = False,
+    async_write: bool = False,
+    svc: AsyncNotionTaskService = Depends(get_async_notion_service),
+) -> dict:
     """
     새 Task 생성(필수: title). 그 외 속성은 있으면 반영.
     """
-    svc = NotionTaskService()
-    data = svc.create_task(
+    if async_write:
+        # 카테고리 라벨은 기록 전에 검증(잘못된 라벨은 저널에 남기지 않고 바로 422)
+        priority = None
+        if payload.priority:
+            priority = (await svc.schema()).property(PROP_CATEGORY).option(payload.priority)
+        op = {"op": "create", "title": payload.title, "due": payload.due, "priority": priority, "notes": payload.notes}
+        return _enqueue_write({k: v for k, v in op.items() if v is not None}, response)
+    data = await svc.create_task(
         title=payload.title,
         due=payload.due,
         assignee_ids=payload.assignee_ids,
@@ -53,29 +200,51 @@ def create_task(payload: CreateTaskInput = Body(...)) -> dict:
         tags=payload.tags,
         notes=payload.notes,
     )
-    return {"ok": True, "data": data}
+    return {"ok": True, "data": data if raw else project_page(data)}
 
 @router.post("/tasks/update")
-def update_task(payload: UpdateTaskInput = Body(...)) -> dict:
+async def update_task(
+    response: Response,
+    payload: UpdateTaskInput = Body(...),
+    raw: bool = False,
+    async_write: bool = False,
+    svc: AsyncNotionTaskService = Depends(get_async_notion_service),
+) -> dict:
     """
     Task 부분 업데이트.
     - payload.patch는 Notion properties 구조를 그대로 전달(최소 구성).
     """
-    svc = NotionTaskService()
-    data = svc.update_task(task_id=payload.task_id, patch=payload.patch)
-    return {"ok": True, "data": data}
+    if async_write:
+        # 스키마 검증은 기록 전에(잘못된 라벨은 저널에 남기지 않고 바로 422)
+        patch = (await svc.schema()).validate_patch(payload.patch)
+        return _enqueue_write({"op": "update", "task_id": payload.task_id, "patch": patch}, response)
+    data = await svc.update_task(task_id=payload.task_id, patch=payload.patch)
+    return {"ok": True, "data": data if raw else project_page(data)}
 
 @router.post("/tasks/complete")
-def complete_task(payload: CompleteTaskInput = Body(...)) -> dict:
+async def complete_task(
+    response: Response,
+    payload: CompleteTaskInput = Body(...),
+    raw: bool = False,
+    async_write: bool = False,
+    svc: AsyncNotionTaskService = Depends(get_async_notion_service),
+) -> dict:
     """
     Task 완료 처리(Status='Done' 가정).
     """
-    svc = NotionTaskService()
-    data = svc.complete_task(task_id=payload.task_id)
-    return {"ok": True, "data": data}
+    if async_write:
+        return _enqueue_write({"op": "complete", "task_id": payload.task_id}, response)
+    data = await svc.complete_task(task_id=payload.task_id)
+    return {"ok": True, "data": data if raw else project_page(data)}
 
 @router.post("/tasks/delete")
-def delete_task(payload: DeleteTaskInput = Body(...)) -> dict:
+async def delete_task(
+    response: Response,
+    payload: DeleteTaskInput = Body(...),
+    raw: bool = False,
+    async_write: bool = False,
+    svc: AsyncNotionTaskService = Depends(get_async_notion_service),
+) -> dict:
     """
     Task 삭제(아카이브). 실수 방지를 위해 confirm=True가 아니면 거부.
     """
@@ -84,29 +253,223 @@ def delete_task(payload: DeleteTaskInput = Body(...)) -> dict:
             "ok": False,
             "message": "confirm=True가 필요합니다. 실수 방지용 확인 플래그입니다."
         }
-    svc = NotionTaskService()
-    data = svc.delete_task(task_id=payload.task_id)
-    return {"ok": True, "data": data}
+    if async_write:
+        return _enqueue_write({"op": "archive", "task_id": payload.task_id}, response)
+    data = await svc.delete_task(task_id=payload.task_id)
+    return {"ok": True, "data": data if raw else project_page(data)}
+
+@router.post("/tasks/batch")
+async def batch_tasks(
+    payload: BatchInput = Body(...),
+    raw: bool = False,
+    svc: AsyncNotionTaskService = Depends(get_async_notion_service),
+) -> dict:
+    """
+    create/update/complete/archive 혼합 작업을 한 번에 처리(동시 실행 상한 적용).
+    - 같은 task_id의 작업은 입력 순서대로 실행한다.
+    - 일부 항목이 실패해도 나머지는 계속 실행하고, 항목별 결과를 입력 순서대로 반환.
+    - archive 항목은 /tasks/delete와 같이 confirm=True가 필요하다(하나라도 없으면 아무것도 실행하지 않음).
+    """
+    unconfirmed = [i for i, op in enumerate(payload.operations) if op.op == "archive" and not op.confirm]
+    if unconfirmed:
+        return {
+            "ok": False,
+            "message": "archive 항목에는 confirm=True가 필요합니다. 실수 방지용 확인 플래그입니다.",
+            "indexes": unconfirmed,
+        }
+    operations = [op.model_dump(exclude_none=True) for op in payload.operations]
+    data = await svc.batch(operations, concurrency=payload.concurrency)
+    if not raw:
+        for item in data["results"]:
+            if "data" in item:
+                item["data"] = project_page(item["data"])
+    return {"ok": data["failed"] == 0, "data": data}
 
 @router.get("/db/describe")
-def describe_db() -> dict:
-    svc = NotionTaskService()
-    data = svc.describe_database()
+async def describe_db(
+    refresh: bool = False,
+    svc: AsyncNotionTaskService = Depends(get_async_notion_service),
+) -> dict:
+    """
+    DB 속성 스키마(캐시 경유). refresh=true면 Notion에서 다시 가져온다.
+    """
+    data = await svc.describe_database(refresh=refresh)
     return {"ok": True, "data": data.get("properties", {})}
 
+@router.get("/cache/stats")
+async def cache_stats(svc: AsyncNotionTaskService = Depends(get_async_notion_service)) -> dict:
+    """
+    Tasks 페이지 캐시의 hit/miss/eviction 카운터(튜닝용).
+    """
+    return {"ok": True, "data": svc.cache_stats()}
+
+@router.get("/mirror/status")
+async def mirror_status() -> dict:
+    """
+    로컬 SQLite 미러 상태(활성 행/톰스톤 수, watermark, 마지막 동기화 시각).
+    """
+    mirror = get_task_mirror()
+    if mirror is None:
+        return {"ok": False, "message": "MIRROR_DB_PATH가 설정되지 않았습니다."}
+    return {"ok": True, "data": mirror.stats()}
+
+@router.post("/mirror/sync")
+async def mirror_sync(full: bool = False) -> dict:
+    """
+    즉시 미러 동기화(full=True면 전체 재동기화 + 삭제 감지).
+    """
+    mirror = get_task_mirror()
+    if mirror is None:
+        return {"ok": False, "message": "MIRROR_DB_PATH가 설정되지 않았습니다."}
+    data = await asyncio.to_thread(mirror.sync, get_notion_service(), full)
+    return {"ok": True, "data": data}
+
+@router.get("/ops/stats")
+async def write_queue_stats() -> dict:
+    """
+    지연 쓰기 저널의 상태별 작업 수와 가장 오래된 대기 작업의 나이.
+    """
+    queue = get_write_queue()
+    if queue is None:
+        return {"ok": False, "message": "WRITE_JOURNAL_PATH가 설정되지 않았습니다."}
+    return {"ok": True, "data": queue.stats()}
+
+@router.get("/ops/{op_id}")
+async def write_op_status(op_id: str) -> dict:
+    """
+    지연 쓰기 작업 하나의 상태(pending/running/done/failed), 시도 횟수, 결과 또는 오류.
+    """
+    queue = get_write_queue()
+    if queue is None:
+        return {"ok": False, "message": "WRITE_JOURNAL_PATH가 설정되지 않았습니다."}
+    data = queue.get(op_id)
+    if data is None:
+        raise HTTPException(status_code=404, detail=f"없는 작업: {op_id}")
+    return {"ok": True, "data": data}
+
+@router.post("/ops/{op_id}/retry")
+async def retry_write_op(op_id: str) -> dict:
+    """
+    review(반영 도중 중단된 create)/failed 작업을 다시 대기열에 넣는다.
+    - create는 Notion에 이미 만들어졌는지 확인한 뒤에만 재시도하세요(중복 생성 방지).
+    """
+    queue = get_write_queue()
+    if queue is None:
+        return {"ok": False, "message": "WRITE_JOURNAL_PATH가 설정되지 않았습니다."}
+    try:
+        data = queue.requeue(op_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if data is None:
+        raise HTTPException(status_code=404, detail=f"없는 작업: {op_id}")
+    return {"ok": True, "data": data}
+
+def _save_verification_token(token: str, path: str) -> None:
+    """
+    구독 확인 토큰을 NOTION_WEBHOOK_TOKEN_FILE에 저장한다(소유자만 읽기/쓰기). 로그에는 끝 4자리만 남긴다.
+    """
+    masked = f"***{token[-4:]}" if len(token) > 12 else "***"
+    if not path:
+        print(f"[webhook] verification_token 수신({masked}). 값을 받으려면 NOTION_WEBHOOK_TOKEN_FILE을 지정하고 토큰을 다시 보내세요.")
+        return
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token + "\n")
+    print(f"[webhook] verification_token 수신({masked}) → {path}")
+
+@router.post("/webhooks/notion")
+async def notion_webhook(request: Request, background: BackgroundTasks) -> dict:
+    """
+    Notion 웹훅 수신. 페이지 변경 이벤트를 변경 피드로 발행한다(캐시 무효화 + 폴러 깨우기).
+    - X-Notion-Signature를 NOTION_WEBHOOK_SECRET으로 검증하고, 틀리면 401.
+    - NOTION_WEBHOOK_SECRET이 없으면 구독 확인(verification_token) 요청만 받고 나머지 전달은 503.
+    - verification_token은 응답/로그에 그대로 싣지 않는다(NOTION_WEBHOOK_TOKEN_FILE에 저장).
+    - 삭제 이벤트는 응답 후 백그라운드에서 페이지를 다시 조회해 확인된 경우에만 반영한다.
+    """
+    body = await request.body()
+    settings = get_settings()
+    secret = settings.notion_webhook_secret
+    if secret and not verify_signature(body, request.headers.get("X-Notion-Signature"), secret):
+        raise HTTPException(status_code=401, detail="웹훅 서명이 올바르지 않습니다.")
+    try:
+        event = json.loads(body or b"{}")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="JSON 본문이 필요합니다.")
+    if not isinstance(event, dict):
+        raise HTTPException(status_code=400, detail="JSON 객체 본문이 필요합니다.")
+    if "verification_token" in event:
+        _save_verification_token(str(event["verification_token"]), settings.notion_webhook_token_file)
+        return {"ok": True, "verification": True}
+    if not secret:
+        raise HTTPException(status_code=503, detail="NOTION_WEBHOOK_SECRET이 설정되지 않아 웹훅을 받지 않습니다.")
+    feed = get_change_feed()
+    data = feed.handle_webhook(event)
+    if data.get("refetch"):
+        background.add_task(feed.refetch_pending, get_async_notion_service())
+    return {"ok": True, "data": data}
+
+@router.get("/changes/stats")
+async def change_feed_stats() -> dict:
+    """
+    변경 피드 상태(watermark, 폴링/웹훅 수, 발행한 이벤트 수).
+    """
+    return {"ok": True, "data": get_change_feed().stats()}
+
+@router.get("/agent/stats")
+async def agent_stats() -> dict:
+    """
+    fast-path(LLM 우회) 적중률과 경로별 평균 지연, 툴 호출 결정 캐시 통계.
+    """
+    return {
+        "ok": True,
+        "data": {"fast_path": get_fastpath_stats().stats(), "decision_cache": get_decision_cache().stats()},
+    }
+
 @router.post("/agent")
-def run_notional_agent(body: dict) -> dict:
+async def run_notional_agent(body: dict) -> dict:
     """
     LangChain 에이전트를 통해 '자연어 → 단일 툴 호출 → Notion 반영'을 수행한다.
     - body 예시: {"text": "다음주 금요일에 '건강검진 예약' 추가해줘. 카테고리는 🏥 Health"}
+    - mode: "single"(기본, 툴 1회) / "plan"(LLM 1회 응답의 여러 툴 호출을 동시 실행)
+      예) {"text": "'A', 'B', 'C' 다 완료 처리해줘", "mode": "plan"}
     - 주의: DB 실제 옵션 라벨과 속성명을 사용해야 한다(카테고리 예: '💪 Work').
     """
     text = (body or {}).get("text")
     if not text or not isinstance(text, str):
         raise HTTPException(status_code=422, detail="text(string) 필드가 필요합니다.")
+    mode = (body or {}).get("mode", "single")
+    if mode not in ("single", "plan"):
+        raise HTTPException(status_code=422, detail="mode는 single 또는 plan 이어야 합니다.")
+    agent = await aload_agent()
     try:
-        resp = run_agent(text)
+        resp = await (agent.arun_plan(text) if mode == "plan" else agent.arun_agent(text))
         return resp
+    except APIResponseError:
+        # Notion 오류(429 포함)는 앱 공통 핸들러가 상태코드/Retry-After를 매핑
+        raise
     except Exception as e:
         # 최소 구성: 에러 매핑 없이 메시지만 노출
-        raise HTTPException(status_code=500, detail=f"agent error: {e}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"agent error: {e}")
+
+@router.post("/agent/stream")
+async def stream_notional_agent(body: dict) -> StreamingResponse:
+    """
+    /agent의 SSE 스트리밍 버전. 진행 이벤트를 발생 즉시 text/event-stream으로 보낸다.
+    - 이벤트: normalized, llm_start, tool_chosen, notion_request, notion_response, tool_result, result, error
+    - 각 이벤트의 data는 JSON이다(result의 data는 /agent 응답과 같은 형태).
+    """
+    text = (body or {}).get("text")
+    if not text or not isinstance(text, str):
+        raise HTTPException(status_code=422, detail="text(string) 필드가 필요합니다.")
+    agent = await aload_agent()
+
+    async def events() -> AsyncIterator[bytes]:
+        async for ev in agent.astream_agent(text):
+            data = json.dumps(ev["data"], ensure_ascii=False, default=str)
+            yield f"event: {ev['event']}\ndata: {data}\n\n".encode("utf-8")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
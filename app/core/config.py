@@ -1,29 +1,325 @@
 """
-역할 : 
+역할 :
 - .env 파일 및 OS 환경변수를 로딩하여 애플리케이션 전역에서 사용할 설정 값을 제공
-- 현재 단계에서는 꼭 필요한 최소 키만을 사용
+- 설정은 처음 get_settings() 호출 때 한 번 읽고 검증해 프로세스 전체가 같은 객체를 공유한다
+- reload_settings()로 다시 읽는다(SIGHUP, SETTINGS_WATCH_SEC > 0 이면 .env 수정 감지).
+  값이 바뀌면 on_settings_change()로 등록한 리스너가 불려 캐시 TTL/리미터 등 조정 가능한 값을 바로 반영한다.
+  커넥션 풀/경로/백그라운드 루프처럼 기동 시 한 번 쓰는 값(RESTART_REQUIRED)은 재시작해야 반영된다.
 주의 :
 - 민감 정보는 절대 코드에 하드코딩하지 말고 .env 또는 배포 환경변수로 주입
+- repr(settings)는 토큰/키를 가린다(로그에 그대로 찍히지 않도록)
 """
 
 from __future__ import annotations
+import asyncio
 import os
-from dataclasses import dataclass
-from dotenv import load_dotenv
+import signal
+import threading
+from dataclasses import dataclass, fields
+from typing import Callable, Dict, FrozenSet, List, Mapping, Optional, Set
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from dotenv import dotenv_values, find_dotenv
 
-# .env 파일 로드
-load_dotenv()
 
-@dataclass(frozen=True)
+class SettingsError(ValueError):
+  """
+  환경변수 값이 형식에 맞지 않거나 허용 범위를 벗어났을 때.
+  """
+
+
+# 필드 이름을 대문자로 바꾼 것이 환경변수 이름이다(notion_rate_per_sec → NOTION_RATE_PER_SEC)
+@dataclass(frozen=True, repr=False)
 class Settings:
-  tz: str = os.getenv("TZ", "Asia/Seoul")
-  port: int = int(os.getenv("PORT", "8000"))
-  notion_token: str | None = os.getenv("NOTION_TOKEN")
-  notion_tasks_db_id: str | None = os.getenv("NOTION_TASKS_DB_ID")
+  tz: str = "Asia/Seoul"
+  port: int = 8000
+  notion_token: str | None = None
+  notion_tasks_db_id: str | None = None
+  # Notion HTTP 커넥션 풀(keep-alive) 튜닝
+  notion_base_url: str = "https://api.notion.com"
+  notion_timeout_ms: int = 30000
+  notion_pool_max_connections: int = 20
+  notion_pool_max_keepalive: int = 10
+  notion_keepalive_expiry_sec: float = 30
+  # Notion 호출 레이트 리밋(초당 토큰, 0이면 비활성) / 재시도
+  notion_rate_per_sec: float = 3
+  notion_rate_burst: int = 3
+  notion_max_retries: int = 4
+  notion_backoff_base_sec: float = 0.5
+  notion_backoff_max_sec: float = 30
+  # 동시에 들어온 같은 읽기 요청 합치기(single-flight)
+  notion_single_flight: bool = True
+  # Tasks 페이지 캐시(TTL <= 0 이면 비활성)
+  task_cache_ttl_sec: float = 30
+  task_cache_max_size: int = 1000
+  # DB 스키마(속성/옵션) 캐시 TTL(초)
+  schema_ttl_sec: float = 300
+  # 제목 인덱스 증분 갱신 주기(초) / 전체 재구성 주기(초, 0이면 안 함 — 증분 갱신은 아카이브된 페이지를 보지 못함)
+  title_index_refresh_sec: float = 30
+  title_index_rebuild_sec: float = 600
+  # 일괄 처리 기본 동시 실행 상한
+  batch_concurrency: int = 4
+  # 로컬 SQLite 미러(경로가 비어 있으면 비활성)
+  mirror_db_path: str = ""
+  mirror_sync_interval_sec: float = 60
+  mirror_serve_reads: bool = True
+  # 전체 재동기화(아카이브 감지) 주기(초, 0이면 안 함 — 증분 동기화는 UI에서 아카이브한 페이지를 보지 못함)
+  mirror_full_sync_sec: float = 3600
+  # 변경 피드 폴링 주기(초, 0이면 폴링 안 함) / Notion 웹훅 서명 검증 키(비어 있으면 웹훅을 받지 않음)
+  # / 구독 확인 요청의 verification_token을 저장할 파일(비어 있으면 가린 값만 로그에 남김)
+  change_feed_poll_sec: float = 0
+  notion_webhook_secret: str | None = None
+  notion_webhook_token_file: str = ""
+  # 지연 쓰기(write-behind) 저널(경로가 비어 있으면 비활성) / 플러시 주기·묶음 크기·최대 시도 횟수
+  write_journal_path: str = ""
+  write_flush_interval_sec: float = 0.5
+  write_batch_size: int = 20
+  write_max_attempts: int = 5
+  # 규칙 기반 fast-path(LLM 우회) 사용 여부 / 최소 확신도(따옴표 제목 1.0, 따옴표 없는 제목 0.85)
+  fastpath_enabled: bool = True
+  fastpath_min_confidence: float = 0.9
+  # LLM 툴 호출 결정 캐시(TTL <= 0 이면 비활성, 유사도 <= 0 이면 정확 일치만)
+  agent_cache_ttl_sec: float = 3600
+  agent_cache_max_size: int = 512
+  agent_cache_similarity: float = 0.9
+  # 기동 직후 백그라운드에서 에이전트(LangChain) import/구성을 미리 해 둘지. 끄면 첫 /agent 요청에서 로드
+  agent_warmup: bool = False
+  # 단계별 지연 히스토그램/토큰 카운터(/metrics, Server-Timing 헤더). 끄면 측정 코드가 바로 반환
+  metrics_enabled: bool = False
+  # 트레이싱 exporter: ""(끔) | memory | console | "패키지.모듈:클래스"
+  tracing_exporter: str = ""
+  # .env 수정 감지 주기(초, 0이면 감지 안 함 — SIGHUP으로만 다시 읽음)
+  settings_watch_sec: float = 0
+  # LLM(Gemini) 설정: 호출 타임아웃(초, 0이면 SDK 기본값) / SDK 재시도 횟수
+  gemini_model: str = "gemini-2.5-flash"
+  google_api_key: str | None = None
+  llm_timeout_sec: float = 0
+  llm_max_retries: int = 6
+
+  def __post_init__(self) -> None:
+    errors = _validate(self)
+    if errors:
+      raise SettingsError("설정 값 오류: " + "; ".join(errors))
+
+  def __repr__(self) -> str:
+    items = []
+    for f in fields(self):
+      value = getattr(self, f.name)
+      items.append(f"{f.name}={_mask(value) if f.name in SECRET_FIELDS else repr(value)}")
+    return f"Settings({', '.join(items)})"
+
+  @classmethod
+  def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "Settings":
+    """
+    환경변수(기본: os.environ)에서 설정을 만든다. 없는 키는 기본값, 형식이 틀리면 SettingsError.
+    """
+    environ = os.environ if environ is None else environ
+    values = {}
+    for f in fields(cls):
+      raw = environ.get(f.name.upper())
+      if raw is None:
+        continue
+      try:
+        values[f.name] = _PARSERS.get(f.type, str)(raw)
+      except ValueError:
+        raise SettingsError(f"{f.name.upper()}={raw!r}: {f.type} 값이어야 합니다.") from None
+    return cls(**values)
+
+
+SECRET_FIELDS: FrozenSet[str] = frozenset({"notion_token", "notion_webhook_secret", "google_api_key"})
+
+# 기동 시 한 번만 쓰이는 값(커넥션 풀/경로/백그라운드 루프/미들웨어 등록 여부) → 바꾸면 재시작 필요
+RESTART_REQUIRED: FrozenSet[str] = frozenset({
+  "tz", "port", "notion_token", "notion_tasks_db_id", "notion_base_url", "notion_timeout_ms",
+  "notion_pool_max_connections", "notion_pool_max_keepalive", "notion_keepalive_expiry_sec",
+  "mirror_db_path", "mirror_sync_interval_sec", "change_feed_poll_sec",
+  "write_journal_path", "write_flush_interval_sec", "write_batch_size", "write_max_attempts",
+  "agent_warmup", "metrics_enabled", "tracing_exporter", "settings_watch_sec",
+})
+
+def _parse_bool(raw: str) -> bool:
+  # 오타('ture', 'yes')를 조용히 False로 읽지 않도록 true/false만 받는다
+  value = raw.strip().lower()
+  if value not in ("true", "false"):
+    raise ValueError(raw)
+  return value == "true"
+
+_PARSERS: Dict[str, Callable[[str], object]] = {
+  "int": int,
+  "float": float,
+  "bool": _parse_bool,
+}
+
+def _mask(value: Optional[str]) -> str:
+  if not value:
+    return repr(value)
+  return f"'***{value[-4:]}'" if len(value) > 12 else "'***'"
+
+def _validate(s: Settings) -> List[str]:
+  """
+  허용 범위를 벗어난 값들의 설명 목록(비어 있으면 통과).
+  """
+  checks = [
+    (1 <= s.port <= 65535, "PORT는 1~65535"),
+    (s.notion_timeout_ms > 0, "NOTION_TIMEOUT_MS는 0보다 커야 함"),
+    (s.notion_pool_max_connections >= 1, "NOTION_POOL_MAX_CONNECTIONS는 1 이상"),
+    (0 <= s.notion_pool_max_keepalive <= s.notion_pool_max_connections,
+     "NOTION_POOL_MAX_KEEPALIVE는 0 이상 NOTION_POOL_MAX_CONNECTIONS 이하"),
+    (s.notion_keepalive_expiry_sec >= 0, "NOTION_KEEPALIVE_EXPIRY_SEC는 0 이상"),
+    (s.notion_rate_per_sec >= 0, "NOTION_RATE_PER_SEC는 0 이상"),
+    (s.notion_rate_burst >= 1, "NOTION_RATE_BURST는 1 이상"),
+    (s.notion_max_retries >= 0, "NOTION_MAX_RETRIES는 0 이상"),
+    (0 <= s.notion_backoff_base_sec <= s.notion_backoff_max_sec,
+     "NOTION_BACKOFF_BASE_SEC는 0 이상 NOTION_BACKOFF_MAX_SEC 이하"),
+    (s.task_cache_max_size >= 0, "TASK_CACHE_MAX_SIZE는 0 이상"),
+    (s.schema_ttl_sec >= 0, "SCHEMA_TTL_SEC는 0 이상"),
+    (s.title_index_refresh_sec >= 0, "TITLE_INDEX_REFRESH_SEC는 0 이상"),
+    (s.title_index_rebuild_sec >= 0, "TITLE_INDEX_REBUILD_SEC는 0 이상"),
+    (s.batch_concurrency >= 1, "BATCH_CONCURRENCY는 1 이상"),
+    (s.mirror_sync_interval_sec > 0, "MIRROR_SYNC_INTERVAL_SEC는 0보다 커야 함"),
+    (s.mirror_full_sync_sec >= 0, "MIRROR_FULL_SYNC_SEC는 0 이상"),
+    (s.change_feed_poll_sec >= 0, "CHANGE_FEED_POLL_SEC는 0 이상"),
+    (s.write_flush_interval_sec > 0, "WRITE_FLUSH_INTERVAL_SEC는 0보다 커야 함"),
+    (s.write_batch_size >= 1, "WRITE_BATCH_SIZE는 1 이상"),
+    (s.write_max_attempts >= 1, "WRITE_MAX_ATTEMPTS는 1 이상"),
+    (0 <= s.fastpath_min_confidence <= 1, "FASTPATH_MIN_CONFIDENCE는 0~1"),
+    (s.agent_cache_max_size >= 0, "AGENT_CACHE_MAX_SIZE는 0 이상"),
+    (s.agent_cache_similarity <= 1, "AGENT_CACHE_SIMILARITY는 1 이하"),
+    (s.settings_watch_sec >= 0, "SETTINGS_WATCH_SEC는 0 이상"),
+    (s.llm_timeout_sec >= 0, "LLM_TIMEOUT_SEC는 0 이상"),
+    (s.llm_max_retries >= 0, "LLM_MAX_RETRIES는 0 이상"),
+  ]
+  errors = [message for ok, message in checks if not ok]
+  try:
+    ZoneInfo(s.tz)
+  except (ZoneInfoNotFoundError, ValueError):
+    errors.append(f"TZ={s.tz!r}는 알 수 없는 시간대")
+  return errors
+
+def changed_fields(old: Settings, new: Settings) -> FrozenSet[str]:
+  return frozenset(f.name for f in fields(Settings) if getattr(old, f.name) != getattr(new, f.name))
+
+
+# -------- .env 로딩 --------
+# 프로세스 환경변수가 .env보다 우선한다(load_dotenv 기본 동작). 다시 읽을 때도 .env에서 온 키만 갱신/삭제한다.
+_env_file = find_dotenv() or os.path.abspath(".env")
+_process_keys: FrozenSet[str] = frozenset(os.environ)
+_dotenv_keys: Set[str] = set()
+
+def _read_env_file() -> Dict[str, str]:
+  """
+  .env에서 반영할 값(프로세스 환경변수에 이미 있는 키는 제외). os.environ은 건드리지 않는다.
+  """
+  values = dotenv_values(_env_file) if os.path.exists(_env_file) else {}
+  return {k: v for k, v in values.items() if v is not None and k not in _process_keys}
+
+def _environ_with(dotenv: Mapping[str, str]) -> Dict[str, str]:
+  # 지금 os.environ에서 이전 .env 값을 걷어내고 새 .env 값을 얹은 모습(검증용)
+  environ = {k: v for k, v in os.environ.items() if k not in _dotenv_keys}
+  environ.update(dotenv)
+  return environ
+
+def _apply_env_file(dotenv: Mapping[str, str]) -> None:
+  for key in _dotenv_keys - dotenv.keys():
+    os.environ.pop(key, None)
+  _dotenv_keys.clear()
+  os.environ.update(dotenv)
+  _dotenv_keys.update(dotenv)
+
+_apply_env_file(_read_env_file())
+
+
+# -------- 공용 설정 / 다시 읽기 --------
+SettingsListener = Callable[[Settings, Settings], None]
+
+_settings: Optional[Settings] = None
+_settings_lock = threading.Lock()
+_listeners: List[SettingsListener] = []
 
 def get_settings() -> Settings:
   """
-  Settings 객체를 반환
+  공용 Settings 객체를 반환(처음 호출 시 환경변수에서 읽고 검증, 이후에는 캐시)
   - 함수로 감싸두면 추후 DI나 테스트 시에 주입하기가 용이해짐
   """
-  return Settings()
\ No newline at end of file
+  global _settings
+  if _settings is None:
+    with _settings_lock:
+      if _settings is None:
+        _settings = Settings.from_env()
+  return _settings
+
+def on_settings_change(listener: SettingsListener) -> SettingsListener:
+  """
+  설정이 바뀔 때 listener(이전, 새 설정)를 호출하도록 등록한다(데코레이터로도 사용 가능).
+  """
+  _listeners.append(listener)
+  return listener
+
+def reload_settings() -> Settings:
+  """
+  .env와 환경변수를 다시 읽어 공용 설정을 교체한다.
+  - .env는 먼저 읽어 검증만 하고, 통과한 뒤에 os.environ에 반영한다.
+    검증에 실패하면 os.environ과 기존 설정을 그대로 두고 SettingsError를 올린다.
+  - 값이 바뀌었으면 리스너를 호출한다(리스너 예외는 기록만 하고 나머지는 계속 호출).
+  """
+  global _settings
+  with _settings_lock:
+    dotenv = _read_env_file()
+    new = Settings.from_env(_environ_with(dotenv))
+    _apply_env_file(dotenv)
+    old, _settings = _settings, new
+  if old is None or old == new:
+    return new
+  changed = changed_fields(old, new)
+  restart = sorted(changed & RESTART_REQUIRED)
+  print(f"[settings] 다시 읽음: {', '.join(sorted(changed))}"
+        + (f" (재시작해야 반영: {', '.join(restart)})" if restart else ""))
+  for listener in list(_listeners):
+    try:
+      listener(old, new)
+    except Exception as e:
+      print(f"[settings] 리스너 실패({getattr(listener, '__qualname__', listener)}): {e}")
+  return new
+
+def _reload_quietly(reason: str) -> None:
+  try:
+    reload_settings()
+  except SettingsError as e:
+    print(f"[settings] {reason}: 다시 읽기 실패, 기존 설정 유지 — {e}")
+
+def install_reload_signal() -> bool:
+  """
+  SIGHUP을 받으면 설정을 다시 읽도록 현재 이벤트 루프에 등록한다(지원하지 않는 플랫폼이면 False).
+  """
+  if not hasattr(signal, "SIGHUP"):
+    return False
+  try:
+    asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, _reload_quietly, "SIGHUP")
+  except (NotImplementedError, RuntimeError):
+    # Windows 이벤트 루프 / 메인 스레드가 아닌 루프
+    return False
+  return True
+
+def remove_reload_signal() -> None:
+  if hasattr(signal, "SIGHUP"):
+    try:
+      asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+    except (NotImplementedError, RuntimeError):
+      pass
+
+def _env_mtime() -> Optional[int]:
+  try:
+    return os.stat(_env_file).st_mtime_ns
+  except OSError:
+    return None
+
+async def watch_env_file(interval_sec: float) -> None:
+  """
+  interval_sec마다 .env 수정 시각을 확인해 바뀌었으면 설정을 다시 읽는다(lifespan 백그라운드 태스크).
+  """
+  last = _env_mtime()
+  while True:
+    await asyncio.sleep(interval_sec)
+    mtime = _env_mtime()
+    if mtime != last:
+      last = mtime
+      _reload_quietly(".env 변경")
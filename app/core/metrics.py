@@ -0,0 +1,209 @@
+"""
+역할 :
+- 단계별 지연 시간/카운터를 모으는 가벼운 메트릭 레지스트리(외부 의존성 없음)
+  * 히스토그램(ms): Notion 메서드별, 툴별, LLM 호출, HTTP 경로별
+  * 카운터: LLM 입력/출력 토큰 수
+  * 게이지: 등록한 수집 함수가 /metrics 조회 시점에 계산(캐시 적중률 등)
+- /metrics에서 Prometheus 텍스트 형식(0.0.4)으로 내보낸다.
+- 요청 단위 타이밍: 미들웨어가 요청마다 단계 누적표를 열고, 각 단계(normalize/agent_build/llm/tool/notion)가
+  여기에 시간을 더한다 → Server-Timing / X-Timing 응답 헤더. 단계는 겹칠 수 있다(tool 안에 notion 포함).
+- METRICS_ENABLED가 꺼져 있으면 get_metrics()는 None이고 observe_stage()는 바로 반환한다.
+"""
+
+from __future__ import annotations
+import bisect
+import threading
+from contextvars import ContextVar, Token
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from app.core.config import get_settings
+
+# 히스토그램 버킷 상한(ms). Notion 호출(수십~수백 ms)과 LLM 호출(수 초)을 함께 담는다.
+DEFAULT_BUCKETS_MS: Tuple[float, ...] = (
+    1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000,
+)
+
+_HELP = {
+    "http_request_ms": "HTTP 요청 처리 시간(ms), 경로/메서드/상태별",
+    "notion_request_ms": "Notion API 호출 시간(ms, 리미터 대기/재시도 포함), 메서드별",
+    "tool_call_ms": "에이전트 툴 실행 시간(ms), 툴별",
+    "llm_request_ms": "LLM 호출 시간(ms), 모델별",
+    "stage_ms": "run_agent 내부 단계 시간(ms)",
+    "llm_tokens_total": "LLM 토큰 수, 입력/출력별",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+GaugeCollector = Callable[[], Iterable[Tuple[str, Dict[str, str], float]]]
+
+
+class Histogram:
+    """
+    누적 버킷 히스토그램 하나(Prometheus histogram과 같은 의미).
+    """
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _fmt_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+def _fmt_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Metrics:
+    """
+    히스토그램/카운터 저장소. 락 하나로 보호한다(관측 1회 = 딕셔너리 조회 + 덧셈 몇 번).
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS_MS) -> None:
+        self.buckets = buckets
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._collectors: List[GaugeCollector] = []
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value_ms: float, /, **labels: object) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = Histogram(self.buckets)
+            hist.observe(value_ms)
+
+    def inc(self, name: str, value: float = 1, /, **labels: object) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def register_gauges(self, collector: GaugeCollector) -> None:
+        """
+        /metrics 조회 시 호출할 게이지 수집 함수를 등록한다. 반환: (이름, 레이블, 값) 목록.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def render(self) -> str:
+        """
+        Prometheus 텍스트 형식으로 직렬화한다.
+        """
+        lines: List[str] = []
+        with self._lock:
+            histograms = {n: {k: (list(h.counts), h.sum, h.count) for k, h in s.items()} for n, s in self._histograms.items()}
+            counters = {n: dict(s) for n, s in self._counters.items()}
+            collectors = list(self._collectors)
+
+        for name in sorted(histograms):
+            lines += [f"# HELP {name} {_HELP.get(name, name)}", f"# TYPE {name} histogram"]
+            for key, (counts, total, count) in sorted(histograms[name].items()):
+                cumulative = 0
+                for bound, n in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += n
+                    le = "+Inf" if bound == float("inf") else _fmt_value(bound)
+                    lines.append(f"{name}_bucket{_fmt_labels(key, ('le', le))} {cumulative}")
+                lines.append(f"{name}_sum{_fmt_labels(key)} {round(total, 3)}")
+                lines.append(f"{name}_count{_fmt_labels(key)} {count}")
+        for name in sorted(counters):
+            lines += [f"# HELP {name} {_HELP.get(name, name)}", f"# TYPE {name} counter"]
+            for key, value in sorted(counters[name].items()):
+                lines.append(f"{name}{_fmt_labels(key)} {_fmt_value(value)}")
+
+        gauges: Dict[str, List[str]] = {}
+        for collect in collectors:
+            try:
+                for name, labels, value in collect():
+                    gauges.setdefault(name, []).append(f"{name}{_fmt_labels(_labels(labels))} {_fmt_value(value)}")
+            except Exception as e:
+                print(f"[metrics] 게이지 수집 실패: {e}")
+        for name in sorted(gauges):
+            lines += [f"# TYPE {name} gauge", *gauges[name]]
+        return "\n".join(lines) + "\n"
+
+
+# -------- 요청 단위 단계 타이밍 --------
+# 단계 이름 → [누적 ms, 횟수]. 미들웨어가 요청마다 새로 연다(열려 있지 않으면 기록하지 않음).
+_stages: ContextVar[Optional[Dict[str, List[float]]]] = ContextVar("request_stages", default=None)
+
+def begin_request() -> Token:
+    return _stages.set({})
+
+def end_request(token: Token) -> Dict[str, List[float]]:
+    stages = _stages.get() or {}
+    _stages.reset(token)
+    return stages
+
+def observe_stage(stage: str, ms: float, histogram: Optional[str] = None, /, **labels: object) -> None:
+    """
+    현재 요청의 단계 누적표에 ms를 더하고, histogram이 주어지면 해당 히스토그램에도 기록한다.
+    메트릭이 꺼져 있으면 아무것도 하지 않는다.
+    """
+    metrics = get_metrics()
+    if metrics is None:
+        return
+    stages = _stages.get()
+    if stages is not None:
+        entry = stages.get(stage)
+        if entry is None:
+            stages[stage] = [ms, 1]
+        else:
+            entry[0] += ms
+            entry[1] += 1
+    if histogram is not None:
+        metrics.observe(histogram, ms, **labels)
+
+def server_timing(stages: Dict[str, List[float]], total_ms: float) -> str:
+    """
+    Server-Timing 헤더 값: notion;dur=12.3;desc="2", ..., total;dur=45.6
+    """
+    parts = [f'{name};dur={ms:.1f};desc="{int(n)}"' for name, (ms, n) in stages.items()]
+    parts.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(parts)
+
+def timing_header(stages: Dict[str, List[float]], total_ms: float) -> str:
+    """
+    X-Timing 헤더 값: total=45.6;notion=12.3;llm=30.1
+    """
+    return ";".join([f"total={total_ms:.1f}"] + [f"{name}={ms:.1f}" for name, (ms, _) in stages.items()])
+
+
+# -------- 프로세스 공용 인스턴스 --------
+_metrics: Optional[Metrics] = None
+_resolved = False
+_metrics_lock = threading.Lock()
+
+def get_metrics() -> Optional[Metrics]:
+    """
+    METRICS_ENABLED면 공용 레지스트리를, 아니면 None을 반환한다(설정은 처음 한 번만 읽는다).
+    """
+    global _metrics, _resolved
+    if not _resolved:
+        with _metrics_lock:
+            if not _resolved:
+                _metrics = Metrics() if get_settings().metrics_enabled else None
+                _resolved = True
+    return _metrics
@@ -3,44 +3,161 @@ app/core/time.py
 
 역할:
 - Asia/Seoul 등 지정된 타임존 기준의 '오늘 날짜'를 제공하고,
-  한국어 상대 날짜(오늘/내일/모레/어제)를 간단 치환하는 유틸을 제공합니다.
-- 개인용 최소 구성: 복잡한 자연어(다음주 금요일 등)는 다루지 않고, 핵심 키워드만 처리합니다.
+  한국어 상대 날짜 표현을 절대 날짜(YYYY-MM-DD)로 치환하는 유틸을 제공합니다.
+- 치환은 미리 컴파일한 정규식 하나로 문장을 한 번만 훑는다(표현별 re.sub 반복 없음).
+- 날짜 계산 기준표(오늘/내일/이번 주 금요일...)는 날짜별로 한 번만 만들어 재사용한다.
+
+지원 표현(예: 기준일 2025-10-15 수요일):
+- 오늘, 내일, 모레(내일모레), 글피, 어제(어저께), 그제(그저께)
+- 이번 주/다음 주/다다음 주/지난 주(금주·담주·차주·저번 주) X요일, 이번 주말/다음 주말
+- X요일(요일만 쓰면 오늘 포함 가장 가까운 그 요일)
+- 반복 표현('매주 X요일', '매 X요일', 'X요일마다')과 따옴표 안('…', "…", 「…」 등, 작업 제목)은 그대로 둔다.
+- 단독 단어(오늘/그제/X요일 등)는 뒤에 조사만 올 때 바꾼다('그제서야', '오늘날'은 그대로).
+- N일/N주/N개월 후·뒤·전, 하루·이틀·사흘…열흘·일주일 후·뒤·전
+- N월 N일(연도가 없으면 오늘 이후 가장 가까운 그 날짜, 이미 지났으면 내년), YYYY년 N월 N일,
+  이번 달/다음 달(내달)/지난 달 N일·말
 """
 
 from __future__ import annotations
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
+import calendar
 import re
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Optional, Union
+from zoneinfo import ZoneInfo
 
 def today_date_str(tz_name: str = "Asia/Seoul") -> str:
     """
     지정한 타임존 기준의 오늘 날짜를 YYYY-MM-DD 문자열로 반환합니다.
     """
-    tz = ZoneInfo(tz_name)
-    now = datetime.now(tz)
-    return now.strftime("%Y-%m-%d")
+    return datetime.now(ZoneInfo(tz_name)).date().isoformat()
+
+
+_WEEKDAYS = "월화수목금토일"
+_NATIVE_DAYS = {
+    "하루": 1, "이틀": 2, "사흘": 3, "나흘": 4, "닷새": 5, "엿새": 6, "이레": 7, "열흘": 10, "일주일": 7,
+}
+_DAY_WORDS = {
+    "오늘": 0, "내일": 1, "내일모레": 2, "모레": 2, "글피": 3,
+    "어제": -1, "어저께": -1, "그제": -2, "그저께": -2,
+}
+_WEEK_WORDS = {
+    "이번": 0, "금": 0, "다음": 1, "담": 1, "차": 1, "다다음": 2, "지난": -1, "저번": -1,
+}
+_MONTH_WORDS = {"이번": 0, "다음": 1, "담": 1, "내": 1, "지난": -1, "저번": -1}
+
+# 단독 날짜 단어 뒤 경계: 조사(여럿 이어져도 됨) 다음에는 한글이 오지 않아야 한다
+_BOUNDARY = (
+    r"(?=(?:부터|까지|에서|에는|에도|에|엔|으로|로|은|는|이|가|을|를|도|의|만|쯤|랑|이랑|하고|과|와|중|면|요)*"
+    r"(?![가-힣]))"
+)
+
+# 긴 표현이 먼저 오도록 나열한다(정규식 alternation은 왼쪽 우선)
+_PATTERN = re.compile(
+    # 따옴표 안(작업 제목)은 통째로 건너뛴다
+    r"(?P<quoted>'[^']*'|\"[^\"]*\"|‘[^’]*’|“[^”]*”|「[^」]*」|『[^』]*』)"
+    # 반복 일정(매주/매 주/매 X요일, X요일마다): 특정 날짜가 아니므로 그대로 둔다
+    r"|(?P<every>매\s*(?:주\s*)?[월화수목금토일](?:요일|욜)|[월화수목금토일](?:요일|욜)\s*마다)"
+    # YYYY년 N월 N일 / N월 N일
+    r"|(?P<md>(?:(?P<y>\d{4})\s*년\s*)?(?<![\d-])(?P<m>\d{1,2})\s*월\s*(?P<d>\d{1,2})\s*일)"
+    # 이번 달/다음 달/내달/지난 달 + N일/말
+    r"|(?P<rm>(?P<mw>이번|다음|담|지난|저번)\s*달|내달)\s*(?:(?P<rmd>\d{1,2})\s*일|(?P<rme>말))"
+    # (이번|다음|지난...) 주 X요일 / 주말, 또는 요일만
+    r"|(?P<wk>(?:(?P<ww>이번|다다음|다음|지난|저번)\s*(?:주\s*)?|(?P<ww2>금|담|차)주\s*)"
+    r"(?:(?P<wd>[월화수목금토일])(?:요일|욜)|(?P<we>주말)))"
+    r"|(?P<bwd>[월화수목금토일])요일" + _BOUNDARY +
+    # N일/N주/N개월 후·뒤·전
+    r"|(?<![\d-])(?P<n>\d{1,3})\s*(?P<unit>일|주일?|개월|달)\s*(?P<dir>후|뒤|전)"
+    r"|(?P<native>하루|이틀|사흘|나흘|닷새|엿새|이레|열흘|일주일)\s*(?P<ndir>후|뒤|전)"
+    # 오늘/내일/모레...
+    r"|(?P<word>내일모레|내일|모레|글피|오늘|어저께|어제|그저께|그제)" + _BOUNDARY
+)
+
+
+class _Anchors:
+    """
+    기준일 하나에 대한 계산표(고정 단어/주·요일 조합). 날짜별로 한 번만 만든다.
+    """
+    __slots__ = ("base", "words", "weeks", "upcoming")
+
+    def __init__(self, base: date) -> None:
+        self.base = base
+        self.words = {w: (base + timedelta(days=d)).isoformat() for w, d in _DAY_WORDS.items()}
+        monday = base - timedelta(days=base.weekday())
+        # (주 오프셋, 요일 인덱스) → 날짜. 주말은 토요일(5)
+        self.weeks: Dict[tuple, str] = {
+            (w, i): (monday + timedelta(weeks=w, days=i)).isoformat()
+            for w in (-1, 0, 1, 2) for i in range(7)
+        }
+        self.upcoming = {i: (base + timedelta(days=(i - base.weekday()) % 7)).isoformat() for i in range(7)}
+
+
+@lru_cache(maxsize=8)
+def _anchors(day: str) -> _Anchors:
+    return _Anchors(date.fromisoformat(day))
+
+def _add_months(d: date, months: int, day: Optional[int] = None) -> date:
+    y, m = divmod(d.month - 1 + months, 12)
+    year, month = d.year + y, m + 1
+    last = calendar.monthrange(year, month)[1]
+    return date(year, month, min(day or d.day, last))
+
+def _resolve(m: re.Match, a: _Anchors) -> str:
+    g = m.groupdict()
+    if g["quoted"] or g["every"]:
+        return m.group(0)
+    if g["word"]:
+        return a.words[g["word"]]
+    if g["bwd"]:
+        return a.upcoming[_WEEKDAYS.index(g["bwd"])]
+    if g["wk"]:
+        week = _WEEK_WORDS[g["ww"] or g["ww2"]]
+        return a.weeks[(week, _WEEKDAYS.index(g["wd"]) if g["wd"] else 5)]
+    if g["n"] or g["native"]:
+        n = int(g["n"]) if g["n"] else _NATIVE_DAYS[g["native"]]
+        if (g["dir"] or g["ndir"]) == "전":
+            n = -n
+        unit = g["unit"] or "일"
+        if unit in ("개월", "달"):
+            return _add_months(a.base, n).isoformat()
+        return (a.base + timedelta(days=n * (7 if unit.startswith("주") else 1))).isoformat()
+    if g["md"]:
+        month, day = int(g["m"]), int(g["d"])
+        if g["y"]:
+            try:
+                return date(int(g["y"]), month, day).isoformat()
+            except ValueError:
+                return m.group(0)  # 없는 날짜(2월 30일 등)는 그대로 둔다
+        # 연도가 없으면 오늘 이후 가장 가까운 그 날짜(올해 날짜가 지났으면 내년)
+        for year in (a.base.year, a.base.year + 1):
+            try:
+                candidate = date(year, month, day)
+            except ValueError:
+                continue
+            if candidate >= a.base:
+                return candidate.isoformat()
+        return m.group(0)
+    if g["rm"]:
+        offset = _MONTH_WORDS[g["mw"] or "내"]
+        first = _add_months(a.base.replace(day=1), offset)
+        if g["rme"]:
+            return first.replace(day=calendar.monthrange(first.year, first.month)[1]).isoformat()
+        try:
+            return first.replace(day=int(g["rmd"])).isoformat()
+        except ValueError:
+            return m.group(0)
+    return m.group(0)
 
-def normalize_korean_relative_dates(text: str, tz_name: str = "Asia/Seoul") -> str:
+def normalize_korean_relative_dates(
+    text: str,
+    tz_name: str = "Asia/Seoul",
+    today: Union[str, date, None] = None,
+) -> str:
     """
-    입력 문장 내의 간단한 한국어 상대 날짜를 절대 날짜(YYYY-MM-DD)로 치환합니다.
-    - 지원 키워드: 오늘(0), 내일(+1), 모레(+2), 어제(-1)
-    - '내일부터', '오늘은'처럼 조사/조사 결합은 남겨두고 핵심 단어만 치환합니다.
-    - 개인용 최소 기능: 복잡한 표현(다음주 금요일, 다음 달 첫째 주 등)은 다루지 않습니다.
+    입력 문장 내의 한국어 상대 날짜 표현을 절대 날짜(YYYY-MM-DD)로 치환합니다.
+    - '내일부터', '다음 주 금요일에'처럼 뒤에 붙은 조사는 남기고 날짜 표현만 바꿉니다.
+    - today: 기준일(YYYY-MM-DD 또는 date). 없으면 tz_name 기준 오늘.
     """
-    base = today_date_str(tz_name)
-    base_dt = datetime.fromisoformat(base)
-
-    repl = {
-        "오늘": base_dt,
-        "내일": base_dt + timedelta(days=1),
-        "모레": base_dt + timedelta(days=2),
-        "어제": base_dt - timedelta(days=1),
-    }
-
-    out = text
-    for key, dt in repl.items():
-        # 조사 결합을 고려해 'key'를 독립 토큰/연결 형태까지 포괄 치환
-        # 예) "내일", "내일은", "내일부터" 에서 '내일'만 날짜로 바꿈
-        out = re.sub(key, dt.strftime("%Y-%m-%d"), out)
-
-    return out
+    day = today.isoformat() if isinstance(today, date) else (today or today_date_str(tz_name))
+    anchors = _anchors(day)
+    return _PATTERN.sub(lambda m: _resolve(m, anchors), text)
@@ -0,0 +1,335 @@
+"""
+역할 :
+- 외부 의존성 없는 OpenTelemetry 스타일 트레이싱
+  * Span: 이름/속성/이벤트/상태와 trace_id·span_id·parent_id, 끝나면 exporter로 내보낸다
+  * 현재 span은 ContextVar로 전달된다 → HTTP 요청 → run_agent → LLM/툴 → 서비스 메서드 → Notion 호출이
+    부모-자식으로 이어진다(asyncio 태스크와 LangChain 툴 실행도 컨텍스트를 복사하므로 그대로 이어짐)
+  * W3C traceparent 헤더를 읽어 상위 trace에 이어 붙이고, 응답에는 현재 요청 span의 traceparent를 돌려준다
+- 내보내기(exporter)는 교체 가능하다: TRACING_EXPORTER = ""(끔) | "memory" | "console" | "패키지.모듈:클래스"
+  테스트는 set_exporter(InMemoryExporter())로 끝난 span을 모아 검사한다.
+- 꺼져 있으면 span()/current_span()은 공용 no-op span을 돌려준다(속성 기록도 아무것도 하지 않음).
+"""
+
+from __future__ import annotations
+import functools
+import importlib
+import inspect
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar, Token
+from typing import Any, Callable, ContextManager, Deque, Dict, Iterator, List, Optional, Tuple, Union
+from app.core.config import get_settings
+
+
+class Span:
+    """
+    끝난 뒤 exporter로 넘어가는 작업 단위 하나.
+    """
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_id", "start_time", "end_time",
+        "duration_ms", "attributes", "events", "status", "error", "_t0",
+    )
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None,
+                 attributes: Optional[Dict[str, Any]] = None) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.start_time = time.time()
+        self.end_time: Optional[float] = None
+        self.duration_ms: Optional[float] = None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.events: List[Dict[str, Any]] = []
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self._t0 = time.perf_counter()
+
+    @property
+    def recording(self) -> bool:
+        return True
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        self.attributes.update(attributes)
+
+    def add(self, key: str, amount: float = 1) -> None:
+        """
+        숫자 속성에 더한다(재시도 횟수/대기 시간 누적 등).
+        """
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        self.events.append({
+            "name": name,
+            "offset_ms": round((time.perf_counter() - self._t0) * 1000, 3),
+            "attributes": attributes or {},
+        })
+
+    def record_exception(self, error: BaseException) -> None:
+        self.status = "error"
+        self.error = f"{type(error).__name__}: {error}"
+
+    def end(self) -> None:
+        if self.end_time is None:
+            self.duration_ms = round((time.perf_counter() - self._t0) * 1000, 3)
+            self.end_time = self.start_time + self.duration_ms / 1000
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+            "events": self.events,
+        }
+
+
+class _NoopSpan:
+    """
+    트레이싱이 꺼져 있거나 현재 span이 없을 때 쓰는 빈 span.
+    """
+    __slots__ = ()
+    recording = False
+    trace_id = None
+    span_id = None
+    traceparent = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        pass
+
+    def add(self, key: str, amount: float = 1) -> None:
+        pass
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        pass
+
+    def record_exception(self, error: BaseException) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+AnySpan = Union[Span, _NoopSpan]
+
+
+# -------- 내보내기 --------
+class SpanExporter:
+    """
+    exporter 인터페이스. export()는 span이 끝날 때마다 호출되며, 예외는 트레이서가 삼킨다.
+    """
+
+    def export(self, span: Span) -> None:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        pass
+
+
+class InMemoryExporter(SpanExporter):
+    """
+    끝난 span을 메모리에 모은다(테스트/디버깅용, 최대 max_spans개).
+    """
+
+    def __init__(self, max_spans: int = 10000) -> None:
+        self._spans: Deque[Span] = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    @property
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def trace(self, trace_id: str) -> List[Span]:
+        return [s for s in self.spans if s.trace_id == trace_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+
+class ConsoleExporter(SpanExporter):
+    """
+    span 하나를 JSON 한 줄로 출력한다.
+    """
+
+    def export(self, span: Span) -> None:
+        print(json.dumps({"span": span.as_dict()}, ensure_ascii=False, default=str))
+
+
+def load_exporter(spec: str) -> Optional[SpanExporter]:
+    """
+    TRACING_EXPORTER 값을 exporter로 만든다: "" → None, "memory", "console", "모듈:클래스"
+    """
+    if not spec:
+        return None
+    if spec == "memory":
+        return InMemoryExporter()
+    if spec == "console":
+        return ConsoleExporter()
+    module, _, name = spec.partition(":")
+    if not name:
+        raise ValueError(f"TRACING_EXPORTER는 memory/console/'모듈:클래스' 중 하나여야 합니다: {spec}")
+    return getattr(importlib.import_module(module), name)()
+
+
+# -------- 트레이서 --------
+_current: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str]]:
+    """
+    W3C traceparent("00-<trace_id>-<parent_id>-<flags>") → (trace_id, parent_id). 형식이 틀리면 None.
+    """
+    m = _TRACEPARENT.match((header or "").strip().lower())
+    return (m.group(1), m.group(2)) if m else None
+
+
+class Tracer:
+    def __init__(self, exporter: SpanExporter) -> None:
+        self.exporter = exporter
+        self.export_errors = 0
+
+    def start(self, name: str, attributes: Optional[Dict[str, Any]] = None,
+              remote_parent: Optional[Tuple[str, str]] = None) -> Span:
+        """
+        현재 span(없으면 remote_parent, 그것도 없으면 새 trace)의 자식 span을 시작한다. 현재 span으로 지정하지는 않는다.
+        """
+        parent = _current.get()
+        if parent is not None:
+            return Span(name, parent.trace_id, parent.span_id, attributes)
+        if remote_parent is not None:
+            return Span(name, remote_parent[0], remote_parent[1], attributes)
+        return Span(name, os.urandom(16).hex(), None, attributes)
+
+    def finish(self, span: Span) -> None:
+        span.end()
+        try:
+            self.exporter.export(span)
+        except Exception as e:
+            self.export_errors += 1
+            print(f"[tracing] export 실패: {e}")
+
+    @contextmanager
+    def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None,
+                   remote_parent: Optional[Tuple[str, str]] = None) -> Iterator[Span]:
+        span = self.start(name, attributes, remote_parent)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _current.reset(token)
+            self.finish(span)
+
+
+# -------- 공용 진입점 --------
+_tracer: Optional[Tracer] = None
+_resolved = False
+_tracer_lock = threading.Lock()
+
+def get_tracer() -> Optional[Tracer]:
+    """
+    TRACING_EXPORTER가 있으면 공용 트레이서를, 없으면 None을 반환한다(설정은 처음 한 번만 읽는다).
+    """
+    global _tracer, _resolved
+    if not _resolved:
+        with _tracer_lock:
+            if not _resolved:
+                exporter = load_exporter(get_settings().tracing_exporter)
+                _tracer = Tracer(exporter) if exporter is not None else None
+                _resolved = True
+    return _tracer
+
+def set_exporter(exporter: Optional[SpanExporter]) -> Optional[Tracer]:
+    """
+    exporter를 바꾼다(None이면 트레이싱 끔). 설정값보다 우선한다.
+    """
+    global _tracer, _resolved
+    with _tracer_lock:
+        _tracer = Tracer(exporter) if exporter is not None else None
+        _resolved = True
+    return _tracer
+
+def current_span() -> AnySpan:
+    return _current.get() or NOOP_SPAN
+
+_NOOP_CM = nullcontext(NOOP_SPAN)
+
+def span(name: str, **attributes: Any) -> ContextManager[AnySpan]:
+    """
+    with span("agent.run", mode="plan") as s: ... 꺼져 있으면 no-op span.
+    """
+    tracer = get_tracer()
+    if tracer is None:
+        return _NOOP_CM
+    return tracer.start_span(name, attributes)
+
+def activate(s: Span) -> Token:
+    """
+    콜백처럼 with 블록을 쓸 수 없는 곳에서 span을 현재 span으로 지정한다(deactivate로 되돌림).
+    """
+    return _current.set(s)
+
+def deactivate(token: Token, parent: Optional[Span] = None) -> None:
+    try:
+        _current.reset(token)
+    except ValueError:
+        # 다른 컨텍스트에서 끝난 경우: 부모로 되돌린다
+        _current.set(parent)
+
+def traced(name: str, on_result: Optional[Callable[[AnySpan, Any], None]] = None) -> Callable:
+    """
+    함수/코루틴 함수를 span으로 감싸는 데코레이터. on_result(span, 반환값)로 결과 속성을 붙일 수 있다.
+    """
+    def decorate(fn: Callable) -> Callable:
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                tracer = get_tracer()
+                if tracer is None:
+                    return await fn(*args, **kwargs)
+                with tracer.start_span(name) as s:
+                    result = await fn(*args, **kwargs)
+                    if on_result is not None:
+                        on_result(s, result)
+                    return result
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            tracer = get_tracer()
+            if tracer is None:
+                return fn(*args, **kwargs)
+            with tracer.start_span(name) as s:
+                result = fn(*args, **kwargs)
+                if on_result is not None:
+                    on_result(s, result)
+                return result
+        return wrapper
+    return decorate
@@ -3,14 +3,123 @@ app/interface/agent.py
 
 역할:
 - 외부에서 '문자열 지시'를 받아 LangChain 에이전트를 실행하는 얇은 엔트리.
-- build_agent()는 호출 시마다 새로 생성(개인용/최소 구성). 필요하면 캐시화 가능.
+- 에이전트는 app.llm.chains.get_agent()의 캐시를 재사용한다(요청당 비용은 LLM 왕복 위주).
+- 구성(build)/실행(invoke) 시간을 측정해 응답의 timing 필드와 타이밍 훅으로 보고한다.
+- 흔한 명령은 규칙 기반 fast-path(app.llm.fastpath)로 해석해 LLM 없이 툴을 바로 호출한다.
+  확신도가 FASTPATH_MIN_CONFIDENCE 미만이거나 규칙에 맞지 않으면 에이전트(LLM)로 넘긴다.
+- LLM이 내린 툴 호출 결정은 결정 캐시(app.llm.decision_cache)에 저장해 같은 지시에 재사용한다.
+- astream_agent는 진행 이벤트(정규화/툴 선택/Notion 요청·응답/결과)를 발생 즉시 내보낸다(SSE용).
+- run_plan/arun_plan(계획 모드)은 LLM 1회 응답의 여러 tool_calls를 동시에 실행한다.
+  같은 대상(task_ref/task_id/생성 제목)을 다루는 호출끼리만 적힌 순서대로 이어서 실행하고,
+  대상 없는 조회(목록 등)가 대상 호출 뒤에 적혀 있으면 그 호출들이 모두 끝난 뒤 실행한다.
+- METRICS_ENABLED면 단계(normalize/build/invoke) 시간과 LLM·툴 콜백(app.llm.callbacks)을 메트릭에 기록한다.
+- TRACING_EXPORTER가 있으면 agent.run/agent.stream/agent.plan span을 열고 경로(fast/cache/llm)·계획 통계를 속성으로 붙인다.
 """
 
 from __future__ import annotations
-from app.llm.chains import build_agent
-from app.core.config import get_settings
-from app.core.time import normalize_korean_relative_dates
+import asyncio
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from langchain_core.tools import BaseTool
+from app.llm.callbacks import run_config
+from app.llm.chains import get_agent, get_planner
+from app.llm.decision_cache import first_tool_call, get_decision_cache
+from app.llm.fastpath import Intent, get_fastpath_stats, parse_command
+from app.llm.tools import get_tools
+from app.core.config import Settings, get_settings
+from app.core.metrics import observe_stage
+from app.core.tracing import current_span, traced
+from app.core.time import normalize_korean_relative_dates, today_date_str
+from app.services.notion_service import observe_requests
+from app.services.title_index import normalize_title
 
+# 타이밍 훅: {"build_ms", "invoke_ms", "agent_cached", "fast_path", "decision_cache"} 딕셔너리를 받는 콜백
+_timing_hook: Optional[Callable[[Dict[str, Any]], None]] = None
+
+def set_timing_hook(hook: Optional[Callable[[Dict[str, Any]], None]]) -> None:
+    """
+    run_agent 호출마다 타이밍 정보를 전달받을 콜백을 등록한다(None이면 해제).
+    """
+    global _timing_hook
+    _timing_hook = hook
+
+def _report_timing(t0: float, t1: float, t2: float, cached: bool, path: str = "llm") -> Dict[str, Any]:
+    """
+    path: "fast"(규칙 fast-path) / "cache"(결정 캐시) / "llm"(에이전트 실행)
+    """
+    timing = {
+        "build_ms": round((t1 - t0) * 1000, 2),
+        "invoke_ms": round((t2 - t1) * 1000, 2),
+        "agent_cached": cached,
+        "fast_path": path == "fast",
+        "decision_cache": path == "cache",
+    }
+    get_fastpath_stats().record_run((t2 - t0) * 1000, path)
+    observe_stage("build", timing["build_ms"], "stage_ms", stage="build", path=path)
+    observe_stage("invoke", timing["invoke_ms"], "stage_ms", stage="invoke", path=path)
+    current_span().set_attributes({"agent.path": path, "agent.cached": cached})
+    if _timing_hook is not None:
+        _timing_hook(timing)
+    return timing
+
+def _normalize(user_text: str, settings: Settings) -> str:
+    t0 = time.perf_counter()
+    text = normalize_korean_relative_dates(user_text, settings.tz)
+    observe_stage("normalize", (time.perf_counter() - t0) * 1000, "stage_ms", stage="normalize")
+    return text
+
+def _fast_intent(text: str, settings: Settings) -> Optional[Intent]:
+    """
+    규칙 파서로 해석하고, 확신도가 기준 이상일 때만 Intent를 반환한다(적중률/지연 기록).
+    """
+    if not settings.fastpath_enabled:
+        return None
+    t0 = time.perf_counter()
+    intent = parse_command(text)
+    accepted = intent is not None and intent.confidence >= settings.fastpath_min_confidence
+    get_fastpath_stats().record_parse((time.perf_counter() - t0) * 1000, intent, accepted)
+    return intent if accepted else None
+
+def _shortcut(text: str, settings: Settings) -> Optional[Tuple[str, Dict[str, Any], str, Dict[str, Any]]]:
+    """
+    LLM 없이 정할 수 있는 툴 호출: fast-path 규칙 → 결정 캐시 순.
+    반환: (tool, args, path, 결과에 덧붙일 해석 정보) 또는 None
+    """
+    intent = _fast_intent(text, settings)
+    if intent is not None:
+        return intent.tool, intent.args, "fast", {"fast_path": intent.as_dict()}
+    found = get_decision_cache().get(text, today_date_str(settings.tz))
+    if found is not None:
+        tool, args, match = found
+        return tool, args, "cache", {"decision_cache": {"tool": tool, "args": args, "match": match}}
+    return None
+
+def _remember_decision(text: str, settings: Settings, result: Dict[str, Any]) -> None:
+    # 툴 실행이 성공한 결정만 저장한다(스키마 오류/대상 없음 등은 다시 LLM에 맡김)
+    call = first_tool_call(result)
+    if call is None:
+        return
+    observation = result["intermediate_steps"][0][1]
+    if isinstance(observation, dict) and observation.get("ok"):
+        get_decision_cache().put(text, today_date_str(settings.tz), *call)
+
+def _public_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    # intermediate_steps의 AgentAction을 JSON으로 내보낼 수 있는 형태로 바꾼다
+    steps = [
+        {"tool": action.tool, "tool_input": action.tool_input, "observation": observation}
+        for action, observation in result.get("intermediate_steps") or []
+    ]
+    return {**result, "intermediate_steps": steps}
+
+def _tool(name: str) -> BaseTool:
+    for t in get_tools():
+        if t.name == name:
+            return t
+    raise ValueError(f"알 수 없는 툴: {name}")
+
+@traced("agent.run")
 def run_agent(user_text: str) -> dict:
     """
     사용자의 자연어 지시를 받아 에이전트를 실행하고, 최종 결과(툴 실행 결과)를 반환한다.
@@ -19,9 +128,284 @@ def run_agent(user_text: str) -> dict:
     """
     # 사용자의 자연어에서 간단 상대 날짜(오늘/내일/모레/어제)를 절대 날짜로 치환
     settings = get_settings()
-    normalized_text = normalize_korean_relative_dates(user_text, settings.tz)
-    agent = build_agent()
+    normalized_text = _normalize(user_text, settings)
+
+    t0 = time.perf_counter()
+    shortcut = _shortcut(normalized_text, settings)
+    if shortcut is not None:
+        tool, args, path, extra = shortcut
+        t1 = time.perf_counter()
+        output = _tool(tool).invoke(args, config=run_config())
+        t2 = time.perf_counter()
+        result = {"input": normalized_text, "output": output, **extra}
+        return {"ok": True, "result": result, "timing": _report_timing(t0, t1, t2, False, path)}
+
+    agent, cached = get_agent()
+    t1 = time.perf_counter()
     # agent.invoke는 {"input": "..."} 형태의 딕셔너리 입력을 받는다.
-    result = agent.invoke({"input": normalized_text})
+    result = agent.invoke({"input": normalized_text}, config=run_config())
+    t2 = time.perf_counter()
+    _remember_decision(normalized_text, settings, result)
+
     # result는 {"output": "...", "intermediate_steps": ...} 형태를 포함한다.
-    return {"ok": True, "result": result}
\ No newline at end of file
+    return {"ok": True, "result": _public_result(result), "timing": _report_timing(t0, t1, t2, cached)}
+
+@traced("agent.run")
+async def arun_agent(user_text: str) -> dict:
+    """
+    run_agent의 비동기 버전.
+    - agent.ainvoke로 실행되어 툴도 비동기 구현(AsyncNotionTaskService)을 사용한다.
+    """
+    settings = get_settings()
+    normalized_text = _normalize(user_text, settings)
+
+    t0 = time.perf_counter()
+    shortcut = _shortcut(normalized_text, settings)
+    if shortcut is not None:
+        tool, args, path, extra = shortcut
+        t1 = time.perf_counter()
+        output = await _tool(tool).ainvoke(args, config=run_config())
+        t2 = time.perf_counter()
+        result = {"input": normalized_text, "output": output, **extra}
+        return {"ok": True, "result": result, "timing": _report_timing(t0, t1, t2, False, path)}
+
+    agent, cached = get_agent()
+    t1 = time.perf_counter()
+    result = await agent.ainvoke({"input": normalized_text}, config=run_config())
+    t2 = time.perf_counter()
+    _remember_decision(normalized_text, settings, result)
+
+    return {"ok": True, "result": _public_result(result), "timing": _report_timing(t0, t1, t2, cached)}
+
+@traced("agent.stream")
+async def _stream_run(text: str, settings: Settings, emit: Callable[[str, Dict[str, Any]], None], t0: float) -> None:
+    shortcut = _shortcut(text, settings)
+    if shortcut is not None:
+        tool, args, path, extra = shortcut
+        emit("tool_chosen", {"tool": tool, "args": args, "source": path})
+        t1 = time.perf_counter()
+        output = await _tool(tool).ainvoke(args, config=run_config())
+        t2 = time.perf_counter()
+        emit("tool_result", {"tool": tool, "output": output})
+        result = {"input": text, "output": output, **extra}
+        emit("result", {"ok": True, "result": result, "timing": _report_timing(t0, t1, t2, False, path)})
+        return
+
+    agent, cached = get_agent()
+    t1 = time.perf_counter()
+    final: Optional[Dict[str, Any]] = None
+    async for ev in agent.astream_events({"input": text}, config=run_config(), version="v2"):
+        kind = ev["event"]
+        if kind == "on_chat_model_start":
+            emit("llm_start", {"model": ev.get("name")})
+        elif kind == "on_chat_model_end":
+            for call in getattr(ev["data"].get("output"), "tool_calls", None) or []:
+                emit("tool_chosen", {"tool": call.get("name"), "args": call.get("args"), "source": "llm"})
+        elif kind == "on_tool_end":
+            emit("tool_result", {"tool": ev.get("name"), "output": ev["data"].get("output")})
+        elif kind == "on_chain_end" and not ev.get("parent_ids"):
+            final = ev["data"].get("output")
+    t2 = time.perf_counter()
+    if not isinstance(final, dict):
+        raise RuntimeError("에이전트 실행 결과가 없습니다.")
+    _remember_decision(text, settings, final)
+    emit("result", {"ok": True, "result": _public_result(final), "timing": _report_timing(t0, t1, t2, cached)})
+
+async def astream_agent(user_text: str) -> AsyncIterator[Dict[str, Any]]:
+    """
+    arun_agent의 스트리밍 버전. {"event": 이름, "data": 내용}을 발생 순서대로 내보낸다.
+    - normalized → (llm_start) → tool_chosen → notion_request/notion_response … → tool_result → result
+    - 실패 시 마지막 이벤트는 error({"message", "status"})다.
+    - 소비자가 중단(클라이언트 연결 종료)하면 실행 중인 작업도 취소한다.
+    """
+    settings = get_settings()
+    t0 = time.perf_counter()
+    normalized_text = _normalize(user_text, settings)
+    yield {"event": "normalized", "data": {"input": user_text, "normalized": normalized_text}}
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    def emit(event: Any, data: Any) -> None:
+        # 동기 툴은 워커 스레드에서 실행될 수 있으므로 루프 스레드로 넘겨 넣는다
+        try:
+            same_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            same_loop = False
+        if same_loop:
+            queue.put_nowait((event, data))
+        else:
+            loop.call_soon_threadsafe(queue.put_nowait, (event, data))
+
+    async def produce() -> None:
+        try:
+            with observe_requests(emit):
+                await _stream_run(normalized_text, settings, emit, t0)
+        except Exception as e:
+            emit("error", {"message": f"{type(e).__name__}: {e}", "status": getattr(e, "status", None)})
+        finally:
+            emit(done, None)
+
+    task = asyncio.create_task(produce())
+    try:
+        while True:
+            event, data = await queue.get()
+            if event is done:
+                break
+            yield {"event": event, "data": data}
+    finally:
+        task.cancel()
+
+# -------- 계획 모드 --------
+def _call_target(call: Dict[str, Any]) -> Optional[str]:
+    args = call.get("args") or {}
+    ref = args.get("task_ref") or args.get("task_id") or args.get("title")
+    return normalize_title(str(ref)) if ref else None
+
+def plan_groups(calls: List[Dict[str, Any]]) -> List[List[int]]:
+    """
+    호출 인덱스를 실행 그룹으로 묶는다. 그룹 안은 순차, 그룹끼리는 동시 실행.
+    - 같은 대상(제목 정규화 기준)을 다루는 호출은 한 그룹(등장 순서 유지)
+    - 대상이 없는 호출(목록 조회 등)은 각자 단독 그룹(언제 실행할지는 plan_stages가 정함)
+    """
+    by_target: Dict[str, List[int]] = {}
+    groups: List[List[int]] = []
+    for i, call in enumerate(calls):
+        target = _call_target(call)
+        if target is None:
+            groups.append([i])
+            continue
+        if target not in by_target:
+            by_target[target] = []
+            groups.append(by_target[target])
+        by_target[target].append(i)
+    return groups
+
+def plan_stages(calls: List[Dict[str, Any]]) -> List[List[List[int]]]:
+    """
+    plan_groups의 그룹을 실행 단계로 나눈다. 단계 안의 그룹은 동시, 단계끼리는 순서대로.
+    - 대상이 있는 호출의 그룹은 모두 한 단계
+    - 대상이 없는 호출(목록 조회 등)은 첫 대상 호출보다 앞에 있으면 그 앞 단계에서,
+      뒤에 있으면 대상 그룹이 모두 끝난 다음 단계에서 실행한다
+      ("'A' 추가하고 목록 보여줘"가 추가 전 목록을 돌려주지 않도록)
+    """
+    targets = [_call_target(call) for call in calls]
+    first = next((i for i, t in enumerate(targets) if t is not None), len(calls))
+    before: List[List[int]] = []
+    targeted: List[List[int]] = []
+    after: List[List[int]] = []
+    for group in plan_groups(calls):
+        if targets[group[0]] is not None:
+            targeted.append(group)
+        elif group[0] < first:
+            before.append(group)
+        else:
+            after.append(group)
+    return [stage for stage in (before, targeted, after) if stage]
+
+def _step(call: Dict[str, Any], output: Any = None, error: Optional[Exception] = None) -> Dict[str, Any]:
+    step = {"tool": call["name"], "args": call["args"]}
+    if error is not None:
+        return {**step, "ok": False, "error": f"{type(error).__name__}: {error}"}
+    ok = output.get("ok", True) if isinstance(output, dict) else True
+    return {**step, "ok": ok, "output": output}
+
+def _plan_calls(message: Any) -> List[Dict[str, Any]]:
+    return [{"name": c["name"], "args": c.get("args") or {}} for c in getattr(message, "tool_calls", None) or []]
+
+def _plan_response(text: str, message: Any, calls: List[Dict[str, Any]], stages: List[List[List[int]]],
+                   steps: List[Dict[str, Any]], cached: bool, t0: float, t1: float, t2: float, t3: float) -> dict:
+    failed = sum(1 for s in steps if not s["ok"])
+    groups = [group for stage in stages for group in stage]
+    observe_stage("build", (t1 - t0) * 1000, "stage_ms", stage="build", path="plan")
+    observe_stage("plan", (t2 - t1) * 1000, "stage_ms", stage="plan", path="plan")
+    observe_stage("execute", (t3 - t2) * 1000, "stage_ms", stage="execute", path="plan")
+    current_span().set_attributes({
+        "agent.cached": cached, "plan.calls": len(calls), "plan.groups": len(groups), "plan.stages": len(stages),
+        "plan.failed": failed,
+    })
+    return {
+        "ok": failed == 0,
+        "result": {
+            "input": text,
+            "output": getattr(message, "content", None) or None,
+            "plan": [{"index": i, **s} for i, s in enumerate(steps)],
+            "groups": groups,
+            "stages": stages,
+            "failed": failed,
+        },
+        "timing": {
+            "build_ms": round((t1 - t0) * 1000, 2),
+            "plan_ms": round((t2 - t1) * 1000, 2),
+            "execute_ms": round((t3 - t2) * 1000, 2),
+            "agent_cached": cached,
+            "calls": len(calls),
+        },
+    }
+
+@traced("agent.plan")
+def run_plan(user_text: str) -> dict:
+    """
+    계획 모드: LLM 1회 호출로 여러 툴 호출을 받아 그룹 단위로 동시에 실행한다.
+    - 동시 실행 상한은 BATCH_CONCURRENCY. 일부 호출이 실패해도 나머지는 계속 실행한다.
+    """
+    settings = get_settings()
+    normalized_text = _normalize(user_text, settings)
+
+    t0 = time.perf_counter()
+    planner, cached = get_planner()
+    t1 = time.perf_counter()
+    message = planner.invoke({"input": normalized_text}, config=run_config())
+    t2 = time.perf_counter()
+
+    calls = _plan_calls(message)
+    stages = plan_stages(calls)
+    steps: List[Dict[str, Any]] = [{} for _ in calls]
+
+    def run_group(indices: List[int]) -> None:
+        for i in indices:
+            try:
+                steps[i] = _step(calls[i], _tool(calls[i]["name"]).invoke(calls[i]["args"], config=run_config()))
+            except Exception as e:
+                steps[i] = _step(calls[i], error=e)
+
+    # 워커 스레드에서도 요청 컨텍스트(요청 단계 타이밍/관찰자/현재 span)를 이어 쓴다
+    ctx = contextvars.copy_context()
+    for stage in stages:
+        with ThreadPoolExecutor(max_workers=max(1, min(settings.batch_concurrency, len(stage)))) as pool:
+            list(pool.map(lambda g: ctx.copy().run(run_group, g), stage))
+    t3 = time.perf_counter()
+    return _plan_response(normalized_text, message, calls, stages, steps, cached, t0, t1, t2, t3)
+
+@traced("agent.plan")
+async def arun_plan(user_text: str) -> dict:
+    """
+    run_plan의 비동기 버전(툴은 ainvoke → AsyncNotionTaskService).
+    """
+    settings = get_settings()
+    normalized_text = _normalize(user_text, settings)
+
+    t0 = time.perf_counter()
+    planner, cached = get_planner()
+    t1 = time.perf_counter()
+    message = await planner.ainvoke({"input": normalized_text}, config=run_config())
+    t2 = time.perf_counter()
+
+    calls = _plan_calls(message)
+    stages = plan_stages(calls)
+    steps: List[Dict[str, Any]] = [{} for _ in calls]
+    semaphore = asyncio.Semaphore(max(1, settings.batch_concurrency))
+
+    async def run_group(indices: List[int]) -> None:
+        async with semaphore:
+            for i in indices:
+                try:
+                    steps[i] = _step(calls[i], await _tool(calls[i]["name"]).ainvoke(calls[i]["args"], config=run_config()))
+                except Exception as e:
+                    steps[i] = _step(calls[i], error=e)
+
+    for stage in stages:
+        await asyncio.gather(*(run_group(g) for g in stage))
+    t3 = time.perf_counter()
+    return _plan_response(normalized_text, message, calls, stages, steps, cached, t0, t1, t2, t3)
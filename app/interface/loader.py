@@ -0,0 +1,62 @@
+"""
+app/interface/loader.py
+
+역할:
+- 에이전트 스택(app.interface.agent → LangChain/Gemini/툴)을 처음 쓸 때 import한다.
+  REST 엔드포인트만 쓰는 프로세스(및 --reload 재기동)는 LangChain import 비용을 내지 않는다.
+- import는 1초 가까이 걸릴 수 있어 비동기 경로에서는 이벤트 루프 밖(스레드)에서 수행한다.
+  동시에 여러 요청이 와도 import 락 때문에 실제 import는 한 번이다.
+- warm_up(): AGENT_WARMUP이면 기동 직후 백그라운드에서 import + 에이전트/플래너 구성까지 미리 해 둔다.
+"""
+
+from __future__ import annotations
+import asyncio
+import importlib
+import time
+from types import ModuleType
+from typing import Optional
+
+AGENT_MODULE = "app.interface.agent"
+
+# import가 끝난 모듈만 담는다(sys.modules에는 import 도중인 모듈도 보이므로 그것을 쓰지 않음)
+_agent: Optional[ModuleType] = None
+
+
+def is_loaded() -> bool:
+    return _agent is not None
+
+
+def load_agent() -> ModuleType:
+    """
+    app.interface.agent 모듈을 반환한다(처음 호출 시 import).
+    """
+    global _agent
+    if _agent is None:
+        _agent = importlib.import_module(AGENT_MODULE)
+    return _agent
+
+
+async def aload_agent() -> ModuleType:
+    """
+    load_agent의 비동기 버전. 아직 import 전이면 스레드에서 import해 이벤트 루프를 막지 않는다.
+    """
+    if _agent is not None:
+        return _agent
+    return await asyncio.to_thread(load_agent)
+
+
+def warm_up() -> Optional[float]:
+    """
+    에이전트 모듈 import와 에이전트/플래너 구성을 미리 한다. 걸린 시간(ms), 실패하면 None.
+    - GOOGLE_API_KEY가 없는 등 구성에 실패해도 기동은 계속한다(첫 /agent 요청에서 다시 오류가 난다).
+    """
+    t0 = time.perf_counter()
+    try:
+        load_agent()
+        from app.llm.chains import get_agent, get_planner
+        get_agent()
+        get_planner()
+    except Exception as e:
+        print(f"[startup] 에이전트 워밍업 실패: {e}")
+        return None
+    return round((time.perf_counter() - t0) * 1000, 1)
@@ -0,0 +1,196 @@
+"""
+app/llm/callbacks.py
+
+역할:
+- LangChain 콜백으로 LLM/툴 호출 시간과 LLM 토큰 수를 app.core.metrics에 기록한다.
+  * llm_request_ms{model}, llm_tokens_total{model, kind=input|output}, tool_call_ms{tool, ok}
+  * 요청 단계(Server-Timing): llm / tool
+- 트레이싱이 켜져 있으면 LLM 호출은 llm.call span, 툴 실행은 tool.<이름> span으로 남긴다.
+  툴 span은 현재 span으로 지정돼 그 안의 서비스 메서드/Notion 호출 span이 자식으로 붙는다.
+- run_agent 계열은 메트릭/트레이싱 중 켜진 것의 콜백만 config로 넘긴다(둘 다 꺼져 있으면 콜백 없음).
+"""
+
+from __future__ import annotations
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from app.core.config import get_settings
+from app.core.metrics import get_metrics, observe_stage
+from app.core.tracing import Span, activate, current_span, deactivate, get_tracer
+
+
+def _token_usage(response: LLMResult) -> Tuple[int, int]:
+    """
+    (입력 토큰, 출력 토큰). 채팅 모델은 AIMessage.usage_metadata, 그 외는 llm_output의 token_usage.
+    """
+    prompt = completion = 0
+    for generations in response.generations:
+        for gen in generations:
+            usage = getattr(getattr(gen, "message", None), "usage_metadata", None)
+            if usage:
+                prompt += usage.get("input_tokens", 0)
+                completion += usage.get("output_tokens", 0)
+    if not (prompt or completion):
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        prompt, completion = usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+    return prompt, completion
+
+
+class MetricsCallback(BaseCallbackHandler):
+    """
+    run_id별 시작 시각을 기억했다가 끝날 때 경과 시간을 기록한다. 상태는 진행 중 호출뿐이라 공유해도 된다.
+    """
+    run_inline = True  # 비동기 실행에서도 스레드풀로 넘기지 않고 바로 호출
+
+    def __init__(self) -> None:
+        self._started: Dict[UUID, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def _start(self, run_id: UUID, name: str) -> None:
+        with self._lock:
+            self._started[run_id] = (time.perf_counter(), name)
+
+    def _end(self, run_id: UUID) -> Optional[Tuple[float, str]]:
+        with self._lock:
+            started = self._started.pop(run_id, None)
+        if started is None:
+            return None
+        return (time.perf_counter() - started[0]) * 1000, started[1]
+
+    @staticmethod
+    def _model(metadata: Optional[Dict[str, Any]]) -> str:
+        return (metadata or {}).get("ls_model_name") or get_settings().gemini_model
+
+    # -------- LLM --------
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], *,
+                            run_id: UUID, metadata: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        self._start(run_id, self._model(metadata))
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], *,
+                     run_id: UUID, metadata: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        self._start(run_id, self._model(metadata))
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        ended = self._end(run_id)
+        if ended is None:
+            return
+        ms, model = ended
+        observe_stage("llm", ms, "llm_request_ms", model=model, ok=True)
+        metrics = get_metrics()
+        if metrics is not None:
+            prompt, completion = _token_usage(response)
+            metrics.inc("llm_tokens_total", prompt, model=model, kind="input")
+            metrics.inc("llm_tokens_total", completion, model=model, kind="output")
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        ended = self._end(run_id)
+        if ended is not None:
+            observe_stage("llm", ended[0], "llm_request_ms", model=ended[1], ok=False)
+
+    # -------- 툴 --------
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, *, run_id: UUID, **kwargs: Any) -> None:
+        self._start(run_id, (serialized or {}).get("name") or kwargs.get("name") or "tool")
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        ended = self._end(run_id)
+        if ended is not None:
+            ok = output.get("ok", True) if isinstance(output, dict) else True
+            observe_stage("tool", ended[0], "tool_call_ms", tool=ended[1], ok=ok)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        ended = self._end(run_id)
+        if ended is not None:
+            observe_stage("tool", ended[0], "tool_call_ms", tool=ended[1], ok=False)
+
+
+class TracingCallback(BaseCallbackHandler):
+    """
+    run_id별 진행 중 span을 기억했다가 끝날 때 내보낸다.
+    - 툴 span은 시작 시 현재 span으로 지정한다(LangChain은 on_tool_start 다음에 컨텍스트를 복사해 툴을 실행함)
+    """
+    run_inline = True
+
+    def __init__(self) -> None:
+        self._open: Dict[UUID, Tuple[Span, Any, Optional[Span]]] = {}
+        self._lock = threading.Lock()
+
+    def _start(self, run_id: UUID, name: str, attributes: Dict[str, Any], current: bool = False) -> None:
+        tracer = get_tracer()
+        if tracer is None:
+            return
+        span = tracer.start(name, attributes)
+        token = parent = None
+        if current:
+            parent = current_span() if current_span().recording else None
+            token = activate(span)
+        with self._lock:
+            self._open[run_id] = (span, token, parent)
+
+    def _end(self, run_id: UUID, error: Optional[BaseException] = None) -> Optional[Span]:
+        with self._lock:
+            opened = self._open.pop(run_id, None)
+        if opened is None:
+            return None
+        span, token, parent = opened
+        if token is not None:
+            deactivate(token, parent)
+        if error is not None:
+            span.record_exception(error)
+        return span
+
+    @staticmethod
+    def _finish(span: Optional[Span]) -> None:
+        tracer = get_tracer()
+        if span is not None and tracer is not None:
+            tracer.finish(span)
+
+    # -------- LLM --------
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], *,
+                            run_id: UUID, metadata: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        self._start(run_id, "llm.call", {"llm.model": MetricsCallback._model(metadata)})
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], *,
+                     run_id: UUID, metadata: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        self._start(run_id, "llm.call", {"llm.model": MetricsCallback._model(metadata)})
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        span = self._end(run_id)
+        if span is not None:
+            prompt, completion = _token_usage(response)
+            span.set_attributes({"llm.input_tokens": prompt, "llm.output_tokens": completion})
+        self._finish(span)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(self._end(run_id, error))
+
+    # -------- 툴 --------
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, *, run_id: UUID, **kwargs: Any) -> None:
+        name = (serialized or {}).get("name") or kwargs.get("name") or "tool"
+        self._start(run_id, f"tool.{name}", {"tool.name": name}, current=True)
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        span = self._end(run_id)
+        if span is not None:
+            span.set_attribute("tool.ok", output.get("ok", True) if isinstance(output, dict) else True)
+        self._finish(span)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(self._end(run_id, error))
+
+
+_callback = MetricsCallback()
+_tracing_callback = TracingCallback()
+
+def run_config() -> Optional[Dict[str, Any]]:
+    """
+    invoke/ainvoke에 넘길 config. 메트릭/트레이싱이 모두 꺼져 있으면 None(콜백 없음).
+    """
+    callbacks: List[BaseCallbackHandler] = []
+    if get_metrics() is not None:
+        callbacks.append(_callback)
+    if get_tracer() is not None:
+        callbacks.append(_tracing_callback)
+    return {"callbacks": callbacks} if callbacks else None
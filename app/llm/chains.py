@@ -4,6 +4,10 @@ app/llm/chains.py
 역할:
 - LLM + Tools를 결합해 '함수호출 기반' 에이전트를 구성한다.
 - 1회 호출 원칙을 프롬프트로 유도하고, 실행 레벨에선 max_iterations를 1로 제한한다.
+- 구성된 AgentExecutor는 (모델명, 툴 구성, API 키) 기준으로 캐시해 요청 간 재사용한다.
+- 계획 모드(build_planner): 한 번의 LLM 응답으로 여러 개의 독립 툴 호출(tool_calls)을 받는다.
+- set_llm_factory()로 LLM 생성 함수를 바꿀 수 있다(오프라인 벤치마크의 가짜 채팅 모델 등).
+- 설정을 다시 읽어 모델/키/LLM 타임아웃·재시도가 바뀌면 캐시한 에이전트를 버린다.
 
 전제:
 - GOOGLE_API_KEY .env/환경변수에 있어야 한다.
@@ -11,27 +15,52 @@ app/llm/chains.py
 """
 
 from __future__ import annotations
-import os
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.agents import create_openai_tools_agent, AgentExecutor
 from langchain_core.messages import SystemMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from app.llm.prompts import SYSTEM_PROMPT
+from langchain_core.runnables import Runnable
+from app.core.config import Settings, changed_fields, get_settings, on_settings_change
+from app.llm.prompts import PLAN_SYSTEM_PROMPT, SYSTEM_PROMPT
 from app.llm.tools import get_tools
 
-DEFAULT_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+# LLM 생성 함수(모델명 → 채팅 모델). None이면 ChatGoogleGenerativeAI
+_llm_factory: Optional[Callable[[str], Any]] = None
 
-def build_agent() -> AgentExecutor:
+def set_llm_factory(factory: Optional[Callable[[str], Any]]) -> None:
+    """
+    에이전트/계획 체인이 쓸 LLM 생성 함수를 바꾼다(None이면 기본 Gemini). 캐시된 에이전트는 버린다.
+    """
+    global _llm_factory
+    _llm_factory = factory
+    invalidate_agent_cache()
+
+def _build_llm(model: str | None = None) -> ChatGoogleGenerativeAI:
+    settings = get_settings()
+    if _llm_factory is not None:
+        return _llm_factory(model or settings.gemini_model)
+    if not settings.google_api_key:
+        raise RuntimeError("GOOGLE_API_KEY가 설정되어 있지 않습니다. .env를 확인하세요.")
+
+    return ChatGoogleGenerativeAI(
+        model=model or settings.gemini_model,
+        google_api_key=settings.google_api_key,
+        temperature=0,  # 결정적 응답 유도(툴 JSON 안정화)
+        timeout=settings.llm_timeout_sec or None,
+        max_retries=settings.llm_max_retries,
+    )
+
+def build_agent(model: str | None = None) -> AgentExecutor:
     """
     OpenAI 함수호출 기반 에이전트를 구성해 반환한다.
     - 도구는 app.llm.tools.get_tools()에서 로드.
     - 프롬프트는 SYSTEM_PROMPT(한국어) 하나만 단순 적용.
     - max_iterations=1로 제한(단일 호출).
     """
-    if not os.getenv("GOOGLE_API_KEY"):
-        raise RuntimeError("GOOGLE_API_KEY가 설정되어 있지 않습니다. .env를 확인하세요.")
-
-    llm = ChatGoogleGenerativeAI(model=DEFAULT_MODEL, temperature=0)  # 결정적 응답 유도(툴 JSON 안정화)
+    llm = _build_llm(model)
 
     tools = get_tools()
     # ChatPromptTemplate로 시스템/휴먼 메시지를 구성
@@ -45,6 +74,87 @@ def build_agent() -> AgentExecutor:
         agent=agent,
         tools=tools,
         max_iterations=1,           # 단일 호출
-        handle_parsing_errors=True  # 경미한 파싱 오류는 자동 복구
+        handle_parsing_errors=True, # 경미한 파싱 오류는 자동 복구
+        return_intermediate_steps=True,  # 툴 호출 결정(툴/인자)을 결정 캐시에 저장하기 위해
     )
-    return executor
\ No newline at end of file
+    return executor
+
+def build_planner(model: str | None = None) -> Runnable:
+    """
+    계획 모드 체인(prompt | llm.bind_tools)을 구성한다.
+    - 실행기는 두지 않는다: 응답 AIMessage.tool_calls 목록을 호출자가 직접(동시에) 실행한다.
+    """
+    llm = _build_llm(model)
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", PLAN_SYSTEM_PROMPT),
+        ("human", "{input}"),
+    ])
+    return prompt | llm.bind_tools(get_tools())
+
+# -------- 캐시 --------
+_agent_cache: Dict[Tuple[str, ...], AgentExecutor] = {}
+_planner_cache: Dict[Tuple[str, ...], Any] = {}
+_agent_lock = threading.Lock()
+
+def _agent_cache_key() -> Tuple[str, ...]:
+    """
+    캐시 키: 모델명 + 툴 이름 목록 + API 키 지문.
+    - 설정(모델/키)이나 툴 구성이 바뀌면 키가 달라져 자동으로 새로 구성된다.
+    """
+    settings = get_settings()
+    key_digest = hashlib.sha256((settings.google_api_key or "").encode()).hexdigest()[:16]
+    tool_names = tuple(t.name for t in get_tools())
+    return (settings.gemini_model, key_digest, *tool_names)
+
+def get_agent() -> Tuple[AgentExecutor, bool]:
+    """
+    캐시된 AgentExecutor를 반환한다(없으면 구성 후 저장).
+    - 반환값: (executor, cache_hit)
+    - AgentExecutor는 호출 간 상태를 갖지 않으므로 여러 스레드에서 공유해도 안전하다.
+    """
+    key = _agent_cache_key()
+    executor = _agent_cache.get(key)
+    if executor is not None:
+        return executor, True
+    with _agent_lock:
+        executor = _agent_cache.get(key)
+        if executor is not None:
+            return executor, True
+        executor = build_agent(model=key[0])
+        # 설정이 바뀌어 키가 달라졌다면 이전 에이전트는 더 이상 쓰지 않으므로 비운다
+        _agent_cache.clear()
+        _agent_cache[key] = executor
+        return executor, False
+
+def get_planner() -> Tuple[Runnable, bool]:
+    """
+    캐시된 계획 모드 체인을 반환한다(키 규칙은 get_agent와 같음). 반환값: (planner, cache_hit)
+    """
+    key = _agent_cache_key()
+    planner = _planner_cache.get(key)
+    if planner is not None:
+        return planner, True
+    with _agent_lock:
+        planner = _planner_cache.get(key)
+        if planner is not None:
+            return planner, True
+        planner = build_planner(model=key[0])
+        _planner_cache.clear()
+        _planner_cache[key] = planner
+        return planner, False
+
+def invalidate_agent_cache() -> None:
+    """
+    캐시된 에이전트/계획 체인을 모두 버린다(설정 재로딩 등).
+    """
+    with _agent_lock:
+        _agent_cache.clear()
+        _planner_cache.clear()
+
+_LLM_FIELDS = frozenset({"gemini_model", "google_api_key", "llm_timeout_sec", "llm_max_retries"})
+
+@on_settings_change
+def _on_settings_change(old: Settings, new: Settings) -> None:
+    # 모델/키가 바뀌면 캐시 키도 바뀌지만, 타임아웃/재시도는 키에 없으므로 직접 버린다(옛 항목 정리 겸)
+    if changed_fields(old, new) & _LLM_FIELDS:
+        invalidate_agent_cache()
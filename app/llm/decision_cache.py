@@ -0,0 +1,227 @@
+"""
+app/llm/decision_cache.py
+
+역할:
+- LLM이 내린 '툴 호출 결정'(툴 이름 + 인자)을 캐시해, 같은/거의 같은 지시에 LLM 왕복을 생략한다.
+  (Notion 결과가 아니라 결정만 저장하므로, 재사용 시에도 툴은 매번 실제로 실행된다)
+- 키: normalize_korean_relative_dates를 거친 문장의 정규화형(NFC, 대소문자/공백/끝 부호 무시)
+- 유사도 단계(선택): 로컬 임베딩 대용(문자 n-gram 해시 벡터)의 코사인 유사도가 기준 이상이고,
+  * 슬롯(따옴표 문자열/날짜/숫자)이 완전히 같으며
+  * 캐시된 인자의 문자열 값이 모두 새 문장에 들어 있을 때만 재사용한다(다른 대상으로 오인 방지).
+- TTL + LRU 크기 제한. 저장 시점의 날짜(today)가 바뀌면 만료된다.
+"""
+
+from __future__ import annotations
+import math
+import re
+import threading
+import time
+import unicodedata
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.core.config import Settings, get_settings, on_settings_change
+
+_WS = re.compile(r"\s+")
+_SLOT = re.compile(r"['\"‘“「『]([^'\"’”」』]+)['\"’”」』]|\d+(?:[-:./]\d+)*")
+_NGRAMS = (2, 3)
+_DIM = 1 << 12
+
+# 결정을 재사용하지 않는 툴(되돌리기 어려운 작업)
+NEVER_CACHE = frozenset({"delete_task_tool", "delete_task_smart_tool"})
+
+
+def canonical_text(text: str) -> str:
+    text = unicodedata.normalize("NFC", text).casefold()
+    return _WS.sub(" ", text).strip().rstrip(".!?~ ")
+
+def _slots(text: str) -> Tuple[str, ...]:
+    return tuple(m.group(1) or m.group(0) for m in _SLOT.finditer(text))
+
+def embed(text: str) -> Dict[int, float]:
+    """
+    문자 n-gram(2,3) 해시 벡터(L2 정규화). 외부 임베딩 모델의 로컬 대용.
+    - 한국어 띄어쓰기 차이('할 일'/'할일')를 흡수하도록 공백을 뺀 문자열로 계산한다.
+    """
+    padded = " " + text.replace(" ", "") + " "
+    vec: Dict[int, float] = {}
+    for n in _NGRAMS:
+        for i in range(len(padded) - n + 1):
+            h = zlib.crc32(padded[i:i + n].encode()) % _DIM
+            vec[h] = vec.get(h, 0.0) + 1.0
+    norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+    return {k: v / norm for k, v in vec.items()}
+
+def cosine(a: Dict[int, float], b: Dict[int, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(k, 0.0) for k, v in a.items())
+
+def _string_values(value: Any) -> Iterable[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for v in value.values():
+            yield from _string_values(v)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            yield from _string_values(v)
+
+
+class _Entry:
+    __slots__ = ("stored_at", "day", "tool", "args", "vector", "slots")
+
+    def __init__(self, stored_at: float, day: str, tool: str, args: Dict[str, Any], vector: Dict[int, float], slots: Tuple[str, ...]) -> None:
+        self.stored_at = stored_at
+        self.day = day
+        self.tool = tool
+        self.args = args
+        self.vector = vector
+        self.slots = slots
+
+
+class DecisionCache:
+    """
+    정규화 문장 → (툴 이름, 인자) 캐시.
+    - ttl_sec <= 0 이면 비활성, similarity <= 0 이면 유사도 단계 없이 정확 일치만 사용.
+    """
+
+    def __init__(self, ttl_sec: float, max_size: int, similarity: float = 0.0) -> None:
+        self.ttl_sec = ttl_sec
+        self.max_size = max_size
+        self.similarity = similarity
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "DecisionCache":
+        return cls(
+            ttl_sec=settings.agent_cache_ttl_sec,
+            max_size=settings.agent_cache_max_size,
+            similarity=settings.agent_cache_similarity,
+        )
+
+    def apply_settings(self, settings: Settings) -> None:
+        """
+        설정 재로딩: TTL/크기/유사도 기준을 바꾼다(저장된 결정은 유지, 크기가 줄면 오래된 것부터 제거).
+        """
+        with self._lock:
+            self.ttl_sec = settings.agent_cache_ttl_sec
+            self.max_size = settings.agent_cache_max_size
+            self.similarity = settings.agent_cache_similarity
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_sec > 0 and self.max_size > 0
+
+    def _expired(self, entry: _Entry, day: str, now: float) -> bool:
+        return entry.day != day or now - entry.stored_at >= self.ttl_sec
+
+    def get(self, text: str, day: str) -> Optional[Tuple[str, Dict[str, Any], str]]:
+        """
+        (tool, args, "exact"|"similar") 또는 None.
+        """
+        if not self.enabled:
+            return None
+        key = canonical_text(text)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if not self._expired(entry, day, now):
+                    self._entries.move_to_end(key)
+                    self.exact_hits += 1
+                    return entry.tool, entry.args, "exact"
+                del self._entries[key]
+                self.expirations += 1
+            if self.similarity > 0:
+                found = self._similar_locked(key, day, now)
+                if found is not None:
+                    self.similar_hits += 1
+                    return found.tool, found.args, "similar"
+            self.misses += 1
+            return None
+
+    def _similar_locked(self, key: str, day: str, now: float) -> Optional[_Entry]:
+        slots = _slots(key)
+        vector = embed(key)
+        best, best_score = None, self.similarity
+        for entry in list(self._entries.values()):
+            if entry.slots != slots or self._expired(entry, day, now):
+                continue
+            score = cosine(vector, entry.vector)
+            if score >= best_score and all(canonical_text(v) in key for v in _string_values(entry.args) if v):
+                best, best_score = entry, score
+        return best
+
+    def put(self, text: str, day: str, tool: str, args: Dict[str, Any]) -> None:
+        if not self.enabled or tool in NEVER_CACHE:
+            return
+        key = canonical_text(text)
+        with self._lock:
+            self._entries[key] = _Entry(time.monotonic(), day, tool, args, embed(key), _slots(key))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.exact_hits + self.similar_hits + self.misses
+            hits = self.exact_hits + self.similar_hits
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "ttl_sec": self.ttl_sec,
+                "similarity": self.similarity,
+                "exact_hits": self.exact_hits,
+                "similar_hits": self.similar_hits,
+                "misses": self.misses,
+                "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+            }
+
+
+def first_tool_call(result: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    AgentExecutor 결과(return_intermediate_steps=True)에서 첫 툴 호출 (tool, args)를 꺼낸다.
+    """
+    steps: List[Any] = result.get("intermediate_steps") or []
+    if not steps:
+        return None
+    action = steps[0][0]
+    args = getattr(action, "tool_input", None)
+    if not isinstance(args, dict):
+        return None
+    return action.tool, args
+
+
+# -------- 프로세스 공용 인스턴스 --------
+_cache: Optional[DecisionCache] = None
+_cache_lock = threading.Lock()
+
+def get_decision_cache() -> DecisionCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = DecisionCache.from_settings(get_settings())
+    return _cache
+
+@on_settings_change
+def _apply_settings(old: Settings, new: Settings) -> None:
+    if _cache is not None:
+        _cache.apply_settings(new)
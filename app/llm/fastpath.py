@@ -0,0 +1,197 @@
+"""
+app/llm/fastpath.py
+
+역할:
+- 흔한 한국어 명령을 규칙(정규식)으로 해석해 LLM 없이 바로 툴 호출로 바꾸는 fast-path 파서.
+  * 완료:   "'보고서 작성' 완료 처리해줘"           → complete_task_smart_tool
+  * 생성:   "2025-10-18 '운동' 추가"               → create_task_tool
+  * 속성:   "'운동' 상태를 진행 중으로 바꿔줘"      → update_property_smart_tool
+  * 일정:   "'운동' 2025-10-20으로 미뤄줘"          → update_property_smart_tool(날짜)
+- 입력은 normalize_korean_relative_dates를 거친 문장(상대 날짜가 YYYY-MM-DD로 치환됨)이다.
+- 문장 전체가 규칙과 맞을 때만 인정한다(부정/질문/추가 조건이 섞이면 LLM으로 넘김).
+- 제목을 따옴표로 감싸면 확신도 1.0, 따옴표 없이 추정한 제목은 0.85.
+- 이 모듈은 LangChain을 import 하지 않는다(파싱만 담당, 실행은 app.interface.agent).
+"""
+
+from __future__ import annotations
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.services.schema import PROPERTY_ALIASES, PROP_CATEGORY, PROP_DATE, PROP_NOTES, PROP_STATUS
+
+QUOTED_CONFIDENCE = 1.0
+BARE_CONFIDENCE = 0.85
+
+_OPEN = "'\"‘“「『"
+_CLOSE = "'\"’”」』"
+# 따옴표 제목(q) 또는 따옴표 없는 제목(bare)
+_TITLE = rf"(?:[{_OPEN}](?P<q>[^{_CLOSE}]+)[{_CLOSE}]|(?P<bare>[^\s{_OPEN}](?:[^{_OPEN}{_CLOSE}]*?[^\s{_CLOSE}])?))"
+_VALUE = rf"(?:[{_OPEN}](?P<qv>[^{_CLOSE}]+)[{_CLOSE}]|(?P<value>\S(?:.*?\S)?))"
+_DATE = r"\d{4}-\d{2}-\d{2}"
+_OBJ = r"\s*(?:을|를|은|는)?\s*"
+# 문장 끝 공손 표현/부호
+_TAIL = r"\s*(?:좀\s*)?(?:해\s*줘|해\s*주세요|해\s*줄래|해\s*라|해|줘|주세요|요)?\s*[.!~]*\s*$"
+_CHANGE = r"(?:변경|바꿔|바꾸|수정|설정|지정)"
+
+_FIELDS = {PROP_STATUS, PROP_CATEGORY, PROP_DATE, PROP_NOTES}
+
+
+class Intent:
+    """
+    파싱 결과: 호출할 툴 이름과 인자, 확신도, 적용된 규칙 이름.
+    """
+    __slots__ = ("tool", "args", "confidence", "rule")
+
+    def __init__(self, tool: str, args: Dict[str, Any], confidence: float, rule: str) -> None:
+        self.tool = tool
+        self.args = args
+        self.confidence = confidence
+        self.rule = rule
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"tool": self.tool, "args": self.args, "confidence": self.confidence, "rule": self.rule}
+
+
+def _title(m: re.Match) -> Tuple[str, float]:
+    if m.group("q"):
+        return m.group("q").strip(), QUOTED_CONFIDENCE
+    return m.group("bare").strip(), BARE_CONFIDENCE
+
+
+def _complete(m: re.Match) -> Intent:
+    title, conf = _title(m)
+    return Intent("complete_task_smart_tool", {"task_ref": title}, conf, "complete")
+
+def _create(m: re.Match) -> Intent:
+    title, conf = _title(m)
+    args: Dict[str, Any] = {"title": title}
+    due = m.group("d1") or m.group("d2")
+    if due:
+        args["due"] = due
+    return Intent("create_task_tool", args, conf, "create")
+
+def _update(m: re.Match) -> Optional[Intent]:
+    title, conf = _title(m)
+    field = PROPERTY_ALIASES.get(m.group("field"), m.group("field"))
+    value = (m.group("qv") or m.group("value") or "").strip()
+    if field not in _FIELDS or not value:
+        return None
+    if field == PROP_DATE and not re.fullmatch(_DATE, value):
+        return None
+    return Intent("update_property_smart_tool", {"task_ref": title, "field": field, "value": value}, conf, "update")
+
+def _reschedule(m: re.Match) -> Intent:
+    title, conf = _title(m)
+    args = {"task_ref": title, "field": PROP_DATE, "value": m.group("date")}
+    return Intent("update_property_smart_tool", args, conf, "reschedule")
+
+
+_RULES: List[Tuple[re.Pattern, Callable[[re.Match], Optional[Intent]]]] = [
+    (
+        re.compile(
+            rf"^\s*{_TITLE}\s*(?:의\s*)?(?P<field>상태|카테고리|날짜|메모|마감일?)\s*(?:을|를|은|는)?\s*"
+            rf"{_VALUE}\s*(?:으로|로)\s*{_CHANGE}{_TAIL}"
+        ),
+        _update,
+    ),
+    (
+        re.compile(rf"^\s*{_TITLE}{_OBJ}(?P<date>{_DATE})\s*(?:으로|로)\s*(?:미뤄|옮겨|연기|변경|바꿔){_TAIL}"),
+        _reschedule,
+    ),
+    (
+        re.compile(rf"^\s*{_TITLE}{_OBJ}(?:완료|끝|done)\s*(?:처리|로\s*(?:표시|{_CHANGE}))?{_TAIL}"),
+        _complete,
+    ),
+    (
+        re.compile(rf"^\s*{_TITLE}{_OBJ}(?:끝냈어|다\s*했어|완료했어)\s*[.!~]*\s*$"),
+        _complete,
+    ),
+    (
+        re.compile(
+            rf"^\s*(?:(?P<d1>{_DATE})\s*(?:에|까지)?\s*)?{_TITLE}{_OBJ}"
+            rf"(?:(?P<d2>{_DATE})\s*(?:에|까지)?\s*)?(?:할\s*일(?:로|에)?\s*)?(?:추가|등록|생성|만들어){_TAIL}"
+        ),
+        _create,
+    ),
+]
+
+
+def parse_command(text: str) -> Optional[Intent]:
+    """
+    문장이 규칙 중 하나와 완전히 일치하면 Intent, 아니면 None.
+    """
+    text = text.strip()
+    if not text or "\n" in text:
+        return None
+    for pattern, build in _RULES:
+        m = pattern.match(text)
+        if m is not None:
+            intent = build(m)
+            if intent is not None:
+                return intent
+    return None
+
+
+class FastPathStats:
+    """
+    fast-path 적중률/지연 카운터(스레드 안전).
+    - hits: 규칙으로 처리한 요청, low_confidence: 규칙은 맞았지만 확신도 미달로 LLM에 넘긴 요청
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.attempts = 0
+        self.hits = 0
+        self.low_confidence = 0
+        self.parse_ms = 0.0
+        self.fast_ms = 0.0
+        self.cache_runs = 0
+        self.cache_ms = 0.0
+        self.llm_calls = 0
+        self.llm_ms = 0.0
+        self.by_rule: Dict[str, int] = {}
+
+    def record_parse(self, elapsed_ms: float, intent: Optional[Intent], accepted: bool) -> None:
+        with self._lock:
+            self.attempts += 1
+            self.parse_ms += elapsed_ms
+            if accepted and intent is not None:
+                self.hits += 1
+                self.by_rule[intent.rule] = self.by_rule.get(intent.rule, 0) + 1
+            elif intent is not None:
+                self.low_confidence += 1
+
+    def record_run(self, elapsed_ms: float, path: str) -> None:
+        """
+        path: "fast" / "cache"(결정 캐시 재사용) / "llm"
+        """
+        with self._lock:
+            if path == "fast":
+                self.fast_ms += elapsed_ms
+            elif path == "cache":
+                self.cache_runs += 1
+                self.cache_ms += elapsed_ms
+            else:
+                self.llm_calls += 1
+                self.llm_ms += elapsed_ms
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "attempts": self.attempts,
+                "hits": self.hits,
+                "hit_ratio": round(self.hits / self.attempts, 4) if self.attempts else 0.0,
+                "low_confidence": self.low_confidence,
+                "by_rule": dict(self.by_rule),
+                "avg_parse_ms": round(self.parse_ms / self.attempts, 4) if self.attempts else 0.0,
+                "avg_fast_ms": round(self.fast_ms / self.hits, 2) if self.hits else 0.0,
+                "avg_cache_ms": round(self.cache_ms / self.cache_runs, 2) if self.cache_runs else 0.0,
+                "avg_llm_ms": round(self.llm_ms / self.llm_calls, 2) if self.llm_calls else 0.0,
+            }
+
+
+# -------- 프로세스 공용 인스턴스 --------
+_stats = FastPathStats()
+
+def get_fastpath_stats() -> FastPathStats:
+    return _stats
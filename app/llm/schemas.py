@@ -64,4 +64,19 @@ class DeleteTaskSmartInput(BaseModel):
 class UpdatePropertySmartInput(BaseModel):
     task_ref: str = Field(..., description="page_id 또는 제목 문자열")
     field: Literal["상태", "카테고리", "날짜", "메모"] = Field(..., description="변경할 속성명(한글)")
-    value: str = Field(..., description="설정할 값(상태/카테고리=옵션 라벨, 날짜=YYYY-MM-DD, 메모=텍스트)")
\ No newline at end of file
+    value: str = Field(..., description="설정할 값(상태/카테고리=옵션 라벨, 날짜=YYYY-MM-DD, 메모=텍스트)")
+
+# ---- 일괄 처리 ----
+class BatchOperation(BaseModel):
+    op: Literal["create", "update", "complete", "archive"] = Field(..., description="작업 종류")
+    task_id: Optional[str] = Field(None, description="update/complete/archive 대상 page_id")
+    patch: Optional[Dict[str, Any]] = Field(None, description="update용 Notion properties patch")
+    title: Optional[str] = Field(None, description="create용 제목")
+    due: Optional[str] = Field(None, description="create용 날짜(YYYY-MM-DD)")
+    priority: Optional[str] = Field(None, description="create용 카테고리 옵션 라벨")
+    notes: Optional[str] = Field(None, description="create용 메모")
+    confirm: Optional[bool] = Field(None, description="archive 실수 방지 확인 플래그(archive는 True 필수)")
+
+class BatchInput(BaseModel):
+    operations: List[BatchOperation] = Field(..., min_length=1, max_length=1000, description="혼합 작업 목록")
+    concurrency: Optional[int] = Field(None, ge=1, le=50, description="동시 실행 상한(기본: 설정값)")
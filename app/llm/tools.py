@@ -3,16 +3,20 @@
 - NotionTaskService를 호출하는 LangChain Tools 정의.
 - 입력/출력 스키마는 pydantic(BaseModel)로 엄격하게 관리.
 - '단일 책임' 원칙: 각 툴은 정확히 한 가지 동작만 수행.
+- 각 툴은 동기 구현(invoke)과 비동기 구현(ainvoke, AsyncNotionTaskService 사용)을 함께 가진다.
+- 결과 페이지는 TaskRecord 형태로 줄여 돌려준다(LLM 컨텍스트/결정 캐시에 원본 페이지를 싣지 않음).
 
 주의:
 - DB 실제 속성명(할 일/날짜/메모/카테고리/상태)에 맞춰 서비스가 작성되어 있어야 한다.
 """
 
 from __future__ import annotations
-from typing import List, Any, Dict
+from typing import Awaitable, Callable, List, Any, Dict
 
-from langchain_core.tools import tool
-from app.services.notion_service import NotionTaskService
+from langchain_core.tools import BaseTool, tool
+from app.services.notion_service import get_async_notion_service, get_notion_service
+from app.services.records import project_list, project_page
+from app.services.schema import SchemaError
 from app.llm.schemas import (
     CreateTaskInput,
     UpdateTaskInput,
@@ -24,6 +28,19 @@ from app.llm.schemas import (
     DeleteTaskSmartInput,
     UpdatePropertySmartInput
 )
+def _schema_error(e: SchemaError) -> Dict[str, Any]:
+    # 스키마 검증 실패는 Notion 호출 없이 바로 LLM/사용자에게 돌려준다
+    return {"ok": False, "message": str(e)}
+
+def _async_impl(sync_tool: BaseTool) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """
+    비동기 구현을 기존 툴의 coroutine으로 등록하는 데코레이터(ainvoke 시 사용).
+    """
+    def register(coro: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        sync_tool.coroutine = coro
+        return coro
+    return register
+
 # ---- 목록 조회 ----
 @tool(args_schema=ListTasksInput, return_direct=False)
 def list_tasks_tool(page_size: int = 10) -> Dict[str, Any]:
@@ -31,9 +48,9 @@ def list_tasks_tool(page_size: int = 10) -> Dict[str, Any]:
     Notion Tasks 목록을 조회한다.
     - page_size: 1~100
     """
-    svc = NotionTaskService()
+    svc = get_notion_service()
     data = svc.list_tasks(page_size=page_size)
-    return {"ok": True, "data": data}
+    return {"ok": True, "data": project_list(data)}
 
 # ---- 생성 ----
 @tool(args_schema=CreateTaskInput, return_direct=False)
@@ -52,16 +69,19 @@ def create_task_tool(
     - priority는 '카테고리(select)'에 반영(실제 옵션 라벨과 일치해야 함).
     - notes는 '메모(rich_text)'에 반영.
     """
-    svc = NotionTaskService()
-    data = svc.create_task(
-        title=title,
-        due=due,
-        assignee_ids=assignee_ids,
-        priority=priority,
-        tags=tags,
-        notes=notes,
-    )
-    return {"ok": True, "data": data}
+    svc = get_notion_service()
+    try:
+        data = svc.create_task(
+            title=title,
+            due=due,
+            assignee_ids=assignee_ids,
+            priority=priority,
+            tags=tags,
+            notes=notes,
+        )
+    except SchemaError as e:
+        return _schema_error(e)
+    return {"ok": True, "data": project_page(data)}
 
 # ---- 업데이트(부분) ----
 @tool(args_schema=UpdateTaskInput, return_direct=False)
@@ -74,9 +94,12 @@ def update_task_tool(task_id: str, patch: Dict[str, Any]) -> Dict[str, Any]:
        {'날짜': {'date': {'start': '2025-10-25'}}}
        {'메모': {'rich_text': [{'text': {'content': '내용'}}]}}
     """
-    svc = NotionTaskService()
-    data = svc.update_task(task_id=task_id, patch=patch)
-    return {"ok": True, "data": data}
+    svc = get_notion_service()
+    try:
+        data = svc.update_task(task_id=task_id, patch=patch)
+    except SchemaError as e:
+        return _schema_error(e)
+    return {"ok": True, "data": project_page(data)}
 
 # ---- 완료 ----
 @tool(args_schema=CompleteTaskInput, return_direct=False)
@@ -84,9 +107,9 @@ def complete_task_tool(task_id: str) -> Dict[str, Any]:
     """
     Task를 완료 처리한다(상태='완료').
     """
-    svc = NotionTaskService()
+    svc = get_notion_service()
     data = svc.complete_task(task_id=task_id)
-    return {"ok": True, "data": data}
+    return {"ok": True, "data": project_page(data)}
 
 # ---- 삭제(아카이브) ----
 @tool(args_schema=DeleteTaskInput, return_direct=False)
@@ -97,9 +120,9 @@ def delete_task_tool(task_id: str, confirm: bool = False) -> Dict[str, Any]:
     """
     if not confirm:
         return {"ok": False, "message": "confirm=True 필요"}
-    svc = NotionTaskService()
+    svc = get_notion_service()
     data = svc.delete_task(task_id=task_id)
-    return {"ok": True, "data": data}
+    return {"ok": True, "data": project_page(data)}
 
 @tool(args_schema=CompleteTaskSmartInput, return_direct=False)
 def complete_task_smart_tool(task_ref: str) -> Dict[str, Any]:
@@ -107,12 +130,12 @@ def complete_task_smart_tool(task_ref: str) -> Dict[str, Any]:
     제목 또는 page_id로 Task를 완료 처리한다(상태='완료').
     - task_ref가 UUID-like이면 그대로 사용, 아니면 제목 검색으로 page_id를 해석한다.
     """
-    svc = NotionTaskService()
+    svc = get_notion_service()
     task_id = svc.resolve_task_id(task_ref)
     if not task_id:
         return {"ok": False, "message": f"대상을 찾을 수 없습니다: {task_ref}"}
     data = svc.complete_task(task_id=task_id)
-    return {"ok": True, "data": data}
+    return {"ok": True, "data": project_page(data)}
 
 # ---- 스마트 업데이트(제목 또는 ID) ----
 @tool(args_schema=UpdateTaskSmartInput, return_direct=False)
@@ -121,12 +144,16 @@ def update_task_smart_tool(task_ref: str, patch: Dict[str, Any]) -> Dict[str, An
     제목 또는 page_id로 Task 속성을 부분 업데이트한다.
     - 예) 상태 변경: {"상태": {"status": {"name": "계획 중"}}}
     """
-    svc = NotionTaskService()
+    svc = get_notion_service()
+    try:
+        patch = svc.schema().validate_patch(patch)
+    except SchemaError as e:
+        return _schema_error(e)
     task_id = svc.resolve_task_id(task_ref)
     if not task_id:
         return {"ok": False, "message": f"대상을 찾을 수 없습니다: {task_ref}"}
     data = svc.update_task(task_id=task_id, patch=patch)
-    return {"ok": True, "data": data}
+    return {"ok": True, "data": project_page(data)}
 
 # ---- 스마트 삭제(제목 또는 ID) ----
 @tool(args_schema=DeleteTaskSmartInput, return_direct=False)
@@ -136,43 +163,136 @@ def delete_task_smart_tool(task_ref: str, confirm: bool = False) -> Dict[str, An
     """
     if not confirm:
         return {"ok": False, "message": "confirm=True 필요"}
-    svc = NotionTaskService()
+    svc = get_notion_service()
     task_id = svc.resolve_task_id(task_ref)
     if not task_id:
         return {"ok": False, "message": f"대상을 찾을 수 없습니다: {task_ref}"}
     data = svc.delete_task(task_id=task_id)
-    return {"ok": True, "data": data}
+    return {"ok": True, "data": project_page(data)}
 
 # ---- 범용 속성 변경 스마트 툴(제목 또는 ID) ----
 @tool(args_schema=UpdatePropertySmartInput, return_direct=False)
 def update_property_smart_tool(task_ref: str, field: str, value: str) -> Dict[str, Any]:
     """
     제목 또는 page_id로 Task의 '상태/카테고리/날짜/메모' 중 하나를 변경한다.
-    - 서버에서 속성별 Notion patch를 자동 구성한다.
+    - 서버에서 DB 스키마(속성 타입)에 맞춰 Notion patch를 자동 구성한다.
       * 상태: {"상태": {"status": {"name": value}}}
       * 카테고리: {"카테고리": {"select": {"name": value}}}
       * 날짜: {"날짜": {"date": {"start": value}}}
       * 메모: {"메모": {"rich_text": [{"text": {"content": value}}]}}
+    - 없는 속성/옵션 라벨은 대상 조회 전에 거절한다('work' → '💪 Work' 같은 별칭은 매핑).
     """
-    svc = NotionTaskService()
+    svc = get_notion_service()
+    try:
+        patch = svc.schema().property_patch(field, value)
+    except SchemaError as e:
+        return _schema_error(e)
+
     task_id = svc.resolve_task_id(task_ref)
     if not task_id:
         return {"ok": False, "message": f"대상을 찾을 수 없습니다: {task_ref}"}
 
-    # 속성별 patch 자동 구성
-    if field == "상태":
-        patch = {"상태": {"status": {"name": value}}}
-    elif field == "카테고리":
-        patch = {"카테고리": {"select": {"name": value}}}
-    elif field == "날짜":
-        patch = {"날짜": {"date": {"start": value}}}
-    elif field == "메모":
-        patch = {"메모": {"rich_text": [{"text": {"content": value}}]}}
-    else:
-        return {"ok": False, "message": f"지원하지 않는 속성: {field}"}
-
     data = svc.update_task(task_id=task_id, patch=patch)
-    return {"ok": True, "data": data}
+    return {"ok": True, "data": project_page(data)}
+
+# ---- 비동기 구현(ainvoke) ----
+@_async_impl(list_tasks_tool)
+async def _alist_tasks(page_size: int = 10) -> Dict[str, Any]:
+    svc = get_async_notion_service()
+    data = await svc.list_tasks(page_size=page_size)
+    return {"ok": True, "data": project_list(data)}
+
+@_async_impl(create_task_tool)
+async def _acreate_task(
+    title: str,
+    due: str | None = None,
+    assignee_ids: List[str] | None = None,
+    priority: str | None = None,
+    tags: List[str] | None = None,
+    notes: str | None = None,
+) -> Dict[str, Any]:
+    svc = get_async_notion_service()
+    try:
+        data = await svc.create_task(
+            title=title,
+            due=due,
+            assignee_ids=assignee_ids,
+            priority=priority,
+            tags=tags,
+            notes=notes,
+        )
+    except SchemaError as e:
+        return _schema_error(e)
+    return {"ok": True, "data": project_page(data)}
+
+@_async_impl(update_task_tool)
+async def _aupdate_task(task_id: str, patch: Dict[str, Any]) -> Dict[str, Any]:
+    svc = get_async_notion_service()
+    try:
+        data = await svc.update_task(task_id=task_id, patch=patch)
+    except SchemaError as e:
+        return _schema_error(e)
+    return {"ok": True, "data": project_page(data)}
+
+@_async_impl(complete_task_tool)
+async def _acomplete_task(task_id: str) -> Dict[str, Any]:
+    svc = get_async_notion_service()
+    data = await svc.complete_task(task_id=task_id)
+    return {"ok": True, "data": project_page(data)}
+
+@_async_impl(delete_task_tool)
+async def _adelete_task(task_id: str, confirm: bool = False) -> Dict[str, Any]:
+    if not confirm:
+        return {"ok": False, "message": "confirm=True 필요"}
+    svc = get_async_notion_service()
+    data = await svc.delete_task(task_id=task_id)
+    return {"ok": True, "data": project_page(data)}
+
+@_async_impl(complete_task_smart_tool)
+async def _acomplete_task_smart(task_ref: str) -> Dict[str, Any]:
+    svc = get_async_notion_service()
+    task_id = await svc.resolve_task_id(task_ref)
+    if not task_id:
+        return {"ok": False, "message": f"대상을 찾을 수 없습니다: {task_ref}"}
+    data = await svc.complete_task(task_id=task_id)
+    return {"ok": True, "data": project_page(data)}
+
+@_async_impl(update_task_smart_tool)
+async def _aupdate_task_smart(task_ref: str, patch: Dict[str, Any]) -> Dict[str, Any]:
+    svc = get_async_notion_service()
+    try:
+        patch = (await svc.schema()).validate_patch(patch)
+    except SchemaError as e:
+        return _schema_error(e)
+    task_id = await svc.resolve_task_id(task_ref)
+    if not task_id:
+        return {"ok": False, "message": f"대상을 찾을 수 없습니다: {task_ref}"}
+    data = await svc.update_task(task_id=task_id, patch=patch)
+    return {"ok": True, "data": project_page(data)}
+
+@_async_impl(delete_task_smart_tool)
+async def _adelete_task_smart(task_ref: str, confirm: bool = False) -> Dict[str, Any]:
+    if not confirm:
+        return {"ok": False, "message": "confirm=True 필요"}
+    svc = get_async_notion_service()
+    task_id = await svc.resolve_task_id(task_ref)
+    if not task_id:
+        return {"ok": False, "message": f"대상을 찾을 수 없습니다: {task_ref}"}
+    data = await svc.delete_task(task_id=task_id)
+    return {"ok": True, "data": project_page(data)}
+
+@_async_impl(update_property_smart_tool)
+async def _aupdate_property_smart(task_ref: str, field: str, value: str) -> Dict[str, Any]:
+    svc = get_async_notion_service()
+    try:
+        patch = (await svc.schema()).property_patch(field, value)
+    except SchemaError as e:
+        return _schema_error(e)
+    task_id = await svc.resolve_task_id(task_ref)
+    if not task_id:
+        return {"ok": False, "message": f"대상을 찾을 수 없습니다: {task_ref}"}
+    data = await svc.update_task(task_id=task_id, patch=patch)
+    return {"ok": True, "data": project_page(data)}
 
 # ---- 에이전트 등록 툴 ----
 def get_tools() -> List:
@@ -1,11 +1,161 @@
 """
 역할 :
 - FastAPI 애플리케이션 인스턴스를 생성하고 라우터를 등록
+- METRICS_ENABLED면 /metrics(Prometheus 텍스트)와 요청별 Server-Timing / X-Timing 헤더를 붙인다
+  (스트리밍 응답은 헤더를 보내는 시점까지의 시간만 담긴다)
+- TRACING_EXPORTER가 있으면 요청마다 루트 span을 연다(들어온 traceparent에 이어 붙이고, 응답에 traceparent를 돌려줌)
 """
 
-from fastapi import FastAPI
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+from notion_client.errors import APIResponseError
 from app.api.v1.routers import v1_router
-from app.core.config import get_settings
+from app.core.config import get_settings, install_reload_signal, remove_reload_signal, watch_env_file
+from app.core.metrics import Metrics, begin_request, end_request, get_metrics, server_timing, timing_header
+from app.core.tracing import Tracer, get_tracer, parse_traceparent
+from app.interface.loader import warm_up
+from app.llm.decision_cache import get_decision_cache
+from app.llm.fastpath import get_fastpath_stats
+from app.services.notion_service import (
+  get_notion_service,
+  close_notion_service,
+  get_async_notion_service,
+  aclose_async_notion_service,
+)
+from app.services.cache import get_task_cache
+from app.services.change_feed import get_change_feed
+from app.services.mirror import close_task_mirror, get_task_mirror, run_sync_loop
+from app.services.ratelimit import get_notion_limiter
+from app.services.schema import SchemaError
+from app.services.singleflight import get_single_flight
+from app.services.title_index import get_title_index
+from app.services.write_queue import close_write_queue, get_write_queue
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+  """
+  앱 수명주기 훅.
+  - 기동 시: 공용 NotionTaskService / AsyncNotionTaskService(커넥션 풀)를 미리 생성
+  - 기동 시: MIRROR_DB_PATH가 있으면 SQLite 미러 증분 동기화 루프를 백그라운드로 시작
+  - 기동 시: WRITE_JOURNAL_PATH가 있으면 지연 쓰기 워커를 백그라운드로 시작
+  - 기동 시: CHANGE_FEED_POLL_SEC > 0 이면 변경 피드 폴러를 백그라운드로 시작
+  - 기동 시: AGENT_WARMUP이면 에이전트(LangChain) import/구성을 백그라운드 스레드에서 미리 수행
+  - 기동 시: 설정을 한 번 출력(토큰/키는 가림)하고, SIGHUP / .env 변경(SETTINGS_WATCH_SEC) 시 다시 읽도록 등록
+  - 종료 시: 백그라운드 루프를 취소하고 끝날 때까지 기다린 뒤 커넥션 풀과 SQLite(저널/미러) 연결을 닫음
+  """
+  sync_task = None
+  write_task = None
+  feed_task = None
+  warmup_task = None
+  watch_task = None
+  settings = get_settings()
+  print(f"[startup] {settings!r}")
+  install_reload_signal()
+  if settings.settings_watch_sec > 0:
+    watch_task = asyncio.create_task(watch_env_file(settings.settings_watch_sec))
+  if settings.agent_warmup:
+    warmup_task = asyncio.create_task(asyncio.to_thread(warm_up))
+  try:
+    get_notion_service()
+    async_svc = get_async_notion_service()
+    mirror = get_task_mirror()
+    if mirror is not None:
+      sync_task = asyncio.create_task(run_sync_loop(mirror, settings.mirror_sync_interval_sec))
+    queue = get_write_queue()
+    if queue is not None:
+      write_task = asyncio.create_task(
+        queue.run(async_svc, settings.write_flush_interval_sec, settings.batch_concurrency)
+      )
+    if settings.change_feed_poll_sec > 0:
+      feed_task = asyncio.create_task(get_change_feed().run(async_svc, settings.change_feed_poll_sec))
+  except RuntimeError as e:
+    # 환경변수가 없으면 기동은 계속하고, 첫 요청 시점에 다시 오류를 노출
+    print(f"[startup] Notion 서비스 초기화 생략: {e}")
+  yield
+  remove_reload_signal()
+  tasks = [t for t in (sync_task, write_task, feed_task, warmup_task, watch_task) if t is not None]
+  for task in tasks:
+    task.cancel()
+  # 진행 중이던 Notion 호출/저널 기록이 정리된 뒤에 풀과 연결을 닫는다
+  await asyncio.gather(*tasks, return_exceptions=True)
+  close_notion_service()
+  await aclose_async_notion_service()
+  close_write_queue()
+  close_task_mirror()
+
+def _cache_gauges() -> list:
+  """
+  /metrics 게이지: 캐시 적중률과 리미터 상태(조회 시점 값)
+  """
+  tasks = get_task_cache().stats()
+  index = get_title_index().stats()
+  decisions = get_decision_cache().stats()
+  fast = get_fastpath_stats().stats()
+  flights = get_single_flight().stats()
+  limiter = get_notion_limiter().stats()
+  index_lookups = index["local_hits"] + index["local_misses"]
+  return [
+    ("cache_hit_ratio", {"cache": "tasks"}, tasks["hit_ratio"]),
+    ("cache_hit_ratio", {"cache": "title_index"}, index["local_hits"] / index_lookups if index_lookups else 0.0),
+    ("cache_hit_ratio", {"cache": "decision"}, decisions["hit_ratio"]),
+    ("cache_hit_ratio", {"cache": "fastpath"}, fast["hit_ratio"]),
+    ("cache_hits", {"cache": "tasks"}, tasks["hits"]),
+    ("cache_misses", {"cache": "tasks"}, tasks["misses"]),
+    ("cache_hits", {"cache": "title_index"}, index["local_hits"]),
+    ("cache_misses", {"cache": "title_index"}, index["local_misses"]),
+    ("single_flight_coalesced_ratio", {}, flights["coalesced_ratio"]),
+    ("notion_limiter_queued", {}, limiter["queued"]),
+    ("notion_limiter_wait_sec", {}, limiter["wait_sec"]),
+    ("notion_retries", {}, limiter["retries"]),
+    ("notion_rate_limited", {}, limiter["rate_limited"]),
+  ]
+
+def _install_metrics(app: FastAPI, metrics: Metrics) -> None:
+  metrics.register_gauges(_cache_gauges)
+
+  @app.middleware("http")
+  async def timing_middleware(request: Request, call_next):
+    token = begin_request()
+    t0 = time.perf_counter()
+    try:
+      response = await call_next(request)
+    finally:
+      stages = end_request(token)
+    total_ms = (time.perf_counter() - t0) * 1000
+    route = request.scope.get("route")
+    metrics.observe(
+      "http_request_ms", total_ms,
+      method=request.method, route=getattr(route, "path", "unmatched"), status=response.status_code,
+    )
+    response.headers["Server-Timing"] = server_timing(stages, total_ms)
+    response.headers["X-Timing"] = timing_header(stages, total_ms)
+    return response
+
+  @app.get("/metrics", include_in_schema=False)
+  def metrics_endpoint() -> PlainTextResponse:
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+def _install_tracing(app: FastAPI, tracer: Tracer) -> None:
+  @app.middleware("http")
+  async def tracing_middleware(request: Request, call_next):
+    with tracer.start_span(
+      f"{request.method} {request.url.path}",
+      {"http.method": request.method, "http.target": request.url.path},
+      remote_parent=parse_traceparent(request.headers.get("traceparent")),
+    ) as span:
+      response = await call_next(request)
+      route = request.scope.get("route")
+      if route is not None:
+        span.name = f"{request.method} {route.path}"
+        span.set_attribute("http.route", route.path)
+      span.set_attribute("http.status_code", response.status_code)
+      if response.status_code >= 500:
+        span.status = "error"
+      response.headers["traceparent"] = span.traceparent
+      return response
 
 def create_app() -> FastAPI:
   settings = get_settings()
@@ -13,12 +163,44 @@ def create_app() -> FastAPI:
   app = FastAPI(
     title="Notion Tasks Chatbot(Mini)",
     version="1.0.0",
-    description="개인용 Notion Tasks 챗봇"
+    description="개인용 Notion Tasks 챗봇",
+    lifespan=lifespan
   )
 
   # 라우터 바인딩
   app.include_router(v1_router)
 
+  # 메트릭(꺼져 있으면 미들웨어/엔드포인트 자체를 등록하지 않음)
+  metrics = get_metrics()
+  if metrics is not None:
+    _install_metrics(app, metrics)
+
+  # 트레이싱(꺼져 있으면 미들웨어를 등록하지 않음). 나중에 등록한 미들웨어가 바깥쪽이라 타이밍까지 감싼다
+  tracer = get_tracer()
+  if tracer is not None:
+    _install_tracing(app, tracer)
+
+  # Notion 오류 매핑: 재시도 후에도 남은 429는 그대로 429(+Retry-After)로 전달
+  @app.exception_handler(APIResponseError)
+  async def notion_error_handler(request: Request, exc: APIResponseError) -> JSONResponse:
+    status = exc.status if exc.status in (400, 404, 409, 429) else 502
+    headers = None
+    if status == 429 and exc.headers.get("Retry-After"):
+      headers = {"Retry-After": exc.headers["Retry-After"]}
+    return JSONResponse(
+      status_code=status,
+      content={"ok": False, "error": str(exc.code), "message": str(exc)},
+      headers=headers,
+    )
+
+  # 스키마 검증 실패(없는 속성/옵션 라벨): Notion 호출 전에 거절된 요청
+  @app.exception_handler(SchemaError)
+  async def schema_error_handler(request: Request, exc: SchemaError) -> JSONResponse:
+    return JSONResponse(
+      status_code=422,
+      content={"ok": False, "error": "schema_validation", "message": str(exc)},
+    )
+
   # 루트 헬스체크
   @app.get("/")
   def root() -> dict:
@@ -0,0 +1,202 @@
+"""
+역할 :
+- Tasks DB 페이지의 프로세스 내 read-through 캐시(TTL + LRU 크기 제한)
+- 페이지는 page_id로 저장하고, 조회 결과(list/find)는 page_id 목록으로만 기억해
+  페이지 갱신이 조회 결과에도 그대로 반영되도록 한다.
+- 쓰기(create/update/complete/delete) 시 해당 페이지를 갱신/제거하고 조회 결과는 무효화한다.
+- hit/miss/eviction 카운터를 stats()로 노출한다(튜닝용).
+"""
+
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+from app.core.config import Settings, get_settings, on_settings_change
+
+
+class TaskCache:
+    """
+    page_id → Notion page 딕셔너리 캐시.
+    - ttl_sec <= 0 이면 캐시를 사용하지 않는다(항상 miss, 저장 안 함).
+    - max_size는 페이지/조회 결과 각각의 최대 항목 수(LRU로 제거).
+    """
+
+    def __init__(self, ttl_sec: float, max_size: int) -> None:
+        self.ttl_sec = ttl_sec
+        self.max_size = max_size
+        self._pages: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._queries: "OrderedDict[Hashable, Tuple[float, Dict[str, Any], List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "TaskCache":
+        return cls(ttl_sec=settings.task_cache_ttl_sec, max_size=settings.task_cache_max_size)
+
+    def apply_settings(self, settings: Settings) -> None:
+        """
+        설정 재로딩: TTL/크기만 바꾼다(저장된 항목은 유지, 크기가 줄면 오래된 것부터 제거).
+        """
+        with self._lock:
+            self.ttl_sec = settings.task_cache_ttl_sec
+            self.max_size = settings.task_cache_max_size
+            self._trim(self._pages)
+            self._trim(self._queries)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_sec > 0 and self.max_size > 0
+
+    # -------- 내부 유틸 --------
+    def _fresh(self, stored_at: float, now: float) -> bool:
+        return now - stored_at < self.ttl_sec
+
+    def _trim(self, store: OrderedDict) -> None:
+        while len(store) > self.max_size:
+            store.popitem(last=False)
+            self.evictions += 1
+
+    def _put_page_locked(self, page: Dict[str, Any], now: float) -> None:
+        page_id = page.get("id")
+        if not page_id:
+            return
+        if page.get("archived") or page.get("in_trash"):
+            self._pages.pop(page_id, None)
+            return
+        self._pages[page_id] = (now, page)
+        self._pages.move_to_end(page_id)
+        self._trim(self._pages)
+
+    # -------- 페이지 단위 --------
+    def get_page(self, page_id: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._pages.get(page_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            if not self._fresh(entry[0], now):
+                del self._pages[page_id]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._pages.move_to_end(page_id)
+            self.hits += 1
+            return entry[1]
+
+    def put_page(self, page: Dict[str, Any]) -> None:
+        """
+        페이지를 저장/갱신한다. 아카이브된 페이지는 제거한다.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._put_page_locked(page, time.monotonic())
+
+    def evict(self, page_id: str) -> None:
+        with self._lock:
+            self._pages.pop(page_id, None)
+
+    # -------- 조회 결과 단위 --------
+    def get_query(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """
+        조회 결과를 재조립해 반환한다. 결과에 포함된 페이지 중 하나라도 만료/제거됐으면 miss.
+        """
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._queries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, meta, page_ids = entry
+            pages = []
+            for page_id in page_ids:
+                page_entry = self._pages.get(page_id)
+                if page_entry is None or not self._fresh(page_entry[0], now):
+                    pages = None
+                    break
+                pages.append(page_entry[1])
+            if pages is None or not self._fresh(stored_at, now):
+                del self._queries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._queries.move_to_end(key)
+            self.hits += 1
+            return {**meta, "results": pages}
+
+    def put_query(self, key: Hashable, resp: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            results = resp.get("results", [])
+            for page in results:
+                self._put_page_locked(page, now)
+            meta = {k: v for k, v in resp.items() if k != "results"}
+            self._queries[key] = (now, meta, [p.get("id") for p in results])
+            self._queries.move_to_end(key)
+            self._trim(self._queries)
+
+    def invalidate_queries(self) -> None:
+        """
+        쓰기로 조회 결과의 구성(포함/정렬)이 바뀔 수 있으므로 조회 결과를 모두 버린다.
+        """
+        with self._lock:
+            if self._queries:
+                self._queries.clear()
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pages.clear()
+            self._queries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "ttl_sec": self.ttl_sec,
+                "max_size": self.max_size,
+                "pages": len(self._pages),
+                "queries": len(self._queries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+# -------- 프로세스 공용 인스턴스 --------
+_cache: Optional[TaskCache] = None
+_cache_lock = threading.Lock()
+
+def get_task_cache() -> TaskCache:
+    """
+    동기/비동기 서비스가 함께 쓰는 프로세스 공용 캐시를 반환한다.
+    - 한쪽 경로의 쓰기가 다른 쪽 캐시를 낡게 만들지 않도록 하나만 둔다.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TaskCache.from_settings(get_settings())
+    return _cache
+
+@on_settings_change
+def _apply_settings(old: Settings, new: Settings) -> None:
+    # 서비스들이 같은 인스턴스를 들고 있으므로 새로 만들지 않고 값만 바꾼다
+    if _cache is not None:
+        _cache.apply_settings(new)
@@ -0,0 +1,323 @@
+"""
+역할 :
+- Tasks DB 변경 피드: 바뀐 페이지를 구독자(페이지 캐시/제목 인덱스/미러/스키마 레지스트리)에 알려
+  TTL 만료를 기다리지 않고 정확히 갱신/무효화하게 한다.
+- 변경을 아는 두 경로
+  * 폴링: databases.query를 last_edited_time 오름차순으로 watermark 이후만 조회(BULK 우선순위)
+    Notion의 last_edited_time은 분 단위라 경계 페이지가 다시 오므로, watermark 분에 본 페이지는
+    (수정 시각 + 속성 지문)으로 중복 제거한다(같은 분 안의 두 번째 수정도 놓치지 않음)
+  * 웹훅: Notion 웹훅 전달을 받아 해당 페이지의 캐시만 비우고 폴러를 깨운다
+    (웹훅 본문에는 페이지 내용이 없으므로 최신 내용은 바로 이어지는 폴링으로 가져온다)
+    삭제 이벤트는 본문을 믿지 않고 pages.retrieve로 다시 조회해 아카이브/404가 확인될 때만 반영한다
+    (databases.query는 아카이브된 페이지를 돌려주지 않아 폴링으로는 알 수 없음)
+- 웹훅 서명: 엔드포인트가 X-Notion-Signature(sha256=HMAC 본문)를 NOTION_WEBHOOK_SECRET으로 검증한다.
+"""
+
+from __future__ import annotations
+import asyncio
+import hashlib
+import hmac
+import json
+import threading
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Set
+from notion_client.errors import APIErrorCode, APIResponseError
+from app.core.config import get_settings
+from app.services.cache import TaskCache, get_task_cache
+from app.services.mirror import TaskMirror, get_task_mirror
+from app.services.ratelimit import BULK, request_priority
+from app.services.schema import SchemaRegistry, get_schema_registry
+from app.services.title_index import TitleIndex, get_title_index
+
+PAGE = "page"
+SCHEMA = "schema"
+
+# 웹훅 이벤트 종류 → 처리
+_PAGE_DELETED = frozenset({"page.deleted"})
+_SCHEMA_EVENTS = frozenset({"database.schema_updated", "data_source.schema_updated"})
+
+
+class PageChange:
+    """
+    변경 이벤트 하나.
+    - kind=page: page가 있으면 최신 페이지, 없으면(웹훅) 해당 page_id를 무효화만 한다.
+    - kind=schema: DB 스키마가 바뀜(page_id/page 없음)
+    """
+    __slots__ = ("kind", "page_id", "page", "deleted", "source")
+
+    def __init__(
+        self,
+        kind: str,
+        page_id: Optional[str] = None,
+        page: Optional[Dict[str, Any]] = None,
+        deleted: bool = False,
+        source: str = "poll",
+    ) -> None:
+        self.kind = kind
+        self.page_id = page_id
+        self.page = page
+        self.deleted = deleted
+        self.source = source
+
+
+Subscriber = Callable[[List[PageChange]], None]
+
+
+def _fingerprint(page: Dict[str, Any]) -> str:
+    # 같은 분 안의 재수정을 구분하기 위한 (수정 시각, 아카이브 여부, 속성 crc32)
+    props = json.dumps(page.get("properties"), sort_keys=True, ensure_ascii=False, default=str)
+    archived = bool(page.get("archived") or page.get("in_trash"))
+    return f"{page.get('last_edited_time')}:{archived}:{zlib.crc32(props.encode()):08x}"
+
+
+def verify_signature(body: bytes, signature: Optional[str], secret: str) -> bool:
+    """
+    X-Notion-Signature("sha256=<hex>")가 본문의 HMAC-SHA256과 같은지 확인한다.
+    """
+    if not signature:
+        return False
+    expected = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+class ChangeFeed:
+    """
+    변경 이벤트를 모아 구독자에게 전달한다. 구독자 예외는 다른 구독자에 영향을 주지 않는다.
+    """
+
+    def __init__(self, database_id: Optional[str] = None) -> None:
+        self.database_id = (database_id or "").replace("-", "")
+        self.watermark: Optional[str] = None
+        self._seen: Dict[str, str] = {}  # watermark 분에 본 page_id → 지문
+        self._refetch: Set[str] = set()  # 삭제 웹훅을 받아 다시 조회할 page_id
+        self._subscribers: List[Subscriber] = []
+        self._lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self.polls = 0
+        self.published = 0
+        self.webhooks = 0
+        self.ignored_webhooks = 0
+        self.refetched = 0
+        self.subscriber_errors = 0
+
+    # -------- 구독/발행 --------
+    def subscribe(self, fn: Subscriber) -> Callable[[], None]:
+        """
+        구독자를 등록하고, 등록 해제 함수를 돌려준다.
+        """
+        with self._lock:
+            self._subscribers.append(fn)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if fn in self._subscribers:
+                    self._subscribers.remove(fn)
+        return unsubscribe
+
+    def publish(self, changes: List[PageChange]) -> int:
+        if not changes:
+            return 0
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self.published += len(changes)
+        for fn in subscribers:
+            try:
+                fn(changes)
+            except Exception as e:
+                with self._lock:
+                    self.subscriber_errors += 1
+                print(f"[change-feed] 구독자 오류: {e}")
+        return len(changes)
+
+    # -------- 폴링 --------
+    def _new_changes(self, pages: List[Dict[str, Any]]) -> List[PageChange]:
+        changes: List[PageChange] = []
+        with self._lock:
+            for page in pages:
+                page_id, edited = page.get("id"), page.get("last_edited_time") or ""
+                fingerprint = _fingerprint(page)
+                if not page_id or self._seen.get(page_id) == fingerprint:
+                    continue
+                changes.append(PageChange(PAGE, page_id, page, bool(page.get("archived") or page.get("in_trash"))))
+                if self.watermark is None or edited > self.watermark:
+                    self.watermark = edited
+                    self._seen = {}
+                if edited == self.watermark:
+                    self._seen[page_id] = fingerprint
+        return changes
+
+    async def poll_once(self, svc: Any) -> int:
+        """
+        watermark 이후 변경분을 한 번 조회해 발행한다. 발행한 이벤트 수를 반환.
+        - 첫 호출은 가장 최근 수정 시각만 watermark로 잡는다(기존 페이지 전체를 발행하지 않음).
+        """
+        with request_priority(BULK):
+            if self.watermark is None:
+                async for page in svc.iter_tasks(
+                    sorts=[{"timestamp": "last_edited_time", "direction": "descending"}], page_size=1
+                ):
+                    self._new_changes([page])
+                    break
+                with self._lock:
+                    self.polls += 1
+                return 0
+            flt = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": self.watermark}}
+            sorts = [{"timestamp": "last_edited_time", "direction": "ascending"}]
+            pages = [p async for p in svc.iter_tasks(filter=flt, sorts=sorts)]
+        with self._lock:
+            self.polls += 1
+        return self.publish(self._new_changes(pages))
+
+    def poke(self) -> None:
+        """
+        폴러를 즉시 깨운다(웹훅 수신 시).
+        """
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def run(self, svc: Any, interval_sec: float) -> None:
+        """
+        FastAPI 백그라운드 태스크: interval_sec마다(또는 웹훅으로 깨워지면 바로) 폴링.
+        """
+        self._wakeup = asyncio.Event()
+        while True:
+            try:
+                await self.poll_once(svc)
+            except Exception as e:
+                print(f"[change-feed] poll 실패: {e}")
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=interval_sec)
+            except asyncio.TimeoutError:
+                pass
+
+    # -------- 웹훅 --------
+    def handle_webhook(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        서명이 확인된 Notion 웹훅 이벤트 하나를 처리한다. 다른 DB/부모를 알 수 없는 이벤트는 무시한다.
+        - 페이지 이벤트는 캐시에서 해당 페이지만 비우고 폴러를 깨운다(내용은 폴링으로 가져옴).
+        - page.deleted는 바로 반영하지 않고 다시 조회 대상으로 둔다(refetch_pending).
+        """
+        kind = event.get("type") or ""
+        entity = event.get("entity") or {}
+        parent = ((event.get("data") or {}).get("parent") or {}).get("id")
+        with self._lock:
+            self.webhooks += 1
+        if kind in _SCHEMA_EVENTS:
+            # 스키마 이벤트의 entity는 DB 자신
+            if self.database_id and (entity.get("id") or "").replace("-", "") != self.database_id:
+                return self._ignored(kind)
+            self.publish([PageChange(SCHEMA, source="webhook")])
+            return {"handled": True, "type": kind}
+        page_id = entity.get("id")
+        if entity.get("type") != "page" or not kind.startswith("page.") or not page_id or not parent:
+            return self._ignored(kind)
+        if self.database_id and parent.replace("-", "") != self.database_id:
+            return self._ignored(kind)
+        self.publish([PageChange(PAGE, page_id, source="webhook")])
+        if kind in _PAGE_DELETED:
+            with self._lock:
+                self._refetch.add(page_id)
+        self.poke()
+        return {"handled": True, "type": kind, "page_id": page_id, "refetch": kind in _PAGE_DELETED}
+
+    async def refetch_pending(self, svc: Any) -> int:
+        """
+        삭제 웹훅을 받은 페이지를 pages.retrieve로 다시 조회해 실제 상태를 발행한다. 발행한 이벤트 수를 반환.
+        - 아카이브/휴지통이면 삭제로, 404(object_not_found)면 접근할 수 없는 페이지로 보고 삭제로 반영한다.
+        - 여전히 살아 있으면 최신 페이지로 갱신한다(잘못되었거나 늦게 온 이벤트).
+        """
+        with self._lock:
+            page_ids, self._refetch = sorted(self._refetch), set()
+        changes: List[PageChange] = []
+        with request_priority(BULK):
+            for page_id in page_ids:
+                try:
+                    page = await svc.get_task(page_id)
+                except APIResponseError as e:
+                    if e.code != APIErrorCode.ObjectNotFound:
+                        print(f"[change-feed] {page_id} 재조회 실패: {e}")
+                        continue
+                    changes.append(PageChange(PAGE, page_id, deleted=True, source="webhook"))
+                    continue
+                archived = bool(page.get("archived") or page.get("in_trash"))
+                changes.append(PageChange(PAGE, page_id, page, archived, source="webhook"))
+        with self._lock:
+            self.refetched += len(page_ids)
+        return self.publish(changes)
+
+    def _ignored(self, kind: str) -> Dict[str, Any]:
+        with self._lock:
+            self.ignored_webhooks += 1
+        return {"handled": False, "type": kind}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "watermark": self.watermark,
+                "subscribers": len(self._subscribers),
+                "polls": self.polls,
+                "published": self.published,
+                "webhooks": self.webhooks,
+                "ignored_webhooks": self.ignored_webhooks,
+                "refetched": self.refetched,
+                "pending_refetch": len(self._refetch),
+                "subscriber_errors": self.subscriber_errors,
+            }
+
+
+# -------- 기본 구독자 --------
+def cache_subscriber(cache: TaskCache) -> Subscriber:
+    def apply(changes: List[PageChange]) -> None:
+        pages = [c for c in changes if c.kind == PAGE]
+        for c in pages:
+            if c.page is not None:
+                cache.put_page(c.page)  # 아카이브면 put_page가 제거한다
+            elif c.page_id:
+                cache.evict(c.page_id)
+        if pages:
+            cache.invalidate_queries()
+    return apply
+
+def index_subscriber(index: TitleIndex) -> Subscriber:
+    def apply(changes: List[PageChange]) -> None:
+        index.apply([c.page for c in changes if c.kind == PAGE and c.page is not None])
+        for c in changes:
+            if c.kind == PAGE and c.page is None and c.deleted and c.page_id:
+                index.remove(c.page_id)
+    return apply
+
+def mirror_subscriber(mirror: TaskMirror) -> Subscriber:
+    def apply(changes: List[PageChange]) -> None:
+        mirror.upsert_pages([c.page for c in changes if c.kind == PAGE and c.page is not None])
+        mirror.tombstone(c.page_id for c in changes if c.kind == PAGE and c.page is None and c.deleted and c.page_id)
+    return apply
+
+def schema_subscriber(schema: SchemaRegistry) -> Subscriber:
+    def apply(changes: List[PageChange]) -> None:
+        if any(c.kind == SCHEMA for c in changes):
+            schema.invalidate()
+    return apply
+
+
+# -------- 프로세스 공용 인스턴스 --------
+_feed: Optional[ChangeFeed] = None
+_feed_lock = threading.Lock()
+
+def get_change_feed() -> ChangeFeed:
+    """
+    공용 캐시/제목 인덱스/미러/스키마 레지스트리를 구독자로 등록한 공용 변경 피드.
+    """
+    global _feed
+    if _feed is None:
+        with _feed_lock:
+            if _feed is None:
+                feed = ChangeFeed(get_settings().notion_tasks_db_id)
+                feed.subscribe(cache_subscriber(get_task_cache()))
+                feed.subscribe(index_subscriber(get_title_index()))
+                feed.subscribe(schema_subscriber(get_schema_registry()))
+                mirror = get_task_mirror()
+                if mirror is not None:
+                    feed.subscribe(mirror_subscriber(mirror))
+                _feed = feed
+    return _feed
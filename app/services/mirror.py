@@ -0,0 +1,325 @@
+"""
+역할 :
+- Tasks DB의 로컬 SQLite 미러와 증분(delta) 동기화 엔진
+- last_edited_time이 저장된 watermark 이후인 페이지만 가져와 upsert 한다.
+- 아카이브된 페이지는 행을 지우지 않고 archived=1 톰스톤으로 남긴다.
+  (Notion query는 아카이브 페이지를 돌려주지 않으므로, --full 동기화 시 안 보인 페이지도 톰스톤 처리)
+- 백그라운드 루프는 MIRROR_FULL_SYNC_SEC마다 전체 동기화로 UI에서 아카이브된 페이지를 톰스톤 처리한다.
+- 동기화가 한 번이라도 끝났으면 list_tasks를 로컬에서 Notion 응답 형태로 제공한다.
+  커서는 'm:<오프셋>'이라 Notion 커서와 구별된다(is_mirror_cursor).
+
+실행(CLI):
+    python -m app.services.mirror            # 증분 동기화
+    python -m app.services.mirror --full     # 전체 재동기화(삭제 감지 포함)
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import calendar
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+from app.core.config import get_settings
+from app.services.query import TaskQuery
+from app.services.ratelimit import BULK, request_priority
+from app.services.records import TaskRecord
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    page_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    status TEXT,
+    category TEXT,
+    date TEXT,
+    last_edited_time TEXT NOT NULL,
+    archived INTEGER NOT NULL DEFAULT 0,
+    page_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_edited ON tasks(last_edited_time);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+MIRROR_CURSOR_PREFIX = "m:"
+
+def is_mirror_cursor(cursor: Optional[str]) -> bool:
+    return bool(cursor) and cursor.startswith(MIRROR_CURSOR_PREFIX)
+
+def _cursor_offset(cursor: Optional[str]) -> int:
+    if not cursor:
+        return 0
+    offset = cursor[len(MIRROR_CURSOR_PREFIX):] if is_mirror_cursor(cursor) else ""
+    if not offset.isdigit():
+        raise ValueError(f"미러 커서가 아닙니다: {cursor!r}")
+    return int(offset)
+
+def _utc_now() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+def _row(page: Dict[str, Any]) -> tuple:
+    rec = TaskRecord.from_page(page)
+    return (
+        rec.page_id,
+        rec.title,
+        rec.status,
+        rec.category,
+        rec.date,
+        rec.last_edited_time or "",
+        1 if rec.archived else 0,
+        json.dumps(page, ensure_ascii=False),
+    )
+
+
+class TaskMirror:
+    """
+    Tasks DB의 SQLite 미러.
+    - 하나의 연결을 락으로 보호해 스레드(백그라운드 동기화/요청 처리) 간에 공유한다.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # -------- 메타 --------
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self._conn.execute(
+            "INSERT INTO meta(key, value) VALUES(?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    @property
+    def watermark(self) -> Optional[str]:
+        with self._lock:
+            return self._get_meta("watermark")
+
+    @property
+    def synced(self) -> bool:
+        with self._lock:
+            return self._get_meta("last_sync_at") is not None
+
+    def full_sync_due(self, interval_sec: float) -> bool:
+        """
+        마지막 전체 동기화 후 interval_sec이 지났는지(한 번도 안 했으면 True, interval_sec <= 0이면 False).
+        """
+        if interval_sec <= 0:
+            return False
+        with self._lock:
+            last = self._get_meta("last_full_sync_at")
+        if last is None:
+            return True
+        return time.time() - calendar.timegm(time.strptime(last, "%Y-%m-%dT%H:%M:%SZ")) >= interval_sec
+
+    # -------- 쓰기 --------
+    def upsert_pages(self, pages: Iterable[Dict[str, Any]], advance_watermark: bool = False) -> int:
+        """
+        페이지를 upsert 한다. 반영한 페이지 수를 반환.
+        - advance_watermark: sync()만 True. 쓰기 응답/구독자 upsert가 watermark를 올리면
+          그 사이 다른 곳에서 수정된 페이지를 증분 동기화가 건너뛴다.
+        """
+        rows = [_row(p) for p in pages if p.get("id")]
+        if not rows:
+            return 0
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO tasks(page_id, title, status, category, date, last_edited_time, archived, page_json)
+                VALUES(?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(page_id) DO UPDATE SET
+                    title = excluded.title,
+                    status = excluded.status,
+                    category = excluded.category,
+                    date = excluded.date,
+                    last_edited_time = excluded.last_edited_time,
+                    archived = excluded.archived,
+                    page_json = excluded.page_json
+                """,
+                rows,
+            )
+            if advance_watermark:
+                newest = max(r[5] for r in rows)
+                current = self._get_meta("watermark")
+                if newest and (current is None or newest > current):
+                    self._set_meta("watermark", newest)
+        return len(rows)
+
+    def tombstone(self, page_ids: Iterable[str]) -> int:
+        ids = [(pid,) for pid in page_ids]
+        if not ids:
+            return 0
+        with self._lock, self._conn:
+            self._conn.executemany("UPDATE tasks SET archived = 1 WHERE page_id = ?", ids)
+        return len(ids)
+
+    # -------- 동기화 --------
+    def sync(self, svc: Any, full: bool = False) -> Dict[str, Any]:
+        """
+        NotionTaskService.iter_tasks로 변경분을 가져와 반영한다.
+        - full=False: watermark 이후 수정분만(없으면 전체)
+        - full=True: 전체를 받아 반영하고, 이번에 안 보인 활성 페이지는 톰스톤 처리
+        """
+        started = time.perf_counter()
+        watermark = None if full else self.watermark
+        flt = None
+        if watermark:
+            flt = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": watermark}}
+        sorts = [{"timestamp": "last_edited_time", "direction": "ascending"}]
+
+        seen: set[str] = set()
+        batch: List[Dict[str, Any]] = []
+        upserted = 0
+        # 동기화는 배경 작업이므로 대화형 호출에 토큰 우선권을 양보한다
+        with request_priority(BULK):
+            for page in svc.iter_tasks(filter=flt, sorts=sorts):
+                seen.add(page.get("id"))
+                batch.append(page)
+                if len(batch) >= 100:
+                    upserted += self.upsert_pages(batch, advance_watermark=True)
+                    batch = []
+        upserted += self.upsert_pages(batch, advance_watermark=True)
+
+        tombstoned = 0
+        if full:
+            with self._lock:
+                active = [r[0] for r in self._conn.execute("SELECT page_id FROM tasks WHERE archived = 0")]
+            tombstoned = self.tombstone(pid for pid in active if pid not in seen)
+
+        with self._lock, self._conn:
+            now = _utc_now()
+            self._set_meta("last_sync_at", now)
+            if full:
+                self._set_meta("last_full_sync_at", now)
+        return {
+            "full": full,
+            "upserted": upserted,
+            "tombstoned": tombstoned,
+            "watermark": self.watermark,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+
+    # -------- 조회 --------
+    def list_tasks(
+        self,
+        page_size: int = 10,
+        start_cursor: Optional[str] = None,
+        query: Optional[TaskQuery] = None,
+    ) -> Dict[str, Any]:
+        """
+        활성 페이지를 Notion query 응답과 같은 형태로 반환한다(기본: 최근 수정순).
+        - query가 있으면 조건/정렬을 SQL로 적용한다.
+        - start_cursor는 이전 응답의 next_cursor('m:<오프셋>'). 다른 형식이면 ValueError.
+        """
+        offset = _cursor_offset(start_cursor)
+        where, params, order = (query or TaskQuery()).sql()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT page_json FROM tasks WHERE {where} ORDER BY {order} LIMIT ? OFFSET ?",
+                (*params, page_size + 1, offset),
+            ).fetchall()
+        more = len(rows) > page_size
+        return {
+            "object": "list",
+            "results": [json.loads(r[0]) for r in rows[:page_size]],
+            "has_more": more,
+            "next_cursor": f"{MIRROR_CURSOR_PREFIX}{offset + page_size}" if more else None,
+            "source": "mirror",
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            active, archived = self._conn.execute(
+                "SELECT COALESCE(SUM(archived = 0), 0), COALESCE(SUM(archived = 1), 0) FROM tasks"
+            ).fetchone()
+            return {
+                "path": self.path,
+                "active": active,
+                "tombstones": archived,
+                "watermark": self._get_meta("watermark"),
+                "last_sync_at": self._get_meta("last_sync_at"),
+                "last_full_sync_at": self._get_meta("last_full_sync_at"),
+            }
+
+
+# -------- 프로세스 공용 인스턴스 --------
+_mirror: Optional[TaskMirror] = None
+_mirror_lock = threading.Lock()
+
+def get_task_mirror() -> Optional[TaskMirror]:
+    """
+    설정(MIRROR_DB_PATH)이 있으면 공용 미러를 반환한다. 비어 있으면 None(미러 비활성).
+    """
+    global _mirror
+    settings = get_settings()
+    if not settings.mirror_db_path:
+        return None
+    if _mirror is None:
+        with _mirror_lock:
+            if _mirror is None:
+                _mirror = TaskMirror(settings.mirror_db_path)
+    return _mirror
+
+def close_task_mirror() -> None:
+    """
+    공용 미러의 SQLite 연결을 닫고 참조를 해제한다(앱 종료 시, 동기화 루프를 멈춘 뒤).
+    """
+    global _mirror
+    with _mirror_lock:
+        if _mirror is not None:
+            _mirror.close()
+            _mirror = None
+
+
+async def run_sync_loop(mirror: TaskMirror, interval_sec: float) -> None:
+    """
+    FastAPI 백그라운드 태스크: interval_sec마다 증분 동기화(블로킹 I/O는 스레드에서).
+    - MIRROR_FULL_SYNC_SEC마다(처음 한 번 포함) 전체 동기화로 아카이브된 페이지를 톰스톤 처리한다.
+      주기는 매번 현재 설정에서 읽으므로 설정 다시 읽기로 바로 바뀐다.
+    """
+    from app.services.notion_service import get_notion_service
+
+    while True:
+        try:
+            full = mirror.full_sync_due(get_settings().mirror_full_sync_sec)
+            await asyncio.to_thread(mirror.sync, get_notion_service(), full)
+        except Exception as e:
+            # 일시적 오류는 다음 주기에 재시도
+            print(f"[mirror] sync 실패: {e}")
+        await asyncio.sleep(interval_sec)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Notion Tasks DB → 로컬 SQLite 미러 동기화")
+    parser.add_argument("--full", action="store_true", help="전체 재동기화(삭제 감지 포함)")
+    parser.add_argument("--path", help="미러 DB 경로(기본: MIRROR_DB_PATH)")
+    args = parser.parse_args()
+
+    from app.services.notion_service import get_notion_service
+
+    path = args.path or get_settings().mirror_db_path
+    if not path:
+        parser.error("--path 또는 MIRROR_DB_PATH가 필요합니다.")
+    mirror = TaskMirror(path)
+    try:
+        print(json.dumps(mirror.sync(get_notion_service(), full=args.full), ensure_ascii=False))
+    finally:
+        mirror.close()
+
+
+if __name__ == "__main__":
+    main()
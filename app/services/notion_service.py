@@ -1,46 +1,450 @@
 """
 역할 :
 - Notion SDK를 통해 Tasks DB에 대한 CRUD/조회(최소기능)를 수행
+- 프로세스 공용 서비스(get_notion_service)를 통해 HTTP 커넥션 풀(keep-alive)을 재사용
+- 비동기 변형(AsyncNotionTaskService)은 notion_client.AsyncClient 위에서 같은 동작을 제공
+  (작업 로직은 _TaskServiceBase의 흐름으로 한 번만 작성하고, 두 클래스는 전송/드라이버만 다르다)
+- 조회(list/find)는 TaskCache를 거치는 read-through이며, 쓰기는 캐시를 갱신/무효화한다
+- resolve_task_id는 로컬 제목 인덱스(TitleIndex)로 먼저 해석해 Notion 왕복을 생략한다
+- 모든 Notion 호출은 _request()를 거쳐 공용 레이트 리미터/재시도(NotionLimiter)를 통과한다
+- 동시에 진행 중인 같은 읽기 요청(query/retrieve)은 SingleFlight로 합쳐 한 번만 보낸다
+- 쓰기 패치는 캐시된 DB 스키마(SchemaRegistry)로 먼저 검증/매핑한다(잘못된 라벨은 로컬에서 거절)
+- observe_requests()로 등록한 콜백은 현재 컨텍스트의 Notion 요청/응답을 이벤트로 받는다(스트리밍 진행 표시용)
+- METRICS_ENABLED면 _request()마다 메서드별 지연을 notion_request_ms 히스토그램/요청 단계(notion)에 기록한다
+- 트레이싱이 켜져 있으면 공개 메서드와 _request()가 span이 된다(notion.<메서드> → notion.http)
 """
 
 from __future__ import annotations
-from typing import Any, Dict, List, Optional
-from notion_client import Client
-from app.core.config import get_settings
+import asyncio
+import functools
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, Generator, Iterator, List, NamedTuple, Optional
+import httpx
+from notion_client import AsyncClient, Client
+from notion_client.errors import APIErrorCode, APIResponseError
+from app.core.config import Settings, get_settings
+from app.core.metrics import get_metrics, observe_stage
+from app.core.tracing import AnySpan, current_span, span, traced
+from app.services.cache import TaskCache, get_task_cache
+from app.services.mirror import get_task_mirror
+from app.services.ratelimit import BULK, NotionLimiter, get_notion_limiter, request_priority
+from app.services.schema import (
+    PROP_CATEGORY,
+    PROP_DATE,
+    PROP_NOTES,
+    PROP_STATUS,
+    PROP_TITLE,
+    STATUS_DONE,
+    DatabaseSchema,
+    SchemaRegistry,
+    get_schema_registry,
+)
+from app.services.singleflight import SingleFlight, flight_key, get_single_flight
+from app.services.title_index import TitleIndex, get_title_index, page_title
 
-class NotionTaskService:
+
+def build_http_limits(settings: Settings) -> httpx.Limits:
     """
-    Notion Tasks 데이터베이스(원천)에 직접 CRUD를 수행하는 얇은 래퍼.
+    설정값으로 httpx 커넥션 풀 한도(keep-alive 포함)를 구성한다.
     """
+    return httpx.Limits(
+        max_connections=settings.notion_pool_max_connections,
+        max_keepalive_connections=settings.notion_pool_max_keepalive,
+        keepalive_expiry=settings.notion_keepalive_expiry_sec,
+    )
 
-    def __init__(self) -> None:
-        settings = get_settings()
-        print("="*80)
-        print(settings)
-        if not settings.notion_token or not settings.notion_tasks_db_id:
-            raise RuntimeError(
-                "NOTION_TOKEN 또는 NOTION_TASKS_DB_ID가 설정되지 않았습니다. .env를 확인하세요."
-            )
+def _check_settings(settings: Settings) -> None:
+    if not settings.notion_token or not settings.notion_tasks_db_id:
+        raise RuntimeError(
+            "NOTION_TOKEN 또는 NOTION_TASKS_DB_ID가 설정되지 않았습니다. .env를 확인하세요."
+        )
+
+def _create_properties(
+    title: str,
+    due: Optional[str] = None,
+    priority: Optional[str] = None,
+    notes: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    create_task의 Notion properties 본문을 구성한다(동기/비동기 공용).
+    """
+    properties: Dict[str, Any] = {
+        # 제목은 '할 일' (title)
+        PROP_TITLE: {"title": [{"text": {"content": title}}]}
+    }
+
+    # '날짜' (date)
+    if due:
+        properties[PROP_DATE] = {"date": {"start": due}}
+
+    # '카테고리' (select)
+    # priority를 카테고리로 매핑 (스키마 검증 시 실제 옵션 라벨로 맞춰짐)
+    if priority:
+        properties[PROP_CATEGORY] = {"select": {"name": priority}}
+
+    # '메모' (rich_text)
+    if notes:
+        properties[PROP_NOTES] = {"rich_text": [{"text": {"content": notes}}]}
+
+    # 현재 DB에는 'Assignee', 'Tags' 속성이 없으므로 무시합니다.
+    return properties
+
+def _resolve_cache(settings: Optional[Settings], cache: Optional[TaskCache]) -> TaskCache:
+    """
+    명시한 cache > 명시한 settings 전용 캐시 > 프로세스 공용 캐시 순으로 고른다.
+    """
+    if cache is not None:
+        return cache
+    if settings is not None:
+        return TaskCache.from_settings(settings)
+    return get_task_cache()
+
+def _resolve_index(settings: Optional[Settings], index: Optional[TitleIndex]) -> TitleIndex:
+    if index is not None:
+        return index
+    if settings is not None:
+        return TitleIndex.from_settings(settings)
+    return get_title_index()
+
+def _query_body(
+    db_id: str,
+    filter: Optional[Dict[str, Any]],
+    sorts: Optional[List[Dict[str, Any]]],
+    page_size: int,
+) -> Dict[str, Any]:
+    body: Dict[str, Any] = {"database_id": db_id, "page_size": max(1, min(100, page_size))}
+    if filter:
+        body["filter"] = filter
+    if sorts:
+        body["sorts"] = sorts
+    return body
+
+def _list_key(
+    page_size: int,
+    start_cursor: Optional[str],
+    filter: Optional[Dict[str, Any]],
+    sorts: Optional[List[Dict[str, Any]]],
+) -> tuple:
+    if not filter and not sorts:
+        return ("list", page_size, start_cursor)
+    return ("list", page_size, start_cursor, flight_key("query", {"filter": filter, "sorts": sorts}))
+
+def _resolve_limiter(settings: Optional[Settings], limiter: Optional[NotionLimiter]) -> NotionLimiter:
+    if limiter is not None:
+        return limiter
+    if settings is not None:
+        return NotionLimiter.from_settings(settings)
+    return get_notion_limiter()
+
+def _resolve_flights(settings: Optional[Settings], flights: Optional[SingleFlight]) -> SingleFlight:
+    if flights is not None:
+        return flights
+    if settings is not None:
+        return SingleFlight.from_settings(settings)
+    return get_single_flight()
+
+# 결과를 공유해도 안전한 읽기 전용 호출
+_COALESCED_METHODS = frozenset({"databases.query", "databases.retrieve"})
+
+def _resolve_schema(settings: Optional[Settings], schema: Optional[SchemaRegistry]) -> SchemaRegistry:
+    if schema is not None:
+        return schema
+    if settings is not None:
+        return SchemaRegistry.from_settings(settings)
+    return get_schema_registry()
+
+# Notion 요청 관찰자: (이벤트 이름, 데이터)를 받는 콜백. 컨텍스트(요청/태스크)별로 지정된다.
+_observer: ContextVar[Optional[Callable[[str, Dict[str, Any]], None]]] = ContextVar("notion_observer", default=None)
+
+@contextmanager
+def observe_requests(callback: Callable[[str, Dict[str, Any]], None]) -> Iterator[None]:
+    """
+    이 블록(및 여기서 만든 태스크/툴 실행) 안의 Notion 호출마다
+    callback("notion_request", {...}) / callback("notion_response", {...})를 부른다.
+    """
+    token = _observer.set(callback)
+    try:
+        yield
+    finally:
+        _observer.reset(token)
+
+def _observed_start(method: str) -> Optional[float]:
+    observer = _observer.get()
+    if observer is not None:
+        observer("notion_request", {"method": method})
+    elif get_metrics() is None:
+        return None
+    return time.perf_counter()
+
+def _observed_end(method: str, started: Optional[float], error: Optional[Exception] = None) -> None:
+    if started is None:
+        return
+    ms = (time.perf_counter() - started) * 1000
+    observe_stage("notion", ms, "notion_request_ms", method=method, ok=error is None)
+    observer = _observer.get()
+    if observer is None:
+        return
+    data: Dict[str, Any] = {"method": method, "ok": error is None, "ms": round(ms, 2)}
+    if error is not None:
+        data["error"] = f"{type(error).__name__}: {error}"
+    observer("notion_response", data)
+
+def _result_attributes(s: AnySpan, result: Any) -> None:
+    # span 결과 속성: 목록이면 페이지 수, 페이지면 page_id
+    if isinstance(result, dict):
+        if isinstance(result.get("results"), list):
+            s.set_attribute("notion.page_count", len(result["results"]))
+            s.set_attribute("notion.has_more", bool(result.get("has_more")))
+        elif result.get("object") == "page":
+            s.set_attribute("notion.page_id", result.get("id"))
+
+def _traced(name: str) -> Callable:
+    return traced(name, on_result=_result_attributes)
+
+def _page_gone(error: APIResponseError) -> bool:
+    # 쓰기 대상 페이지가 없거나(404, 접근 불가 포함) 아카이브돼 수정할 수 없다는 응답
+    if error.code == APIErrorCode.ObjectNotFound:
+        return True
+    return error.code == APIErrorCode.ValidationError and "archived" in str(error).lower()
+
+def _title_filter(title: str, op: str) -> Dict[str, Any]:
+    return {"property": PROP_TITLE, "title": {op: title}}
+
+def _pick_task_id(results: List[Dict[str, Any]], ref: str) -> str | None:
+    """
+    제목 검색 결과에서 정확 일치 제목을 우선, 없으면 첫 번째 결과의 id를 고른다.
+    """
+    if not results:
+        return None
+    exact = [p for p in results if page_title(p) == ref]
+    if exact:
+        return exact[0].get("id")
+    return results[0].get("id")
+
+def operation_call(svc: Any, op: Dict[str, Any]) -> Callable[[], Any]:
+    """
+    일괄 작업 하나를 서비스 메서드 호출(인자 없는 callable)로 바꾼다(동기/비동기 공용).
+    - batch()와 지연 쓰기 큐(app.services.write_queue)가 같은 작업 형식을 쓴다.
+    - 입력 오류는 ValueError로 알리고 해당 항목만 실패 처리된다.
+    """
+    kind = op.get("op")
+    if kind == "create":
+        if not op.get("title"):
+            raise ValueError("create에는 title이 필요합니다.")
+        return lambda: svc.create_task(
+            title=op["title"], due=op.get("due"), priority=op.get("priority"), notes=op.get("notes")
+        )
+    task_id = op.get("task_id")
+    if not task_id:
+        raise ValueError(f"{kind}에는 task_id가 필요합니다.")
+    if kind == "update":
+        if not op.get("patch"):
+            raise ValueError("update에는 patch가 필요합니다.")
+        return lambda: svc.update_task(task_id=task_id, patch=op["patch"])
+    if kind == "complete":
+        return lambda: svc.complete_task(task_id=task_id)
+    if kind == "archive":
+        return lambda: svc.delete_task(task_id=task_id)
+    raise ValueError(f"지원하지 않는 작업: {kind}")
+
+def _batch_groups(operations: List[Dict[str, Any]]) -> List[List[int]]:
+    """
+    일괄 작업 인덱스를 실행 그룹으로 묶는다. 그룹 안은 입력 순서대로 순차, 그룹끼리는 동시 실행.
+    - 같은 task_id를 다루는 작업은 한 그룹(update → complete가 뒤바뀌지 않도록)
+    - task_id가 없는 작업(create)은 각자 단독 그룹
+    """
+    by_task: Dict[str, List[int]] = {}
+    groups: List[List[int]] = []
+    for i, op in enumerate(operations):
+        task_id = op.get("task_id")
+        if not task_id:
+            groups.append([i])
+            continue
+        if task_id not in by_task:
+            by_task[task_id] = []
+            groups.append(by_task[task_id])
+        by_task[task_id].append(i)
+    return groups
+
+def _batch_item(index: int, op: Dict[str, Any], data: Any = None, error: Optional[Exception] = None) -> Dict[str, Any]:
+    item: Dict[str, Any] = {"index": index, "op": op.get("op"), "ok": error is None}
+    if error is None:
+        item["data"] = data
+    else:
+        item["error"] = f"{type(error).__name__}: {error}"
+    return item
+
+def _batch_summary(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    failed = sum(1 for r in results if not r["ok"])
+    return {"total": len(results), "succeeded": len(results) - failed, "failed": failed, "results": results}
+
+_UUID_LIKE = re.compile(r"^[0-9a-fA-F]{32}$|^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
+
+# -------- 동기/비동기 공용 흐름 --------
+# 각 작업은 한 번만 "흐름"(generator)으로 작성한다. 흐름은 I/O가 필요할 때 _Step을 yield하고,
+# 드라이버가 그 단계를 서비스 메서드로 실행해 결과를 돌려 보낸다(동기 서비스는 호출, 비동기는 await).
+# 예외도 흐름 안으로 다시 던지므로 흐름의 try/except가 두 변형에서 똑같이 동작한다.
+
+class _Step(NamedTuple):
+    method: str                 # 실행할 서비스 메서드 이름(예: "_request", "schema")
+    args: tuple
+    kwargs: Dict[str, Any]
+
+def _notion(method: str, **body: Any) -> _Step:
+    # Notion 호출 한 번(_request)
+    return _Step("_request", (method,), body)
+
+def _call(method: str, *args: Any, **kwargs: Any) -> _Step:
+    # 다른 서비스 메서드 호출(자체 span/락/캐시를 가진 공개 메서드 포함)
+    return _Step(method, args, kwargs)
+
+_Flow = Generator[_Step, Any, Any]
+
+def _public(method: Callable, flow: Callable, span_name: Optional[str]) -> Callable:
+    method.__name__ = flow.__name__.lstrip("_")
+    method.__qualname__ = method.__name__
+    return _traced(span_name)(method) if span_name else method
+
+def _blocking(flow: Callable[..., _Flow], span_name: Optional[str] = None) -> Callable:
+    """
+    공용 흐름을 동기 메서드로 만든다(시그니처/독스트링은 흐름의 것).
+    """
+    @functools.wraps(flow)
+    def method(self: "NotionTaskService", *args: Any, **kwargs: Any) -> Any:
+        return self._drive(flow(self, *args, **kwargs))
+    return _public(method, flow, span_name)
+
+def _awaitable(flow: Callable[..., _Flow], span_name: Optional[str] = None) -> Callable:
+    """
+    공용 흐름을 async 메서드로 만든다(시그니처/독스트링은 흐름의 것).
+    """
+    @functools.wraps(flow)
+    async def method(self: "AsyncNotionTaskService", *args: Any, **kwargs: Any) -> Any:
+        return await self._adrive(flow(self, *args, **kwargs))
+    return _public(method, flow, span_name)
+
+
+class _TaskServiceBase:
+    """
+    NotionTaskService/AsyncNotionTaskService 공용 부분: 구성, 캐시/인덱스/미러 반영, 작업 흐름.
+    - 하위 클래스는 전송(HTTP 클라이언트, _request, 스키마 조회, 락, 동시 실행)과 드라이버만 구현한다.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        cache: Optional[TaskCache] = None,
+        index: Optional[TitleIndex] = None,
+        limiter: Optional[NotionLimiter] = None,
+        flights: Optional[SingleFlight] = None,
+        schema: Optional[SchemaRegistry] = None,
+    ) -> None:
+        self._cache = _resolve_cache(settings, cache)
+        self._index = _resolve_index(settings, index)
+        self._limiter = _resolve_limiter(settings, limiter)
+        self._flights = _resolve_flights(settings, flights)
+        self._schema = _resolve_schema(settings, schema)
+        self._mirror = get_task_mirror() if settings is None else None
+        settings = settings or get_settings()
+        _check_settings(settings)
         self._db_id = settings.notion_tasks_db_id
-        self._client = Client(auth=settings.notion_token)
+        self._batch_concurrency = settings.batch_concurrency
+        self._connect(settings)
+
+    def _connect(self, settings: Settings) -> None:
+        raise NotImplementedError
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        캐시 hit/miss/eviction 카운터와 제목 인덱스 통계를 반환합니다.
+        """
+        return {
+            "tasks": self._cache.stats(),
+            "title_index": self._index.stats(),
+            "rate_limiter": self._limiter.stats(),
+            "single_flight": self._flights.stats(),
+            "schema": self._schema.stats(),
+        }
+
+    def _remember_write(self, page: Dict[str, Any]) -> Dict[str, Any]:
+        # 쓰기 응답(전체 페이지)으로 캐시/제목 인덱스/미러를 갱신하고, 조회 결과는 무효화
+        self._cache.put_page(page)
+        self._cache.invalidate_queries()
+        self._index.apply([page])
+        if self._mirror is not None:
+            self._mirror.upsert_pages([page])
+        return page
+
+    def _forget_page(self, page_id: str) -> None:
+        # 원천에서 사라진(아카이브/삭제) 페이지를 캐시/제목 인덱스/미러에서 지운다
+        self._cache.evict(page_id)
+        self._cache.invalidate_queries()
+        self._index.remove(page_id)
+        if self._mirror is not None:
+            self._mirror.tombstone([page_id])
+
+    def _update_page(self, task_id: str, **body: Any) -> _Flow:
+        # 기존 페이지 수정 공통 경로: 404/아카이브 오류면 로컬 상태에서 지운 뒤 오류를 그대로 올린다
+        try:
+            resp = yield _notion("pages.update", page_id=task_id, **body)
+        except APIResponseError as e:
+            if _page_gone(e):
+                self._forget_page(task_id)
+            raise
+        return self._remember_write(resp)
 
     # -------- 조회 --------
-    def list_tasks(self, page_size: int = 10) -> Dict[str, Any]:
+    def _list_tasks(
+        self,
+        page_size: int = 10,
+        start_cursor: Optional[str] = None,
+        filter: Optional[Dict[str, Any]] = None,
+        sorts: Optional[List[Dict[str, Any]]] = None,
+    ) -> _Flow:
         """
-        Tasks 데이터베이스의 최신 항목 일부를 반환합니다.
-        - 페이지네이션은 간단히 page_size만 사용(최소 구성).
+        Tasks 데이터베이스의 항목 한 페이지를 반환합니다.
+        - 응답의 next_cursor를 start_cursor로 넘기면 다음 페이지를 조회합니다.
+        - filter/sorts는 Notion databases.query 본문 그대로(app.services.query.TaskQuery로 구성).
+        - 전체를 훑어야 하면 iter_tasks()를 사용하세요.
+        - TTL 내 같은 조회는 캐시에서 응답합니다.
         """
-        resp = self._client.databases.query(
-            **{
-                "database_id": self._db_id,
-                "page_size": page_size,
-                # 필요 시 간단한 정렬/필터를 여기에 추가 가능
-            }
-        )
+        key = _list_key(page_size, start_cursor, filter, sorts)
+        cached = self._cache.get_query(key)
+        if cached is not None:
+            current_span().set_attribute("cache.hit", True)
+            return cached
+        body = _query_body(self._db_id, filter, sorts, page_size)
+        if start_cursor:
+            body["start_cursor"] = start_cursor
+        resp = yield _notion("databases.query", **body)
+        self._cache.put_query(key, resp)
         return resp
 
+    def _get_task(self, task_id: str) -> _Flow:
+        """
+        Task 페이지 하나를 원천에서 조회한다(캐시를 거치지 않으며, 아카이브된 페이지도 그대로 반환).
+        - 없거나 접근할 수 없는 페이지는 APIResponseError(object_not_found).
+        """
+        return (yield _notion("pages.retrieve", page_id=task_id))
+
+    def _all_pages(self, **query: Any) -> _Flow:
+        # iter_tasks와 같은 순회를 끝까지 모아 반환(흐름 안에서 쓰는 용도)
+        body = _query_body(self._db_id, query.get("filter"), query.get("sorts"), query.get("page_size", 100))
+        pages: List[Dict[str, Any]] = []
+        while True:
+            resp = yield _notion("databases.query", **body)
+            pages.extend(resp.get("results", []))
+            if not resp.get("has_more") or not resp.get("next_cursor"):
+                return pages
+            body["start_cursor"] = resp["next_cursor"]
+
     # -------- 생성 --------
-    def create_task(
+    def _create_task(
         self,
         title: str,
         due: Optional[str] = None,
@@ -48,7 +452,7 @@ class NotionTaskService:
         priority: Optional[str] = None,            # 기존 파라미터 유지: '카테고리'에 매핑
         tags: Optional[List[str]] = None,          # 현재 DB에 multi-select 없음(무시)
         notes: Optional[str] = None,
-    ) -> Dict[str, Any]:
+    ) -> _Flow:
         """
         새 Task 생성(필수: title).
         - 이 워크스페이스의 Tasks DB 실제 속성명에 맞춰 전송:
@@ -58,38 +462,23 @@ class NotionTaskService:
         - 카테고리(select) -> '카테고리'
         - 현재 DB에는 people('담당자'), multi-select('태그')가 없으므로 전달돼도 무시됩니다.
         - priority 파라미터는 하위 호환을 위해 '카테고리'에 매핑합니다.
-        (예: '💪 Work', '❤️ Family', '⚪️ Public' 등 실제 옵션 라벨과 일치해야 함)
+        (예: '💪 Work', '❤️ Family', '⚪️ Public' 등. 'work'처럼 써도 스키마로 실제 라벨에 매핑)
         """
-        properties: Dict[str, Any] = {
-            # 제목은 '할 일' (title)
-            "할 일": {"title": [{"text": {"content": title}}]}
-        }
-
-        # '날짜' (date)
-        if due:
-            properties["날짜"] = {"date": {"start": due}}
-
-        # '카테고리' (select)
-        # priority를 카테고리로 매핑 (실제 옵션 라벨로 넣어야 함)
-        if priority:
-            properties["카테고리"] = {"select": {"name": priority}}
-
-        # '메모' (rich_text)
-        if notes:
-            properties["메모"] = {"rich_text": [{"text": {"content": notes}}]}
-
-        # 현재 DB에는 'Assignee', 'Tags' 속성이 없으므로 무시합니다.
-
-        resp = self._client.pages.create(
+        schema = yield _call("schema")
+        properties = schema.validate_patch(
+            _create_properties(title, due=due, priority=priority, notes=notes)
+        )
+        resp = yield _notion(
+            "pages.create",
             **{
                 "parent": {"database_id": self._db_id},
                 "properties": properties,
             }
         )
-        return resp
+        return self._remember_write(resp)
 
     # -------- 업데이트(부분) --------
-    def update_task(self, task_id: str, patch: Dict[str, Any]) -> Dict[str, Any]:
+    def _update_task(self, task_id: str, patch: Dict[str, Any]) -> _Flow:
         """
         Task 속성 부분 업데이트.
         - patch는 Notion 'properties' 구조를 그대로 전달(최소 구성).
@@ -98,111 +487,409 @@ class NotionTaskService:
             {'카테고리': {'select': {'name': '💪 Work'}}}
             {'날짜': {'date': {'start': '2025-10-25'}}}
             {'메모': {'rich_text': [{'text': {'content': '내용'}}]}}
+        - 전송 전에 스키마로 검증/매핑하며, 없는 속성/옵션은 SchemaError(요청 안 보냄).
         """
-        resp = self._client.pages.update(
-            **{
-                "page_id": task_id,
-                "properties": patch,
-            }
-        )
-        return resp
+        schema = yield _call("schema")
+        patch = schema.validate_patch(patch)
+        return (yield from self._update_page(task_id, properties=patch))
 
     # -------- 완료 처리 --------
-    def complete_task(self, task_id: str) -> Dict[str, Any]:
+    def _complete_task(self, task_id: str) -> _Flow:
         """
         상태(status)를 '완료'로 설정.
         - 실제 DB '상태' 속성의 옵션 이름 중 하나가 '완료'임이 확인됨.
         """
-        resp = self._client.pages.update(
-            **{
-                "page_id": task_id,
-                "properties": {"상태": {"status": {"name": "완료"}}},
-            }
-        )
-        return resp
+        schema = yield _call("schema")
+        return (yield from self._update_page(task_id, properties=schema.property_patch(PROP_STATUS, STATUS_DONE)))
 
     # -------- 삭제 --------
-    def delete_task(self, task_id: str) -> Dict[str, Any]:
+    def _delete_task(self, task_id: str) -> _Flow:
         """
         Notion 페이지는 하드 삭제가 아닌 '아카이브' 플래그로 처리됩니다.
         """
-        resp = self._client.pages.update(
-            **{
-                "page_id": task_id,
-                "archived": True,
-            }
-        )
-        return resp
-    
-    # -------- 진단 메서드 --------
-    def describe_database(self) -> Dict[str, Any]:
+        return (yield from self._update_page(task_id, archived=True))
+
+    # -------- 스키마 --------
+    def _describe_database(self, refresh: bool = False) -> _Flow:
         """
-        현재 Tasks DB의 메타(속성 스키마)를 그대로 반환합니다.
+        현재 Tasks DB의 메타(속성 스키마)를 반환합니다(스키마 캐시 경유, refresh=True면 재조회).
         """
-        resp = self._client.databases.retrieve(database_id=self._db_id)
-        return resp
-    
+        if refresh:
+            self._schema.invalidate()
+        schema = yield _call("schema")
+        return schema.raw
+
     # -------- 검색/해결 --------
-    def find_tasks_by_title(self, title: str, page_size: int = 5) -> Dict[str, Any]:
+    def _find_tasks_by_title(self, title: str, page_size: int = 5) -> _Flow:
         """
         '할 일' 제목을 기준으로 Tasks를 검색한다.
         - 우선 equals로 정확 일치 시도, 없으면 contains로 보완한다.
         - 최대 page_size개 반환.
+        - TTL 내 같은 검색은 캐시에서 응답합니다.
         """
+        key = ("find", title, page_size)
+        cached = self._cache.get_query(key)
+        if cached is not None:
+            current_span().set_attribute("cache.hit", True)
+            return cached
         # 1) equals
-        resp_eq = self._client.databases.query(
+        resp = yield _notion(
+            "databases.query",
             **{
                 "database_id": self._db_id,
                 "page_size": page_size,
-                "filter": {
-                    "property": "할 일",
-                    "title": {"equals": title}
-                },
+                "filter": _title_filter(title, "equals"),
             }
         )
-        if resp_eq.get("results"):
-            return resp_eq
-        # 2) contains
-        resp_ct = self._client.databases.query(
-            **{
-                "database_id": self._db_id,
-                "page_size": page_size,
-                "filter": {
-                    "property": "할 일",
-                    "title": {"contains": title}
-                },
-            }
-        )
-        return resp_ct
-    
-    def resolve_task_id(self, ref: str) -> str | None:
+        if not resp.get("results"):
+            # 2) contains
+            resp = yield _notion(
+                "databases.query",
+                **{
+                    "database_id": self._db_id,
+                    "page_size": page_size,
+                    "filter": _title_filter(title, "contains"),
+                }
+            )
+        self._cache.put_query(key, resp)
+        return resp
+
+    def _resolve_task_id(self, ref: str) -> _Flow:
         """
         ref가 유효한 Notion page_id(하이픈 포함/미포함 UUID-like)인지 확인하고,
-        아니라면 제목 검색으로 page_id를 추출한다.
-        - 우선 정확 일치 제목을, 다음으로 contains 결과의 첫 번째를 사용.
+        아니라면 제목으로 page_id를 추출한다.
+        - 로컬 제목 인덱스(정확/정규화/접두/부분 일치)를 먼저 사용하고,
+          인덱스가 오래됐으면 last_edited_time 기준 증분 갱신(보통 빈 응답 1회)만 수행.
+        - 이번 호출에서 갱신하지 않은 인덱스로 못 찾은 경우에만 기존 제목 검색으로 보완.
         """
-        import re
-
         # UUID-like or 32-hex (하이픈 유무 모두 허용)
-        uuid_like = re.compile(r"^[0-9a-fA-F]{32}$|^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
-        if uuid_like.match(ref):
+        if _UUID_LIKE.match(ref):
+            current_span().set_attribute("notion.resolved_by", "id")
             return ref
 
-        # 제목으로 검색
-        search = self.find_tasks_by_title(ref, page_size=5)
+        refreshed = yield _call("_refresh_index_if_stale")
+        page_id = self._index.lookup(ref)
+        if page_id or refreshed:
+            current_span().set_attribute("notion.resolved_by", "index")
+            return page_id
+
+        # 제목으로 검색 후 정확 일치 우선
+        search = yield _call("find_tasks_by_title", ref, page_size=5)
         results = search.get("results", [])
-        if not results:
-            return None
+        self._index.apply(results)
+        current_span().set_attribute("notion.resolved_by", "search")
+        return _pick_task_id(results, ref)
+
+    def _refresh_title_index(self) -> _Flow:
+        """
+        제목 인덱스를 증분 갱신한다(첫 호출은 전체 적재, 이후 watermark 이후 수정분만).
+        - TITLE_INDEX_REBUILD_SEC마다 전체를 다시 받아 재구성한다(아카이브된 페이지 제거).
+        """
+        full = self._index.rebuild_due()
+        current_span().set_attribute("title_index.full", full)
+        pages = yield from self._all_pages(**self._index.delta_query(full=full))
+        if full:
+            self._index.replace(pages)
+        else:
+            self._index.apply(pages, advance_watermark=True)
+        self._index.mark_refreshed(full=full)
+
+
+class NotionTaskService(_TaskServiceBase):
+    """
+    Notion Tasks 데이터베이스(원천)에 직접 CRUD를 수행하는 얇은 래퍼.
+    """
+
+    def _connect(self, settings: Settings) -> None:
+        # keep-alive 풀을 가진 httpx.Client를 직접 주입해 요청 간 TCP/TLS 연결을 재사용
+        self._http = httpx.Client(limits=build_http_limits(settings))
+        self._client = Client(
+            client=self._http,
+            auth=settings.notion_token,
+            base_url=settings.notion_base_url,
+            timeout_ms=settings.notion_timeout_ms,
+        )
+
+    def close(self) -> None:
+        """
+        내부 HTTP 커넥션 풀을 닫는다(앱 종료 시 호출).
+        """
+        self._http.close()
 
-        # 정확 일치 우선
-        def page_title(p):
-            props = p.get("properties", {})
-            title_prop = props.get("할 일", {})
-            title_items = title_prop.get("title", [])
-            return "".join([item.get("plain_text", "") for item in title_items])
+    def _drive(self, flow: _Flow) -> Any:
+        # 흐름이 요청한 단계를 차례로 실행하고, 결과(또는 예외)를 흐름에 돌려준다
+        result: Any = None
+        error: Optional[Exception] = None
+        while True:
+            try:
+                step = flow.send(result) if error is None else flow.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            try:
+                result, error = getattr(self, step.method)(*step.args, **step.kwargs), None
+            except Exception as e:
+                result, error = None, e
 
-        exact = [p for p in results if page_title(p) == ref]
-        if exact:
-            return exact[0].get("id")
+    def _request(self, method: str, **body: Any) -> Dict[str, Any]:
+        """
+        Notion SDK 호출 공통 경로(예: method='databases.query').
+        - 공용 토큰 버킷에서 순서를 기다리고, 429/일시 오류는 백오프 후 재시도.
+        - 읽기 호출은 같은 본문의 진행 중 요청이 있으면 그 결과를 공유한다(토큰도 한 번만 소비).
+        """
+        endpoint, action = method.split(".")
+        fn = getattr(getattr(self._client, endpoint), action)
+        started = _observed_start(method)
+        with span("notion.http", **{"notion.method": method}) as s:
+            try:
+                if method in _COALESCED_METHODS:
+                    resp = self._flights.do(flight_key(method, body), lambda: self._limiter.call(fn, **body))
+                else:
+                    resp = self._limiter.call(fn, idempotent=method != "pages.create", **body)
+            except Exception as e:
+                _observed_end(method, started, e)
+                raise
+            _result_attributes(s, resp)
+        _observed_end(method, started)
+        return resp
+
+    list_tasks = _blocking(_TaskServiceBase._list_tasks, "notion.list_tasks")
+    get_task = _blocking(_TaskServiceBase._get_task, "notion.get_task")
+    create_task = _blocking(_TaskServiceBase._create_task, "notion.create_task")
+    update_task = _blocking(_TaskServiceBase._update_task, "notion.update_task")
+    complete_task = _blocking(_TaskServiceBase._complete_task, "notion.complete_task")
+    delete_task = _blocking(_TaskServiceBase._delete_task, "notion.delete_task")
+    describe_database = _blocking(_TaskServiceBase._describe_database)
+    find_tasks_by_title = _blocking(_TaskServiceBase._find_tasks_by_title, "notion.find_tasks_by_title")
+    resolve_task_id = _blocking(_TaskServiceBase._resolve_task_id, "notion.resolve_task_id")
+    refresh_title_index = _blocking(_TaskServiceBase._refresh_title_index, "notion.refresh_title_index")
+
+    def iter_tasks(
+        self,
+        filter: Optional[Dict[str, Any]] = None,
+        sorts: Optional[List[Dict[str, Any]]] = None,
+        page_size: int = 100,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Tasks 페이지를 하나씩 내보내는 제너레이터(next_cursor를 지연 추적).
+        - 한 번에 한 페이지(page_size개)만 메모리에 두므로 큰 DB도 일정한 메모리로 순회 가능.
+        - 캐시를 거치지 않는다(스트리밍/동기화 용도).
+        """
+        body = _query_body(self._db_id, filter, sorts, page_size)
+        while True:
+            resp = self._request("databases.query", **body)
+            yield from resp.get("results", [])
+            if not resp.get("has_more") or not resp.get("next_cursor"):
+                return
+            body["start_cursor"] = resp["next_cursor"]
+
+    # -------- 일괄 처리 --------
+    @_traced("notion.batch")
+    def batch(self, operations: List[Dict[str, Any]], concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """
+        create/update/complete/archive가 섞인 작업 목록을 동시에 실행한다.
+        - 같은 task_id의 작업은 입력 순서대로 하나씩 실행한다(_batch_groups).
+        - concurrency: 동시 실행 상한(기본 BATCH_CONCURRENCY)
+        - 항목별 성공/실패를 입력 순서대로 돌려준다(일부 실패해도 나머지는 계속).
+        """
+        def run(index: int, op: Dict[str, Any]) -> Dict[str, Any]:
+            # 일괄 작업은 대화형 호출보다 낮은 우선순위로 토큰을 받는다
+            with request_priority(BULK):
+                try:
+                    return _batch_item(index, op, data=operation_call(self, op)())
+                except Exception as e:
+                    return _batch_item(index, op, error=e)
 
-        return results[0].get("id")
\ No newline at end of file
+        def run_group(group: List[int]) -> List[Dict[str, Any]]:
+            return [run(i, operations[i]) for i in group]
+
+        groups = _batch_groups(operations)
+        workers = max(1, min(concurrency or self._batch_concurrency, len(groups) or 1))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            grouped = list(pool.map(run_group, groups))
+        return _batch_summary(sorted((r for items in grouped for r in items), key=lambda r: r["index"]))
+
+    # -------- 스키마 --------
+    def schema(self) -> DatabaseSchema:
+        """
+        캐시된 DB 스키마(TTL 만료 시에만 databases.retrieve 1회).
+        """
+        return self._schema.get(lambda: self._request("databases.retrieve", database_id=self._db_id))
+
+    def _refresh_index_if_stale(self) -> bool:
+        # 인덱스가 오래됐으면 한 스레드만 갱신한다. 이번 호출에서 갱신했으면 True.
+        if not self._index.needs_refresh():
+            return False
+        with self._index.refresh_lock:
+            if not self._index.needs_refresh():
+                return False
+            self.refresh_title_index()
+            return True
+
+
+class AsyncNotionTaskService(_TaskServiceBase):
+    """
+    NotionTaskService의 비동기 변형(notion_client.AsyncClient 기반).
+    - async 엔드포인트/툴(ainvoke)에서 사용하며, 워커 하나로 여러 Notion 호출을 동시에 대기할 수 있다.
+    - 메서드 이름/인자/반환값은 동기 버전과 동일하다(같은 흐름을 await로 실행).
+    """
+
+    def _connect(self, settings: Settings) -> None:
+        self._index_refresh_lock = asyncio.Lock()
+        self._http = httpx.AsyncClient(limits=build_http_limits(settings))
+        self._client = AsyncClient(
+            client=self._http,
+            auth=settings.notion_token,
+            base_url=settings.notion_base_url,
+            timeout_ms=settings.notion_timeout_ms,
+        )
+
+    async def aclose(self) -> None:
+        """
+        내부 HTTP 커넥션 풀을 닫는다(앱 종료 시 호출).
+        """
+        await self._http.aclose()
+
+    async def _adrive(self, flow: _Flow) -> Any:
+        # _drive와 같되 각 단계를 await한다(취소는 흐름에 던지지 않고 그대로 전파)
+        result: Any = None
+        error: Optional[Exception] = None
+        while True:
+            try:
+                step = flow.send(result) if error is None else flow.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            try:
+                result, error = await getattr(self, step.method)(*step.args, **step.kwargs), None
+            except Exception as e:
+                result, error = None, e
+
+    async def _request(self, method: str, **body: Any) -> Dict[str, Any]:
+        endpoint, action = method.split(".")
+        fn = getattr(getattr(self._client, endpoint), action)
+        started = _observed_start(method)
+        with span("notion.http", **{"notion.method": method}) as s:
+            try:
+                if method in _COALESCED_METHODS:
+                    resp = await self._flights.ado(flight_key(method, body), lambda: self._limiter.acall(fn, **body))
+                else:
+                    resp = await self._limiter.acall(fn, idempotent=method != "pages.create", **body)
+            except Exception as e:
+                _observed_end(method, started, e)
+                raise
+            _result_attributes(s, resp)
+        _observed_end(method, started)
+        return resp
+
+    list_tasks = _awaitable(_TaskServiceBase._list_tasks, "notion.list_tasks")
+    get_task = _awaitable(_TaskServiceBase._get_task, "notion.get_task")
+    create_task = _awaitable(_TaskServiceBase._create_task, "notion.create_task")
+    update_task = _awaitable(_TaskServiceBase._update_task, "notion.update_task")
+    complete_task = _awaitable(_TaskServiceBase._complete_task, "notion.complete_task")
+    delete_task = _awaitable(_TaskServiceBase._delete_task, "notion.delete_task")
+    describe_database = _awaitable(_TaskServiceBase._describe_database)
+    find_tasks_by_title = _awaitable(_TaskServiceBase._find_tasks_by_title, "notion.find_tasks_by_title")
+    resolve_task_id = _awaitable(_TaskServiceBase._resolve_task_id, "notion.resolve_task_id")
+    refresh_title_index = _awaitable(_TaskServiceBase._refresh_title_index, "notion.refresh_title_index")
+
+    async def iter_tasks(
+        self,
+        filter: Optional[Dict[str, Any]] = None,
+        sorts: Optional[List[Dict[str, Any]]] = None,
+        page_size: int = 100,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        iter_tasks의 비동기 제너레이터 버전(다음 페이지는 소비자가 요구할 때 조회).
+        """
+        body = _query_body(self._db_id, filter, sorts, page_size)
+        while True:
+            resp = await self._request("databases.query", **body)
+            for page in resp.get("results", []):
+                yield page
+            if not resp.get("has_more") or not resp.get("next_cursor"):
+                return
+            body["start_cursor"] = resp["next_cursor"]
+
+    # -------- 일괄 처리 --------
+    @_traced("notion.batch")
+    async def batch(self, operations: List[Dict[str, Any]], concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """
+        batch의 비동기 버전(세마포어로 동시 실행 상한을 지킨다, 같은 task_id는 순차).
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency or self._batch_concurrency))
+
+        async def run(index: int, op: Dict[str, Any]) -> Dict[str, Any]:
+            with request_priority(BULK):
+                try:
+                    call = operation_call(self, op)
+                    async with semaphore:
+                        return _batch_item(index, op, data=await call())
+                except Exception as e:
+                    return _batch_item(index, op, error=e)
+
+        async def run_group(group: List[int]) -> List[Dict[str, Any]]:
+            return [await run(i, operations[i]) for i in group]
+
+        grouped = await asyncio.gather(*(run_group(g) for g in _batch_groups(operations)))
+        return _batch_summary(sorted((r for items in grouped for r in items), key=lambda r: r["index"]))
+
+    # -------- 스키마 --------
+    async def schema(self) -> DatabaseSchema:
+        return await self._schema.aget(lambda: self._request("databases.retrieve", database_id=self._db_id))
+
+    async def _refresh_index_if_stale(self) -> bool:
+        if not self._index.needs_refresh():
+            return False
+        async with self._index_refresh_lock:
+            if not self._index.needs_refresh():
+                return False
+            await self.refresh_title_index()
+            return True
+
+
+# -------- 프로세스 공용 인스턴스 --------
+_service: Optional[NotionTaskService] = None
+_service_lock = threading.Lock()
+
+def get_notion_service() -> NotionTaskService:
+    """
+    프로세스 전역에서 공유하는 NotionTaskService를 반환한다(없으면 생성).
+    - FastAPI에서는 Depends(get_notion_service)로 주입받는다.
+    - LangChain 툴도 같은 인스턴스(같은 커넥션 풀)를 사용한다.
+    """
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = NotionTaskService()
+    return _service
+
+def close_notion_service() -> None:
+    """
+    공용 인스턴스의 커넥션 풀을 닫고 참조를 해제한다(앱 종료 시).
+    """
+    global _service
+    with _service_lock:
+        if _service is not None:
+            _service.close()
+            _service = None
+
+_async_service: Optional[AsyncNotionTaskService] = None
+
+def get_async_notion_service() -> AsyncNotionTaskService:
+    """
+    프로세스 전역에서 공유하는 AsyncNotionTaskService를 반환한다(없으면 생성).
+    - 이벤트 루프 안에서만 호출되므로 별도 락이 필요 없다.
+    """
+    global _async_service
+    if _async_service is None:
+        _async_service = AsyncNotionTaskService()
+    return _async_service
+
+async def aclose_async_notion_service() -> None:
+    """
+    비동기 공용 인스턴스의 커넥션 풀을 닫고 참조를 해제한다(앱 종료 시).
+    """
+    global _async_service
+    if _async_service is not None:
+        await _async_service.aclose()
+        _async_service = None
@@ -0,0 +1,164 @@
+"""
+역할 :
+- 목록 조회 조건(상태/카테고리/날짜 범위/제목 포함/정렬)을 Notion databases.query의 filter/sorts로 컴파일
+- 같은 조건을 로컬 미러(SQLite)의 WHERE/ORDER BY로도 컴파일한다(미러가 있으면 네트워크 없이 응답).
+  상태/카테고리 정렬은 Notion처럼 DB 옵션 순서를 따른다(option_order, 없으면 미러 정렬 거부).
+- compile_conditions는 NotionTodoClient.run_plan(query)의 [{property, operator, value}] 조건 목록을
+  Notion filter로 바꾸는 공용 로직이다.
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+from app.services.records import FIELDS
+from app.services.schema import PROP_CATEGORY, PROP_DATE, PROP_STATUS, PROP_TITLE
+
+DATE_OPERATORS = frozenset({"equals", "before", "after", "on_or_before", "on_or_after"})
+TEXT_OPERATORS = frozenset({"equals", "contains", "starts_with", "ends_with"})
+_DATE_PROPERTIES = (PROP_DATE, "이벤트 날짜")
+_SELECT_PROPERTIES = (PROP_CATEGORY, "장소")
+
+# 정렬 키 → (Notion sort 본문, 미러 컬럼)
+SORT_KEYS: Dict[str, Tuple[Dict[str, str], str]] = {
+    "date": ({"property": PROP_DATE}, "date"),
+    "title": ({"property": PROP_TITLE}, "title"),
+    "status": ({"property": PROP_STATUS}, "status"),
+    "category": ({"property": PROP_CATEGORY}, "category"),
+    "last_edited_time": ({"timestamp": "last_edited_time"}, "last_edited_time"),
+}
+# Notion이 글자순이 아니라 옵션 순서로 정렬하는 키
+OPTION_SORT_KEYS = frozenset({"status", "category"})
+
+
+def compile_condition(prop: str, op: Optional[str], value: Any) -> Dict[str, Any]:
+    """
+    조건 하나를 Notion filter 항목으로 바꾼다(속성 종류는 이름으로 판단).
+    """
+    if prop in _DATE_PROPERTIES:
+        return {"property": prop, "date": {op if op in DATE_OPERATORS else "equals": value}}
+    if prop == PROP_STATUS or prop in _SELECT_PROPERTIES:
+        kind = "status" if prop == PROP_STATUS else "select"
+        return {"property": prop, kind: {"does_not_equal" if op == "does_not_equal" else "equals": value}}
+    return {"property": prop, "title": {op if op in TEXT_OPERATORS else "contains": value}}
+
+def compile_conditions(conditions: Sequence[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    [{property, operator, value}, ...] → {"and": [...]} (조건이 없으면 None).
+    """
+    and_filters = [compile_condition(c.get("property"), c.get("operator"), c.get("value")) for c in conditions]
+    return {"and": and_filters} if and_filters else None
+
+def parse_sort(sort: Optional[str]) -> List[Tuple[str, bool]]:
+    """
+    "date,-last_edited_time" → [("date", False), ("last_edited_time", True)] (앞의 '-'는 내림차순).
+    """
+    keys: List[Tuple[str, bool]] = []
+    for part in (sort or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        desc = part.startswith("-")
+        key = part.lstrip("+-")
+        if key not in SORT_KEYS:
+            raise ValueError(f"정렬할 수 없는 키: {key} (가능: {', '.join(SORT_KEYS)})")
+        keys.append((key, desc))
+    return keys
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    "title,status" → ("title", "status"). 비어 있으면 None(전체 필드).
+    """
+    names = tuple(f.strip() for f in (fields or "").split(",") if f.strip())
+    unknown = [f for f in names if f not in FIELDS]
+    if unknown:
+        raise ValueError(f"알 수 없는 필드: {', '.join(unknown)} (가능: {', '.join(FIELDS)})")
+    return names or None
+
+
+class TaskQuery:
+    """
+    목록 조회 조건. 값은 실제 DB 라벨/YYYY-MM-DD로 정규화된 상태로 넘긴다.
+    - option_order: {"status": (옵션 라벨...), "category": (...)} DB 스키마의 옵션 순서(미러 정렬용)
+    """
+    __slots__ = ("status", "category", "date_from", "date_to", "title_contains", "sort", "option_order")
+
+    def __init__(
+        self,
+        status: Optional[str] = None,
+        category: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        title_contains: Optional[str] = None,
+        sort: Sequence[Tuple[str, bool]] = (),
+        option_order: Optional[Mapping[str, Sequence[str]]] = None,
+    ) -> None:
+        self.status = status
+        self.category = category
+        self.date_from = date_from
+        self.date_to = date_to
+        self.title_contains = title_contains
+        self.sort = tuple(sort)
+        self.option_order = {k: tuple(v) for k, v in (option_order or {}).items()}
+
+    def needs_option_order(self) -> bool:
+        return any(key in OPTION_SORT_KEYS for key, _ in self.sort)
+
+    def conditions(self) -> List[Dict[str, Any]]:
+        conditions: List[Dict[str, Any]] = []
+        if self.status:
+            conditions.append({"property": PROP_STATUS, "operator": "equals", "value": self.status})
+        if self.category:
+            conditions.append({"property": PROP_CATEGORY, "operator": "equals", "value": self.category})
+        if self.date_from:
+            conditions.append({"property": PROP_DATE, "operator": "on_or_after", "value": self.date_from})
+        if self.date_to:
+            conditions.append({"property": PROP_DATE, "operator": "on_or_before", "value": self.date_to})
+        if self.title_contains:
+            conditions.append({"property": PROP_TITLE, "operator": "contains", "value": self.title_contains})
+        return conditions
+
+    def notion_filter(self) -> Optional[Dict[str, Any]]:
+        return compile_conditions(self.conditions())
+
+    def notion_sorts(self) -> Optional[List[Dict[str, str]]]:
+        if not self.sort:
+            return None
+        return [{**SORT_KEYS[key][0], "direction": "descending" if desc else "ascending"} for key, desc in self.sort]
+
+    def sql(self) -> Tuple[str, List[Any], str]:
+        """
+        미러 tasks 테이블용 (WHERE 절, 파라미터, ORDER BY 절). 파라미터는 WHERE → ORDER BY 순서다.
+        - 빈 값(NULL)은 Notion처럼 정렬 방향과 무관하게 뒤로 보낸다.
+        - 상태/카테고리는 option_order 순서(스키마에 없는 라벨은 그 뒤)로 정렬한다.
+          option_order가 없으면 글자순과 Notion 결과가 달라지므로 ValueError.
+        """
+        where = ["archived = 0"]
+        params: List[Any] = []
+        for column, value in (("status", self.status), ("category", self.category)):
+            if value:
+                where.append(f"{column} = ?")
+                params.append(value)
+        if self.date_from:
+            where.append("substr(date, 1, 10) >= ?")
+            params.append(self.date_from)
+        if self.date_to:
+            where.append("substr(date, 1, 10) <= ?")
+            params.append(self.date_to)
+        if self.title_contains:
+            where.append("instr(lower(title), lower(?)) > 0")
+            params.append(self.title_contains)
+        order: List[str] = []
+        for key, desc in self.sort:
+            column = SORT_KEYS[key][1]
+            direction = "DESC" if desc else "ASC"
+            if key not in OPTION_SORT_KEYS:
+                order.append(f"{column} IS NULL, {column} {direction}")
+                continue
+            options = self.option_order.get(key)
+            if options is None:
+                raise ValueError(f"미러에서 {key} 정렬에는 DB 옵션 순서가 필요합니다. source=notion으로 조회하세요.")
+            rank = " ".join(f"WHEN ? THEN {i}" for i in range(len(options)))
+            order.append(f"{column} IS NULL, CASE {column} {rank} ELSE {len(options)} END {direction}" if options
+                         else f"{column} IS NULL")
+            params.extend(options)
+        order = order or ["last_edited_time DESC"]
+        return " AND ".join(where), params, ", ".join(order + ["page_id"])
@@ -0,0 +1,312 @@
+"""
+역할 :
+- 모든 Notion 호출 앞단의 공용 토큰 버킷 레이트 리미터 + 429 인지 재시도 스케줄러
+- Notion 권장 한도(초당 약 3회)를 프로세스 단위로 지키고, 대기열은 우선순위 순으로 처리한다.
+  (에이전트/대화형 호출 INTERACTIVE가 일괄 작업 BULK보다 먼저 토큰을 받는다)
+- 429 응답의 Retry-After는 버킷 전체를 그 시간만큼 멈추게 해 다른 호출도 함께 기다리게 한다.
+- 재시도는 지터가 있는 지수 백오프(full jitter)를 사용한다.
+  생성(pages.create)처럼 멱등이 아닌 호출은 429에서만 재시도한다(중복 생성 방지).
+- 토큰 대기/재시도는 현재 trace span(Notion 호출)에 notion.limiter_wait_ms / notion.retries로 남긴다.
+"""
+
+from __future__ import annotations
+import asyncio
+import heapq
+import itertools
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+import httpx
+from notion_client.errors import APIResponseError, HTTPResponseError, RequestTimeoutError
+from app.core.config import Settings, get_settings, on_settings_change
+from app.core.tracing import current_span
+
+INTERACTIVE = 0
+BULK = 10
+
+_priority: ContextVar[int] = ContextVar("notion_priority", default=INTERACTIVE)
+
+@contextmanager
+def request_priority(priority: int) -> Iterator[None]:
+    """
+    이 블록 안의 Notion 호출 우선순위를 지정한다(작을수록 먼저).
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class TokenBucket:
+    """
+    스레드/이벤트 루프 양쪽에서 공유 가능한 우선순위 토큰 버킷.
+    - 대기자는 (priority, 도착순) 힙에 줄 서고, 맨 앞 대기자만 토큰을 가져갈 수 있다.
+    - 실제 대기(sleep)는 호출자가 하므로 동기(time.sleep)/비동기(asyncio.sleep) 모두 같은 로직을 쓴다.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiters: List[Tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def configure(self, rate: float, burst: int) -> None:
+        """
+        속도/버스트를 바꾼다(설정 재로딩). 그때까지 쌓인 토큰은 이전 속도로 계산하고 새 버스트로 자른다.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+            self.burst = max(1, burst)
+            self._tokens = min(self._tokens, float(self.burst))
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _enter(self, priority: int) -> Tuple[int, int]:
+        ticket = (priority, next(self._seq))
+        with self._lock:
+            heapq.heappush(self._waiters, ticket)
+        return ticket
+
+    def _leave(self, ticket: Tuple[int, int]) -> None:
+        with self._lock:
+            if ticket in self._waiters:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+
+    def _poll(self, ticket: Tuple[int, int]) -> float:
+        """
+        토큰을 얻었으면 0, 아니면 다시 시도하기까지 기다릴 시간(초).
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            if self.rate <= 0:
+                # 대기 중에 리미터가 꺼졌다: 줄 선 순서와 상관없이 바로 통과
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                return 0.0
+            self._refill(now)
+            if self._waiters and self._waiters[0] == ticket and self._tokens >= 1:
+                heapq.heappop(self._waiters)
+                self._tokens -= 1
+                return 0.0
+            return max((1 - self._tokens) / self.rate, 0.005)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Retry-After 동안 모든 호출을 멈춘다.
+        """
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+    def acquire(self, priority: Optional[int] = None) -> float:
+        """
+        토큰 하나를 얻을 때까지 블로킹한다. 기다린 시간(초)을 반환.
+        """
+        if not self.enabled:
+            return 0.0
+        start = time.monotonic()
+        ticket = self._enter(_priority.get() if priority is None else priority)
+        try:
+            while (delay := self._poll(ticket)) > 0:
+                time.sleep(delay)
+        except BaseException:
+            self._leave(ticket)
+            raise
+        return time.monotonic() - start
+
+    async def aacquire(self, priority: Optional[int] = None) -> float:
+        if not self.enabled:
+            return 0.0
+        start = time.monotonic()
+        ticket = self._enter(_priority.get() if priority is None else priority)
+        try:
+            while (delay := self._poll(ticket)) > 0:
+                await asyncio.sleep(delay)
+        except BaseException:
+            self._leave(ticket)
+            raise
+        return time.monotonic() - start
+
+    def queue_depth(self) -> int:
+        with self._lock:
+            return len(self._waiters)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    headers = getattr(error, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _trace_wait(waited: float) -> None:
+    if waited:
+        current_span().add("notion.limiter_wait_ms", round(waited * 1000, 3))
+
+def _trace_retry(error: Exception, delay: float) -> None:
+    # 현재 span(Notion 호출)에 재시도 횟수와 원인을 남긴다
+    span = current_span()
+    span.add("notion.retries")
+    span.add_event("retry", {"error": type(error).__name__, "status": getattr(error, "status", None),
+                             "delay_sec": round(delay, 3)})
+
+
+class NotionLimiter:
+    """
+    토큰 버킷 + 재시도 정책. call()/acall()로 Notion SDK 호출을 감싼다.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+    ) -> None:
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.wait_sec = 0.0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "NotionLimiter":
+        return cls(
+            rate=settings.notion_rate_per_sec,
+            burst=settings.notion_rate_burst,
+            max_retries=settings.notion_max_retries,
+            backoff_base=settings.notion_backoff_base_sec,
+            backoff_max=settings.notion_backoff_max_sec,
+        )
+
+    def apply_settings(self, settings: Settings) -> None:
+        self.bucket.configure(settings.notion_rate_per_sec, settings.notion_rate_burst)
+        self.max_retries = settings.notion_max_retries
+        self.backoff_base = settings.notion_backoff_base_sec
+        self.backoff_max = settings.notion_backoff_max_sec
+
+    def _backoff(self, attempt: int) -> float:
+        # full jitter: [0, min(max, base * 2^attempt)]
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _retry_delay(self, error: Exception, attempt: int, idempotent: bool) -> Optional[float]:
+        """
+        재시도할 대기 시간(초). 재시도하지 않을 오류면 None.
+        """
+        if attempt >= self.max_retries:
+            return None
+        if isinstance(error, APIResponseError) and error.status == 429:
+            with self._lock:
+                self.rate_limited += 1
+            wait = _retry_after(error)
+            if wait is not None:
+                self.bucket.pause(wait)
+                return wait + random.uniform(0, self.backoff_base)
+            return self._backoff(attempt)
+        if not idempotent:
+            return None
+        if isinstance(error, HTTPResponseError) and error.status in (500, 502, 503, 504):
+            return self._backoff(attempt)
+        if isinstance(error, (RequestTimeoutError, httpx.TransportError)):
+            return self._backoff(attempt)
+        return None
+
+    def _record(self, waited: float, retried: bool) -> None:
+        with self._lock:
+            self.wait_sec += waited
+            if retried:
+                self.retries += 1
+            else:
+                self.calls += 1
+
+    def call(self, fn: Callable[..., Any], *args: Any, idempotent: bool = True, **kwargs: Any) -> Any:
+        attempt = 0
+        while True:
+            waited = self.bucket.acquire()
+            self._record(waited, retried=attempt > 0)
+            _trace_wait(waited)
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, idempotent)
+                if delay is None:
+                    raise
+                _trace_retry(e, delay)
+            time.sleep(delay)
+            attempt += 1
+
+    async def acall(self, fn: Callable[..., Awaitable[Any]], *args: Any, idempotent: bool = True, **kwargs: Any) -> Any:
+        attempt = 0
+        while True:
+            waited = await self.bucket.aacquire()
+            self._record(waited, retried=attempt > 0)
+            _trace_wait(waited)
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, idempotent)
+                if delay is None:
+                    raise
+                _trace_retry(e, delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rate_per_sec": self.bucket.rate,
+                "burst": self.bucket.burst,
+                "queued": self.bucket.queue_depth(),
+                "calls": self.calls,
+                "retries": self.retries,
+                "rate_limited": self.rate_limited,
+                "wait_sec": round(self.wait_sec, 3),
+            }
+
+
+# -------- 프로세스 공용 인스턴스 --------
+_limiter: Optional[NotionLimiter] = None
+_limiter_lock = threading.Lock()
+
+def get_notion_limiter() -> NotionLimiter:
+    """
+    동기/비동기 서비스와 NotionTodoClient가 함께 쓰는 공용 리미터(통합 한도는 하나).
+    """
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = NotionLimiter.from_settings(get_settings())
+    return _limiter
+
+@on_settings_change
+def _apply_settings(old: Settings, new: Settings) -> None:
+    # 서비스들이 리미터 참조를 들고 있으므로 같은 인스턴스의 속도/재시도 정책만 바꾼다
+    if _limiter is not None:
+        _limiter.apply_settings(new)
@@ -0,0 +1,104 @@
+"""
+역할 :
+- Notion 페이지(중첩된 properties 딕셔너리) → 평평한 TaskRecord 투영
+  (page_id/제목/상태/카테고리/날짜/메모/url/수정 시각/아카이브 여부)
+- 툴/엔드포인트는 기본으로 이 형태를 돌려준다(응답 크기·메모리·LLM 컨텍스트 토큰 절감).
+  원본 페이지가 필요하면 엔드포인트에 raw=true를 준다.
+- NotionTodoClient._extract_rows와 로컬 미러 행 구성도 같은 추출기를 쓴다.
+- 서비스/캐시는 원본 페이지를 그대로 보관한다(쓰기 응답과 캐시 갱신의 기준).
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from app.services.schema import PROP_CATEGORY, PROP_DATE, PROP_NOTES, PROP_STATUS, PROP_TITLE
+
+FIELDS = ("page_id", "title", "status", "category", "date", "notes", "url", "last_edited_time", "archived")
+
+
+def _plain(items: Optional[List[Dict[str, Any]]]) -> str:
+    if not items:
+        return ""
+    return "".join(i.get("plain_text") or (i.get("text") or {}).get("content", "") for i in items)
+
+def _named(prop: Optional[Dict[str, Any]], kind: str) -> Optional[str]:
+    value = prop.get(kind) if prop else None
+    return value.get("name") if value else None
+
+
+class TaskRecord:
+    """
+    Tasks 페이지 한 건의 평평한 투영. __slots__로 페이지 딕셔너리보다 훨씬 작다.
+    """
+    __slots__ = FIELDS
+
+    def __init__(
+        self,
+        page_id: Optional[str],
+        title: str,
+        status: Optional[str] = None,
+        category: Optional[str] = None,
+        date: Optional[str] = None,
+        notes: Optional[str] = None,
+        url: Optional[str] = None,
+        last_edited_time: Optional[str] = None,
+        archived: bool = False,
+    ) -> None:
+        self.page_id = page_id
+        self.title = title
+        self.status = status
+        self.category = category
+        self.date = date
+        self.notes = notes
+        self.url = url
+        self.last_edited_time = last_edited_time
+        self.archived = archived
+
+    @classmethod
+    def from_page(cls, page: Dict[str, Any]) -> "TaskRecord":
+        props = page.get("properties") or {}
+        title = props.get(PROP_TITLE)
+        date = props.get(PROP_DATE)
+        date = date.get("date") if date else None
+        notes = props.get(PROP_NOTES)
+        return cls(
+            page.get("id"),
+            _plain(title.get("title")) if title else "",
+            _named(props.get(PROP_STATUS), "status"),
+            _named(props.get(PROP_CATEGORY), "select"),
+            date.get("start") if date else None,
+            (_plain(notes.get("rich_text")) or None) if notes else None,
+            page.get("url"),
+            page.get("last_edited_time"),
+            bool(page.get("archived") or page.get("in_trash")),
+        )
+
+    def as_dict(self, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        return {f: getattr(self, f) for f in (fields or FIELDS)}
+
+    def __repr__(self) -> str:
+        return f"TaskRecord(page_id={self.page_id!r}, title={self.title!r}, status={self.status!r})"
+
+
+def to_records(pages: Iterable[Dict[str, Any]]) -> List[TaskRecord]:
+    return [TaskRecord.from_page(p) for p in pages]
+
+def project_page(page: Any, fields: Optional[Sequence[str]] = None) -> Any:
+    """
+    Notion 페이지 객체면 TaskRecord 딕셔너리로, 아니면(없음/다른 응답) 그대로 돌려준다.
+    """
+    if not isinstance(page, dict) or page.get("object") != "page":
+        return page
+    return TaskRecord.from_page(page).as_dict(fields)
+
+def project_list(resp: Dict[str, Any], fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    databases.query 형태의 응답 → {"results": [레코드...], "has_more", "next_cursor"(, "source")}.
+    """
+    out: Dict[str, Any] = {
+        "results": [TaskRecord.from_page(p).as_dict(fields) for p in resp.get("results", [])],
+        "has_more": resp.get("has_more", False),
+        "next_cursor": resp.get("next_cursor"),
+    }
+    if "source" in resp:
+        out["source"] = resp["source"]
+    return out
@@ -0,0 +1,246 @@
+"""
+역할 :
+- Tasks DB 속성명/옵션 라벨 상수와, describe_database 결과를 캐시하는 스키마 레지스트리
+- 패치(properties)를 보내기 전에 로컬에서 검증/매핑한다.
+  * 속성 별칭: 'status' → '상태', 'due' → '날짜', 'priority' → '카테고리' 등
+  * 옵션 별칭: 'work' → '💪 Work', 'done' → '완료' (이모지/공백/대소문자 무시)
+  * 없는 속성/옵션은 Notion 왕복 없이 SchemaError로 즉시 거절
+- 스키마는 TTL 동안 재사용하고, 만료 후 재조회 시 DB의 last_edited_time(버전 태그)이
+  같으면 파싱 결과를 그대로 유지한다(Notion은 ETag/조건부 요청을 지원하지 않음).
+"""
+
+from __future__ import annotations
+import threading
+import time
+import unicodedata
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from app.core.config import Settings, get_settings, on_settings_change
+
+# -------- Tasks DB 속성명 / 옵션 라벨 --------
+PROP_TITLE = "할 일"
+PROP_DATE = "날짜"
+PROP_STATUS = "상태"
+PROP_CATEGORY = "카테고리"
+PROP_NOTES = "메모"
+STATUS_DONE = "완료"
+
+# 입력(REST/LLM)에서 쓰일 수 있는 속성 별칭
+PROPERTY_ALIASES = {
+    "title": PROP_TITLE,
+    "제목": PROP_TITLE,
+    "date": PROP_DATE,
+    "due": PROP_DATE,
+    "마감": PROP_DATE,
+    "마감일": PROP_DATE,
+    "status": PROP_STATUS,
+    "category": PROP_CATEGORY,
+    "priority": PROP_CATEGORY,
+    "분류": PROP_CATEGORY,
+    "notes": PROP_NOTES,
+    "memo": PROP_NOTES,
+    "노트": PROP_NOTES,
+}
+
+# 상태 옵션 별칭(정규화 키 → 라벨). 실제 DB에 그 라벨이 있어야 적용된다.
+STATUS_ALIASES = {
+    "done": STATUS_DONE,
+    "complete": STATUS_DONE,
+    "completed": STATUS_DONE,
+    "완료됨": STATUS_DONE,
+    "끝": STATUS_DONE,
+    "todo": "시작 전",
+    "notstarted": "시작 전",
+    "시작전": "시작 전",
+    "doing": "진행 중",
+    "inprogress": "진행 중",
+    "진행중": "진행 중",
+}
+
+
+class SchemaError(ValueError):
+    """
+    패치가 DB 스키마와 맞지 않음(없는 속성/옵션, 지원하지 않는 타입).
+    """
+
+
+def _key(text: str) -> str:
+    # NFC + casefold 후 글자/숫자만 남긴다('💪 Work' → 'work', '진행 중' → '진행중')
+    text = unicodedata.normalize("NFC", text).casefold()
+    return "".join(ch for ch in text if ch.isalnum())
+
+
+class _Property:
+    __slots__ = ("name", "type", "options", "_by_key")
+
+    def __init__(self, name: str, spec: Dict[str, Any]) -> None:
+        self.name = name
+        self.type = spec.get("type", "")
+        options = ((spec.get(self.type) or {}).get("options") or []) if self.type in ("status", "select") else []
+        self.options: Tuple[str, ...] = tuple(o.get("name") for o in options if o.get("name"))
+        self._by_key: Dict[str, Optional[str]] = {}
+        for label in self.options:
+            k = _key(label)
+            # 정규화 키가 겹치는 라벨은 모호하므로 별칭 매칭에서 제외(원문 일치만 허용)
+            self._by_key[k] = None if k in self._by_key else label
+
+    def option(self, label: str) -> str:
+        """
+        입력 라벨을 실제 옵션 라벨로 매핑한다. 원문 일치 → 정규화 일치 → 상태 별칭 순.
+        """
+        if label in self.options:
+            return label
+        k = _key(label)
+        found = self._by_key.get(k)
+        if found is None and self.type == "status":
+            alias = STATUS_ALIASES.get(k)
+            if alias in self.options:
+                found = alias
+        if found is None:
+            raise SchemaError(f"'{self.name}'에 없는 옵션: {label!r} (가능: {', '.join(self.options)})")
+        return found
+
+
+class DatabaseSchema:
+    """
+    describe_database 응답 하나를 파싱한 불변 스키마.
+    """
+
+    def __init__(self, raw: Dict[str, Any]) -> None:
+        self.raw = raw
+        self.version = raw.get("last_edited_time")
+        self.properties = {name: _Property(name, spec) for name, spec in (raw.get("properties") or {}).items()}
+        self._by_key = {_key(name): name for name in self.properties}
+
+    def property(self, name: str) -> _Property:
+        """
+        속성명(또는 별칭)을 실제 속성으로 해석한다.
+        """
+        prop = self.properties.get(name)
+        if prop is None:
+            canonical = PROPERTY_ALIASES.get(name.strip().casefold()) or self._by_key.get(_key(name))
+            prop = self.properties.get(canonical) if canonical else None
+        if prop is None:
+            raise SchemaError(f"DB에 없는 속성: {name!r} (가능: {', '.join(self.properties)})")
+        return prop
+
+    def property_patch(self, field: str, value: Optional[str]) -> Dict[str, Any]:
+        """
+        속성명과 문자열 값으로 Notion properties patch를 구성한다(타입별 구조는 스키마에서 결정).
+        """
+        prop = self.property(field)
+        if prop.type in ("status", "select"):
+            if value is None and prop.type == "select":
+                return {prop.name: {"select": None}}
+            return {prop.name: {prop.type: {"name": prop.option(value or "")}}}
+        if prop.type == "date":
+            return {prop.name: {"date": {"start": value} if value else None}}
+        if prop.type in ("title", "rich_text"):
+            return {prop.name: {prop.type: [{"text": {"content": value or ""}}]}}
+        raise SchemaError(f"지원하지 않는 속성 타입: {prop.name}({prop.type})")
+
+    def validate_patch(self, patch: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        properties patch를 검증하고 실제 속성명/옵션 라벨로 매핑한 새 patch를 반환한다.
+        - 값이 문자열이면 property_patch로 구조를 만들어 준다({'상태': '완료'} 허용).
+        - status/select는 {'status': ...}/{'select': ...} 어느 키로 와도 실제 타입으로 맞춘다.
+        """
+        out: Dict[str, Any] = {}
+        for name, value in patch.items():
+            if value is None or isinstance(value, str):
+                out.update(self.property_patch(name, value))
+                continue
+            prop = self.property(name)
+            if prop.type in ("status", "select") and isinstance(value, dict):
+                inner = value.get(prop.type, value.get("select" if prop.type == "status" else "status"))
+                if inner is None and prop.type == "select":
+                    out[prop.name] = {"select": None}
+                    continue
+                label = inner.get("name") if isinstance(inner, dict) else None
+                if not label:
+                    raise SchemaError(f"'{prop.name}' 값에는 옵션 name이 필요합니다.")
+                out[prop.name] = {prop.type: {"name": prop.option(label)}}
+                continue
+            out[prop.name] = value
+        return out
+
+
+class SchemaRegistry:
+    """
+    DatabaseSchema를 TTL 동안 재사용하는 레지스트리(동기/비동기 서비스 공용).
+    - 조회 함수는 호출자가 넘긴다(서비스의 _request 경유 → 리미터/single-flight 적용).
+    """
+
+    def __init__(self, ttl_sec: float = 300.0) -> None:
+        self.ttl_sec = ttl_sec
+        self._schema: Optional[DatabaseSchema] = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+        self.fetches = 0
+        self.changes = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "SchemaRegistry":
+        return cls(ttl_sec=settings.schema_ttl_sec)
+
+    def apply_settings(self, settings: Settings) -> None:
+        self.ttl_sec = settings.schema_ttl_sec
+
+    def current(self) -> Optional[DatabaseSchema]:
+        """
+        아직 신선한 스키마(없거나 만료면 None).
+        """
+        schema = self._schema
+        if schema is None or time.monotonic() - self._fetched_at >= self.ttl_sec:
+            return None
+        return schema
+
+    def _store(self, raw: Dict[str, Any]) -> DatabaseSchema:
+        with self._lock:
+            self.fetches += 1
+            self._fetched_at = time.monotonic()
+            # 버전 태그가 같으면 기존 파싱 결과 유지
+            if self._schema is None or raw.get("last_edited_time") is None \
+                    or raw.get("last_edited_time") != self._schema.version:
+                self._schema = DatabaseSchema(raw)
+                self.changes += 1
+            return self._schema
+
+    def get(self, fetch: Callable[[], Dict[str, Any]]) -> DatabaseSchema:
+        return self.current() or self._store(fetch())
+
+    async def aget(self, fetch: Callable[[], Awaitable[Dict[str, Any]]]) -> DatabaseSchema:
+        return self.current() or self._store(await fetch())
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._fetched_at = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            schema = self._schema
+            return {
+                "loaded": schema is not None,
+                "version": schema.version if schema else None,
+                "age_sec": round(time.monotonic() - self._fetched_at, 1) if schema else None,
+                "ttl_sec": self.ttl_sec,
+                "fetches": self.fetches,
+                "changes": self.changes,
+            }
+
+
+# -------- 프로세스 공용 인스턴스 --------
+_registry: Optional[SchemaRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_schema_registry() -> SchemaRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = SchemaRegistry.from_settings(get_settings())
+    return _registry
+
+@on_settings_change
+def _apply_settings(old: Settings, new: Settings) -> None:
+    if _registry is not None:
+        _registry.apply_settings(new)
@@ -0,0 +1,144 @@
+"""
+역할 :
+- 동일한 Notion 읽기 요청이 동시에 여러 개 들어오면 하나만 실제로 보내고 결과를 공유(single-flight)
+- 키는 'method + 정규화된 요청 본문(JSON, 키 정렬)'이다.
+- 동기 호출(스레드)은 do(), 비동기 호출(이벤트 루프)은 ado()를 사용한다.
+- 완료된 결과는 보관하지 않는다(보관은 TaskCache의 몫). 진행 중인 요청만 합친다.
+"""
+
+from __future__ import annotations
+import asyncio
+import json
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from app.core.config import Settings, get_settings, on_settings_change
+
+
+def flight_key(method: str, body: Dict[str, Any]) -> str:
+    return method + ":" + json.dumps(body, sort_keys=True, ensure_ascii=False, default=str)
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    진행 중인 호출을 key별로 하나만 유지한다.
+    - enabled=False면 합치지 않고 그대로 실행한다.
+    - 공유된 결과는 같은 객체이므로 호출자는 응답을 변경하지 않아야 한다.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        # future는 만든 이벤트 루프에서만 기다릴 수 있으므로 루프별로 나눈다
+        self._async_flights: Dict[Tuple[int, str], asyncio.Task] = {}
+        self.leaders = 0
+        self.shared = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "SingleFlight":
+        return cls(enabled=settings.notion_single_flight)
+
+    def apply_settings(self, settings: Settings) -> None:
+        # 끄더라도 이미 진행 중인 호출을 기다리는 쪽은 그 결과를 그대로 받는다
+        self.enabled = settings.notion_single_flight
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        같은 key의 호출이 진행 중이면 그 결과를 기다려 공유하고, 아니면 직접 실행한다.
+        """
+        if not self.enabled:
+            return fn()
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.shared += 1
+                leader = False
+            else:
+                flight = self._flights[key] = _Flight()
+                self.leaders += 1
+                leader = True
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        do()의 비동기 버전.
+        - 실제 호출은 flight가 소유한 태스크로 실행하고, 처음 부른 쪽과 대기자 모두 shield로 기다린다.
+          어느 호출자가 취소되어도 호출은 끝까지 진행되고 나머지는 결과를 받는다.
+        - 태스크는 처음 부른 쪽의 컨텍스트(우선순위/관찰자/trace)를 복사해 실행한다.
+        """
+        if not self.enabled:
+            return await fn()
+        loop = asyncio.get_running_loop()
+        slot = (id(loop), key)
+        with self._lock:
+            task = self._async_flights.get(slot)
+            if task is not None:
+                self.shared += 1
+            else:
+                task = self._async_flights[slot] = loop.create_task(fn())
+                task.add_done_callback(lambda t: self._land(slot, t))
+                self.leaders += 1
+        return await asyncio.shield(task)
+
+    def _land(self, slot: Tuple[int, str], task: asyncio.Task) -> None:
+        with self._lock:
+            if self._async_flights.get(slot) is task:
+                del self._async_flights[slot]
+        # 기다리던 호출자가 모두 취소됐을 때 'exception was never retrieved' 경고를 막는다
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.leaders + self.shared
+            return {
+                "enabled": self.enabled,
+                "in_flight": len(self._flights) + len(self._async_flights),
+                "upstream_calls": self.leaders,
+                "coalesced": self.shared,
+                "coalesced_ratio": round(self.shared / total, 4) if total else 0.0,
+            }
+
+
+# -------- 프로세스 공용 인스턴스 --------
+_flights: Optional[SingleFlight] = None
+_flights_lock = threading.Lock()
+
+def get_single_flight() -> SingleFlight:
+    """
+    동기/비동기 서비스가 함께 쓰는 공용 인스턴스(REST와 LLM 툴 경로의 중복 조회를 함께 합친다).
+    """
+    global _flights
+    if _flights is None:
+        with _flights_lock:
+            if _flights is None:
+                _flights = SingleFlight.from_settings(get_settings())
+    return _flights
+
+@on_settings_change
+def _apply_settings(old: Settings, new: Settings) -> None:
+    if _flights is not None:
+        _flights.apply_settings(new)
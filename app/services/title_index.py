@@ -0,0 +1,242 @@
+"""
+역할 :
+- Tasks 제목('할 일') → page_id 로컬 인덱스
+- resolve_task_id가 매번 equals/contains 두 번의 Notion 조회를 하지 않도록,
+  인덱스를 last_edited_time 기준으로 증분 갱신하고 대부분의 해석을 네트워크 없이 처리한다.
+- 매칭 단계: 원문 일치 → 정규화 일치 → 공백 무시 일치 → 접두 → 부분 문자열
+  (정규화: Unicode NFC, 대소문자 무시, 공백 접기, 감싸는 따옴표 제거)
+- 한국어 특성: 띄어쓰기 차이('보고서 작성' vs '보고서작성')와 끝 조사('보고서를')를 허용
+- Notion query는 아카이브된 페이지를 돌려주지 않아 증분 갱신으로는 UI에서 지운 페이지가 남는다.
+  rebuild_sec마다 전체를 다시 받아 재구성하고, 그 사이에는 쓰기가 404/아카이브 오류를 받으면 서비스가 remove()한다.
+"""
+
+from __future__ import annotations
+import re
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+from app.core.config import Settings, get_settings, on_settings_change
+from app.services.schema import PROP_TITLE
+
+_WS = re.compile(r"\s+")
+_QUOTES = "\"'`“”‘’「」『』《》〈〉"
+# 제목 뒤에 붙어 올 수 있는 흔한 조사(긴 것부터)
+_PARTICLE = re.compile(r"(으로|에서|에게|까지|부터|을|를|은|는|이|가|의|도|로|와|과)$")
+
+
+def normalize_title(text: str) -> str:
+    """
+    NFC + casefold + 공백 접기 + 감싸는 따옴표 제거.
+    """
+    text = unicodedata.normalize("NFC", text).strip().strip(_QUOTES).strip()
+    return _WS.sub(" ", text).casefold()
+
+
+def compact_title(text: str) -> str:
+    """
+    정규화 후 공백을 모두 제거한 키(한국어 띄어쓰기 차이 흡수).
+    """
+    return normalize_title(text).replace(" ", "")
+
+
+def page_title(page: Dict[str, Any]) -> str:
+    title_items = (page.get("properties", {}).get(PROP_TITLE) or {}).get("title", [])
+    return "".join([item.get("plain_text") or (item.get("text") or {}).get("content", "") for item in title_items])
+
+
+class TitleIndex:
+    """
+    page_id → (제목, last_edited_time) 인덱스와 정규화 키 역색인.
+    - refresh_sec: 이 시간 안에 갱신한 적이 있으면 네트워크 없이 인덱스만으로 해석
+    - rebuild_sec: 이 시간이 지나면 다음 갱신은 증분 대신 전체 재구성(0이면 첫 적재 후 안 함)
+    - watermark: 갱신(refresh/replace)으로 본 가장 큰 last_edited_time(증분 조회 기준).
+      쓰기 응답/검색 결과를 apply()해도 올라가지 않는다(그 사이 다른 곳의 수정분을 건너뛰지 않도록).
+    """
+
+    def __init__(self, refresh_sec: float = 30.0, rebuild_sec: float = 600.0) -> None:
+        self.refresh_sec = refresh_sec
+        self.rebuild_sec = rebuild_sec
+        self._pages: Dict[str, Tuple[str, str]] = {}
+        self._by_title: Dict[str, Set[str]] = {}
+        self._by_norm: Dict[str, Set[str]] = {}
+        self._by_compact: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.refresh_lock = threading.Lock()  # 동기 서비스의 중복 갱신 방지용
+        self.watermark: Optional[str] = None
+        self.loaded = False
+        self.last_refresh = 0.0
+        self.last_rebuild = 0.0
+        self.local_hits = 0
+        self.local_misses = 0
+        self.refreshes = 0
+        self.rebuilds = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "TitleIndex":
+        return cls(refresh_sec=settings.title_index_refresh_sec, rebuild_sec=settings.title_index_rebuild_sec)
+
+    def apply_settings(self, settings: Settings) -> None:
+        self.refresh_sec = settings.title_index_refresh_sec
+        self.rebuild_sec = settings.title_index_rebuild_sec
+
+    # -------- 갱신 --------
+    def needs_refresh(self) -> bool:
+        return not self.loaded or time.monotonic() - self.last_refresh >= self.refresh_sec
+
+    def rebuild_due(self) -> bool:
+        """
+        다음 갱신을 전체 재구성으로 해야 하는지(첫 적재 또는 rebuild_sec 경과).
+        """
+        if not self.loaded:
+            return True
+        return self.rebuild_sec > 0 and time.monotonic() - self.last_rebuild >= self.rebuild_sec
+
+    def delta_query(self, full: bool = False) -> Dict[str, Any]:
+        """
+        다음 갱신에 쓸 databases.query 본문. 첫 적재/full이면 전체, 이후는 watermark 이후 수정분만.
+        - Notion의 last_edited_time은 분 단위라 on_or_after로 경계 페이지를 다시 받아도 멱등하다.
+        """
+        body: Dict[str, Any] = {
+            "page_size": 100,
+            "sorts": [{"timestamp": "last_edited_time", "direction": "ascending"}],
+        }
+        if not full and self.loaded and self.watermark:
+            body["filter"] = {
+                "timestamp": "last_edited_time",
+                "last_edited_time": {"on_or_after": self.watermark},
+            }
+        return body
+
+    def mark_refreshed(self, full: bool = False) -> None:
+        self.loaded = True
+        self.last_refresh = time.monotonic()
+        self.refreshes += 1
+        if full:
+            self.last_rebuild = self.last_refresh
+            self.rebuilds += 1
+
+    def replace(self, pages: Iterable[Dict[str, Any]]) -> None:
+        """
+        전체 조회 결과로 인덱스를 새로 만든다(결과에 없는 페이지 = 아카이브/삭제된 페이지는 빠진다).
+        """
+        with self._lock:
+            self._pages.clear()
+            self._by_title.clear()
+            self._by_norm.clear()
+            self._by_compact.clear()
+            self._apply_locked(pages, advance_watermark=True)
+
+    def apply(self, pages: Iterable[Dict[str, Any]], advance_watermark: bool = False) -> None:
+        """
+        페이지 목록을 반영한다(아카이브/휴지통 페이지는 제거).
+        - advance_watermark: 증분 갱신 결과일 때만 True
+        """
+        with self._lock:
+            self._apply_locked(pages, advance_watermark)
+
+    def _apply_locked(self, pages: Iterable[Dict[str, Any]], advance_watermark: bool = False) -> None:
+        for page in pages:
+            page_id = page.get("id")
+            if not page_id:
+                continue
+            self._remove_locked(page_id)
+            edited = page.get("last_edited_time") or ""
+            if advance_watermark and edited and (self.watermark is None or edited > self.watermark):
+                self.watermark = edited
+            if page.get("archived") or page.get("in_trash"):
+                continue
+            title = page_title(page)
+            self._pages[page_id] = (title, edited)
+            self._by_title.setdefault(title, set()).add(page_id)
+            self._by_norm.setdefault(normalize_title(title), set()).add(page_id)
+            self._by_compact.setdefault(compact_title(title), set()).add(page_id)
+
+    def remove(self, page_id: str) -> None:
+        with self._lock:
+            self._remove_locked(page_id)
+
+    def _remove_locked(self, page_id: str) -> None:
+        old = self._pages.pop(page_id, None)
+        if old is None:
+            return
+        title = old[0]
+        for store, key in (
+            (self._by_title, title),
+            (self._by_norm, normalize_title(title)),
+            (self._by_compact, compact_title(title)),
+        ):
+            ids = store.get(key)
+            if ids is not None:
+                ids.discard(page_id)
+                if not ids:
+                    del store[key]
+
+    # -------- 조회 --------
+    def _latest(self, ids: Iterable[str]) -> Optional[str]:
+        # 후보가 여럿이면 가장 최근 수정된 페이지
+        return max(ids, key=lambda i: self._pages[i][1], default=None)
+
+    def _lookup_locked(self, ref: str) -> Optional[str]:
+        norm, compact = normalize_title(ref), compact_title(ref)
+        if not compact:
+            return None
+        for store, key in ((self._by_title, ref), (self._by_norm, norm), (self._by_compact, compact)):
+            ids = store.get(key)
+            if ids:
+                return self._latest(ids)
+        prefix = [i for k, ids in self._by_compact.items() if k.startswith(compact) for i in ids]
+        if prefix:
+            return self._latest(prefix)
+        contains = [i for k, ids in self._by_compact.items() if compact in k for i in ids]
+        return self._latest(contains)
+
+    def lookup(self, ref: str) -> Optional[str]:
+        """
+        제목 참조를 page_id로 해석한다(없으면 None). 끝 조사를 뗀 형태도 한 번 더 시도한다.
+        """
+        with self._lock:
+            page_id = self._lookup_locked(ref)
+            if page_id is None:
+                stripped = _PARTICLE.sub("", normalize_title(ref))
+                if stripped and stripped != normalize_title(ref):
+                    page_id = self._lookup_locked(stripped)
+            if page_id is None:
+                self.local_misses += 1
+            else:
+                self.local_hits += 1
+            return page_id
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._pages),
+                "loaded": self.loaded,
+                "watermark": self.watermark,
+                "refresh_sec": self.refresh_sec,
+                "refreshes": self.refreshes,
+                "rebuilds": self.rebuilds,
+                "local_hits": self.local_hits,
+                "local_misses": self.local_misses,
+            }
+
+
+# -------- 프로세스 공용 인스턴스 --------
+_index: Optional[TitleIndex] = None
+_index_lock = threading.Lock()
+
+def get_title_index() -> TitleIndex:
+    """
+    동기/비동기 서비스가 함께 쓰는 프로세스 공용 제목 인덱스를 반환한다.
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = TitleIndex.from_settings(get_settings())
+    return _index
+
+@on_settings_change
+def _apply_settings(old: Settings, new: Settings) -> None:
+    if _index is not None:
+        _index.apply_settings(new)
@@ -0,0 +1,310 @@
+"""
+역할 :
+- Task 쓰기(create/update/complete/archive)의 지연 쓰기(write-behind) 큐
+- 요청은 SQLite 저널에 먼저 기록하고 op_id로 즉시 응답한다(API 지연이 Notion 지연과 무관).
+- 백그라운드 워커가 저널을 묶음 단위로 꺼내 Notion에 반영한다.
+  * 같은 task_id의 작업은 저널 순서대로 하나씩(앞 작업이 끝나거나 실패할 때까지 뒤 작업 대기)
+  * 호출은 서비스 경유 → 공용 리미터(BULK 우선순위)/429 재시도 적용
+  * 일시적 오류(네트워크/5xx/429 잔여)는 지수 백오프로 WRITE_MAX_ATTEMPTS까지 재시도,
+    입력/스키마 오류와 4xx는 즉시 failed
+  * 단, create는 429에서만 재시도한다. 타임아웃/네트워크/5xx는 Notion에 이미 만들어졌을 수 있어 review로 둔다.
+- 작업 형식은 NotionTaskService.batch와 같다: {"op": "create"|"update"|"complete"|"archive", ...}
+- 프로세스가 반영 도중 죽으면 running 상태였던 작업은 재기동 시 다음처럼 처리한다.
+  * update/complete/archive: pages.update는 멱등이므로 다시 pending
+  * create: Notion에 이미 만들어졌을 수 있어(pages.create는 멱등이 아님) 다시 보내지 않고 review로 둔다.
+    운영자가 Notion에서 생성 여부를 확인한 뒤 requeue(POST /ops/{op_id}/retry)하거나 그대로 둔다.
+"""
+
+from __future__ import annotations
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+from notion_client.errors import APIResponseError
+from app.core.config import Settings, get_settings
+from app.services.notion_service import AsyncNotionTaskService, operation_call
+from app.services.ratelimit import BULK, request_priority
+from app.services.records import project_page
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+REVIEW = "review"  # 반영 여부를 알 수 없는 create: 중복 생성을 피하려고 자동 재시도하지 않음
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ops (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    op_id TEXT NOT NULL UNIQUE,
+    op_json TEXT NOT NULL,
+    task_id TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    result_json TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_ops_status ON ops(status, seq);
+"""
+
+
+def _permanent(error: Exception) -> bool:
+    # 재시도해도 결과가 같은 오류(입력/스키마 오류, 429를 제외한 4xx)
+    if isinstance(error, ValueError):
+        return True
+    return isinstance(error, APIResponseError) and 400 <= error.status < 500 and error.status != 429
+
+def _maybe_applied(op: Dict[str, Any], error: Exception) -> bool:
+    # 429는 요청이 처리되지 않았다는 뜻이지만, 타임아웃/연결 끊김/5xx 뒤의 create는 이미 만들어졌을 수 있다
+    rate_limited = isinstance(error, APIResponseError) and error.status == 429
+    return op.get("op") == "create" and not rate_limited and not _permanent(error)
+
+
+class WriteQueue:
+    """
+    SQLite 저널 기반 쓰기 큐. 연결 하나를 락으로 보호해 요청 처리/워커가 공유한다.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 20,
+        max_attempts: int = 5,
+        backoff_base_sec: float = 0.5,
+        backoff_max_sec: float = 30.0,
+    ) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_base_sec = backoff_base_sec
+        self.backoff_max_sec = backoff_max_sec
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._recover_interrupted()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "WriteQueue":
+        return cls(
+            settings.write_journal_path,
+            batch_size=settings.write_batch_size,
+            max_attempts=settings.write_max_attempts,
+            backoff_base_sec=settings.notion_backoff_base_sec,
+            backoff_max_sec=settings.notion_backoff_max_sec,
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _recover_interrupted(self) -> None:
+        # 이전 프로세스가 반영 도중 종료된 작업: 멱등한 수정은 다시 대기열로, create는 수동 확인 대상으로
+        now = time.time()
+        with self._lock, self._conn:
+            rows = self._conn.execute("SELECT op_id, op_json FROM ops WHERE status = ?", (RUNNING,)).fetchall()
+            for op_id, op_json in rows:
+                if json.loads(op_json).get("op") == "create":
+                    self._conn.execute(
+                        "UPDATE ops SET status = ?, error = ?, updated_at = ? WHERE op_id = ?",
+                        (REVIEW, "반영 도중 프로세스가 종료됨: Notion에서 생성 여부를 확인한 뒤 재시도하세요.", now, op_id),
+                    )
+                else:
+                    self._conn.execute("UPDATE ops SET status = ?, updated_at = ? WHERE op_id = ?", (PENDING, now, op_id))
+
+    def requeue(self, op_id: str) -> Optional[Dict[str, Any]]:
+        """
+        review/failed 작업을 다시 pending으로 돌린다(운영자 확인 후). 없는 작업이면 None,
+        그 밖의 상태면 ValueError.
+        """
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT status FROM ops WHERE op_id = ?", (op_id,)).fetchone()
+            if row is None:
+                return None
+            if row[0] not in (REVIEW, FAILED):
+                raise ValueError(f"{row[0]} 상태의 작업은 다시 넣을 수 없습니다(review/failed만 가능).")
+            self._conn.execute(
+                "UPDATE ops SET status = ?, next_attempt_at = 0, updated_at = ? WHERE op_id = ?",
+                (PENDING, time.time(), op_id),
+            )
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return {"op_id": op_id, "status": PENDING}
+
+    # -------- 기록 --------
+    def enqueue(self, op: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        작업을 저널에 기록하고 {op_id, status}를 반환한다(형식 오류는 ValueError).
+        """
+        operation_call(None, op)  # 필수 필드/작업 종류 검사(호출은 하지 않음)
+        op_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO ops(op_id, op_json, task_id, status, created_at, updated_at) VALUES(?, ?, ?, ?, ?, ?)",
+                (op_id, json.dumps(op, ensure_ascii=False), op.get("task_id"), PENDING, now, now),
+            )
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return {"op_id": op_id, "status": PENDING}
+
+    def _claim(self) -> List[tuple]:
+        """
+        지금 실행할 작업을 골라 running으로 표시한다. task_id마다 가장 앞선 미완료 작업 하나만.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT seq, op_id, op_json, task_id, next_attempt_at FROM ops WHERE status = ? ORDER BY seq",
+                (PENDING,),
+            ).fetchall()
+            blocked = {r[0] for r in self._conn.execute("SELECT task_id FROM ops WHERE status = ?", (RUNNING,))}
+            claimed: List[tuple] = []
+            for seq, op_id, op_json, task_id, next_at in rows:
+                if len(claimed) >= self.batch_size:
+                    break
+                if task_id is not None and task_id in blocked:
+                    continue
+                if task_id is not None:
+                    blocked.add(task_id)
+                if next_at > now:
+                    continue
+                claimed.append((op_id, json.loads(op_json)))
+            self._conn.executemany(
+                "UPDATE ops SET status = ?, updated_at = ? WHERE op_id = ?",
+                [(RUNNING, now, op_id) for op_id, _ in claimed],
+            )
+        return claimed
+
+    def _finish(self, op_id: str, result: Any = None, error: Optional[Exception] = None) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            if error is None:
+                self._conn.execute(
+                    "UPDATE ops SET status = ?, attempts = attempts + 1, result_json = ?, error = NULL, updated_at = ? "
+                    "WHERE op_id = ?",
+                    (DONE, json.dumps(project_page(result), ensure_ascii=False, default=str), now, op_id),
+                )
+                return
+            attempts, op_json = self._conn.execute(
+                "SELECT attempts, op_json FROM ops WHERE op_id = ?", (op_id,)
+            ).fetchone()
+            attempts += 1
+            message = f"{type(error).__name__}: {error}"
+            if _maybe_applied(json.loads(op_json), error):
+                status, retry = REVIEW, False
+                message += " (Notion에서 생성 여부를 확인한 뒤 재시도하세요)"
+            else:
+                retry = not _permanent(error) and attempts < self.max_attempts
+                status = PENDING if retry else FAILED
+            delay = min(self.backoff_max_sec, self.backoff_base_sec * (2 ** (attempts - 1)))
+            self._conn.execute(
+                "UPDATE ops SET status = ?, attempts = ?, next_attempt_at = ?, error = ?, updated_at = ? WHERE op_id = ?",
+                (status, attempts, now + delay if retry else 0, message, now, op_id),
+            )
+
+    # -------- 워커 --------
+    async def flush(self, svc: AsyncNotionTaskService, concurrency: int = 4) -> int:
+        """
+        지금 실행 가능한 작업을 한 묶음 반영한다. 처리한 작업 수를 반환.
+        """
+        claimed = self._claim()
+        if not claimed:
+            return 0
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def apply(op_id: str, op: Dict[str, Any]) -> None:
+            with request_priority(BULK):
+                try:
+                    async with semaphore:
+                        result = await operation_call(svc, op)()
+                except Exception as e:
+                    self._finish(op_id, error=e)
+                else:
+                    self._finish(op_id, result)
+
+        await asyncio.gather(*(apply(op_id, op) for op_id, op in claimed))
+        return len(claimed)
+
+    async def run(self, svc: AsyncNotionTaskService, interval_sec: float, concurrency: int = 4) -> None:
+        """
+        FastAPI 백그라운드 태스크: 새 작업이 들어오거나 interval_sec가 지나면 플러시.
+        """
+        self._wakeup = asyncio.Event()
+        while True:
+            try:
+                if await self.flush(svc, concurrency):
+                    continue  # 밀린 작업이 더 있을 수 있으니 바로 다음 묶음
+            except Exception as e:
+                print(f"[write-queue] flush 실패: {e}")
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=interval_sec)
+            except asyncio.TimeoutError:
+                pass
+
+    # -------- 조회 --------
+    def get(self, op_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT op_id, op_json, status, attempts, result_json, error, created_at, updated_at "
+                "FROM ops WHERE op_id = ?",
+                (op_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "op_id": row[0],
+            "op": json.loads(row[1]),
+            "status": row[2],
+            "attempts": row[3],
+            "result": json.loads(row[4]) if row[4] else None,
+            "error": row[5],
+            "created_at": row[6],
+            "updated_at": row[7],
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM ops GROUP BY status").fetchall())
+            oldest = self._conn.execute("SELECT MIN(created_at) FROM ops WHERE status = ?", (PENDING,)).fetchone()[0]
+        return {
+            "path": self.path,
+            **{s: counts.get(s, 0) for s in (PENDING, RUNNING, DONE, FAILED, REVIEW)},
+            "oldest_pending_age_sec": round(time.time() - oldest, 2) if oldest else None,
+        }
+
+
+# -------- 프로세스 공용 인스턴스 --------
+_queue: Optional[WriteQueue] = None
+_queue_lock = threading.Lock()
+
+def get_write_queue() -> Optional[WriteQueue]:
+    """
+    설정(WRITE_JOURNAL_PATH)이 있으면 공용 쓰기 큐를 반환한다. 비어 있으면 None(지연 쓰기 비활성).
+    """
+    global _queue
+    settings = get_settings()
+    if not settings.write_journal_path:
+        return None
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = WriteQueue.from_settings(settings)
+    return _queue
+
+def close_write_queue() -> None:
+    """
+    공용 쓰기 큐의 SQLite 연결을 닫고 참조를 해제한다(앱 종료 시, 워커를 멈춘 뒤).
+    """
+    global _queue
+    with _queue_lock:
+        if _queue is not None:
+            _queue.close()
+            _queue = None
@@ -0,0 +1,4 @@
+"""
+역할 :
+- 로컬 가짜 Notion 서버 등을 이용한 성능 측정 스크립트 모음(실제 자격증명 불필요)
+"""
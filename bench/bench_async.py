@@ -0,0 +1,75 @@
+"""
+bench/bench_async.py
+
+역할:
+- 느린 Notion(응답 지연)을 가정하고, 동기 서비스 + 스레드풀(FastAPI sync 핸들러와 동일한 구조)과
+  비동기 서비스 + 이벤트 루프 하나의 동시 처리 한계를 비교하는 부하 테스트.
+- 스레드풀 크기(--threads, 기본 40 = Starlette 기본 스레드풀 한도)가 동기 경로의 동시성 상한이 된다.
+- 참고: 수백 개 연결을 동시에 여는 구간에서는 httpcore 풀 관리 비용이 커지므로
+  비동기 쪽 'in flight' 값이 요청 수보다 작게 나올 수 있다.
+
+실행:
+    python -m bench.bench_async --requests 150 --latency-ms 1000
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import dataclasses
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.notion_service import AsyncNotionTaskService, NotionTaskService
+from bench.bench_pool import bench_settings
+from bench.fake_notion import FakeNotionServer
+
+
+def run_sync(svc: NotionTaskService, total: int, threads: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda _: svc.list_tasks(page_size=10), range(total)))
+    return time.perf_counter() - start
+
+
+async def run_async(svc: AsyncNotionTaskService, total: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(svc.list_tasks(page_size=10) for _ in range(total)))
+    elapsed = time.perf_counter() - start
+    await svc.aclose()
+    return elapsed
+
+
+def report(label: str, total: int, elapsed: float, latency_ms: float) -> None:
+    # 리틀의 법칙: 평균 동시 처리량 = 처리율 x 지연
+    in_flight = total / elapsed * latency_ms / 1000
+    print(f"{label:<24} {elapsed:7.3f}s  {total / elapsed:8.1f} req/s  ~{in_flight:6.1f} in flight")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=150)
+    parser.add_argument("--latency-ms", type=float, default=1000.0)
+    parser.add_argument("--threads", type=int, default=40)
+    args = parser.parse_args()
+
+    server = FakeNotionServer(latency_ms=args.latency_ms, page_count=20).start()
+    # 풀 한도가 동시성을 막지 않도록 요청 수만큼 연결을 허용
+    settings = dataclasses.replace(
+        bench_settings(server.base_url),
+        notion_pool_max_connections=args.requests,
+        notion_pool_max_keepalive=args.requests,
+    )
+    try:
+        sync_svc = NotionTaskService(settings)
+        elapsed = run_sync(sync_svc, args.requests, args.threads)
+        sync_svc.close()
+        report(f"sync ({args.threads} threads)", args.requests, elapsed, args.latency_ms)
+
+        elapsed = asyncio.run(run_async(AsyncNotionTaskService(settings), args.requests))
+        report("async (1 event loop)", args.requests, elapsed, args.latency_ms)
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+bench/bench_dates.py
+
+역할:
+- normalize_korean_relative_dates의 표현별 기대값 표(CORPUS, tests/test_time.py)를 검증하고,
+  이전 구현(키워드별 re.sub 4회, legacy)과 호출당 시간을 비교한다.
+- 기준일은 2025-10-15(수요일)로 고정한다.
+
+실행:
+    python -m bench.bench_dates --iterations 20000
+"""
+
+from __future__ import annotations
+import argparse
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+
+from app.core.time import normalize_korean_relative_dates
+from tests.test_time import CORPUS, TODAY
+
+
+def legacy(text: str, base: str) -> str:
+    # 이전 구현: 호출마다 dict 구성 + 키워드별 re.sub(오늘/내일/모레/어제만 지원)
+    base_dt = datetime.fromisoformat(base)
+    repl = {
+        "오늘": base_dt,
+        "내일": base_dt + timedelta(days=1),
+        "모레": base_dt + timedelta(days=2),
+        "어제": base_dt - timedelta(days=1),
+    }
+    out = text
+    for key, dt in repl.items():
+        out = re.sub(key, dt.strftime("%Y-%m-%d"), out)
+    return out
+
+
+def check() -> int:
+    failed = 0
+    for text, expected in CORPUS:
+        got = normalize_korean_relative_dates(text, today=TODAY)
+        if got != expected:
+            failed += 1
+            print(f"FAIL {text!r}: {got!r} != {expected!r}")
+    print(f"corpus: {len(CORPUS) - failed}/{len(CORPUS)} ok")
+    return failed
+
+
+def timeit(label: str, fn, iterations: int) -> float:
+    texts = [t for t, _ in CORPUS]
+    start = time.perf_counter()
+    for _ in range(iterations // len(texts) + 1):
+        for t in texts:
+            fn(t)
+    per_call = (time.perf_counter() - start) / ((iterations // len(texts) + 1) * len(texts))
+    print(f"{label:8s} {per_call * 1e6:8.2f} µs/call")
+    return per_call
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="한국어 상대 날짜 정규화 검증/마이크로벤치")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    failed = check()
+    before = timeit("legacy", lambda t: legacy(t, TODAY), args.iterations)
+    after = timeit("current", lambda t: normalize_korean_relative_dates(t, today=TODAY), args.iterations)
+    print(f"speedup  x{before / after:.2f}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
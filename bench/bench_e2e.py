@@ -0,0 +1,263 @@
+"""
+bench/bench_e2e.py
+
+역할:
+- 자격증명 없이 FastAPI 앱 전체를 끝까지 실행하는 오프라인 벤치마크.
+  * Notion: 프로세스 안의 가짜 서버(bench.fake_notion; 지연/429 주입/페이지 수/픽스처)
+  * LLM: 각본 채팅 모델(bench.fake_llm)을 chains.set_llm_factory()로 주입
+  * 요청: httpx.ASGITransport로 앱에 직접(lifespan 포함), 툴은 ainvoke로 직접 호출
+- 시나리오(엔드포인트)별 처리량과 p50/p95/p99 지연, 요청당 Notion 호출 수/429 수를 JSON으로 저장해
+  커밋 간 비교한다(--compare 이전 결과.json).
+- 앱 설정은 import 시점에 환경변수에서 읽히므로 app 모듈은 환경변수를 맞춘 뒤에 import한다.
+  결정 캐시는 기본으로 끈다(같은 지시가 반복돼 LLM 경로가 측정되지 않는 것을 막음, --decision-cache로 켬).
+
+실행:
+    python -m bench.bench_e2e --requests 200 --concurrency 8 --notion-latency-ms 20 --llm-latency-ms 300
+    python -m bench.bench_e2e --only list,agent_llm --compare bench/results/e2e-abc1234.json
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from bench.fake_notion import FAKE_DB_ID, FakeNotionServer
+from bench.fake_llm import ScriptedChatModel
+
+# 시나리오 이름 → (설명, 요청 i번째를 만드는 함수(i, [(page_id, 제목)])).
+# 함수는 ("http", method, path, json) 또는 ("tool", 툴 이름, args)를 돌려준다.
+Request = Tuple[Any, ...]
+Scenario = Callable[[int, List[Tuple[str, str]]], Request]
+
+def _title(pages: List[Tuple[str, str]], i: int) -> str:
+    return pages[i % len(pages)][1]
+
+SCENARIOS: Dict[str, Tuple[str, Scenario]] = {
+    "list": ("GET /tasks/list", lambda i, pages: ("http", "GET", "/v1/notion/tasks/list?page_size=10", None)),
+    "list_filtered": ("GET /tasks/list (필터/정렬/필드)", lambda i, pages: (
+        "http", "GET", "/v1/notion/tasks/list?status=시작 전&sort=-date,title&fields=title,status", None,
+    )),
+    "create": ("POST /tasks/create", lambda i, pages: (
+        "http", "POST", "/v1/notion/tasks/create", {"title": f"bench {i}"},
+    )),
+    "complete": ("POST /tasks/complete", lambda i, pages: (
+        "http", "POST", "/v1/notion/tasks/complete", {"task_id": pages[i % len(pages)][0]},
+    )),
+    "agent_fast": ("POST /agent (fast-path)", lambda i, pages: (
+        "http", "POST", "/v1/notion/agent", {"text": f"'{_title(pages, i)}' 완료 처리해줘"},
+    )),
+    "agent_llm": ("POST /agent (LLM 경로)", lambda i, pages: (
+        "http", "POST", "/v1/notion/agent", {"text": f"'{_title(pages, i)}' 이거 끝냈어"},
+    )),
+    "agent_plan": ("POST /agent mode=plan (2개 동시)", lambda i, pages: (
+        "http", "POST", "/v1/notion/agent",
+        {"text": f"'{_title(pages, i)}', '{_title(pages, i + 1)}' 다 완료 처리해줘", "mode": "plan"},
+    )),
+    "tool_list": ("list_tasks_tool.ainvoke", lambda i, pages: ("tool", "list_tasks_tool", {"page_size": 10})),
+}
+
+
+def _bench_env(server: FakeNotionServer, args: argparse.Namespace) -> Dict[str, str]:
+    return {
+        "NOTION_TOKEN": "bench-token",
+        "NOTION_TASKS_DB_ID": FAKE_DB_ID,
+        "NOTION_BASE_URL": server.base_url,
+        "NOTION_RATE_PER_SEC": str(args.notion_rate),
+        "NOTION_BACKOFF_BASE_SEC": "0.05",
+        "GOOGLE_API_KEY": "bench",
+        "TASK_CACHE_TTL_SEC": str(args.cache_ttl),
+        "AGENT_CACHE_TTL_SEC": "3600" if args.decision_cache else "0",
+        "MIRROR_DB_PATH": "",
+        "WRITE_JOURNAL_PATH": "",
+        "CHANGE_FEED_POLL_SEC": "0",
+    }
+
+
+def percentile(values: List[float], pct: float) -> float:
+    # nearest-rank
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[rank - 1]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_scenario(
+    send: Callable[[Request], Awaitable[bool]],
+    build: Scenario,
+    pages: List[Tuple[str, str]],
+    server: FakeNotionServer,
+    total: int,
+    concurrency: int,
+    warmup: int,
+) -> Dict[str, Any]:
+    for i in range(warmup):
+        await send(build(total + i, pages))
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+    notion_before, limited_before = server.request_count, server.rate_limited_count
+
+    async def one(i: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            t0 = time.perf_counter()
+            ok = await send(build(i, pages))
+            latencies.append((time.perf_counter() - t0) * 1000)
+            errors += 0 if ok else 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": errors,
+        "elapsed_sec": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 2),
+        "mean_ms": round(sum(latencies) / len(latencies), 2),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(max(latencies), 2),
+        "notion_calls_per_req": round((server.request_count - notion_before) / total, 2),
+        "rate_limited": server.rate_limited_count - limited_before,
+    }
+
+
+async def run_all(args: argparse.Namespace, server: FakeNotionServer, names: List[str]) -> Dict[str, Any]:
+    import httpx
+    from app.llm.chains import set_llm_factory
+    from app.llm.tools import get_tools
+    from app.main import app
+
+    set_llm_factory(lambda model: ScriptedChatModel(latency_ms=args.llm_latency_ms))
+    tools = {t.name: t for t in get_tools()}
+    pages = sorted(
+        (p["id"], "".join(t["plain_text"] for t in p["properties"]["할 일"]["title"]))
+        for p in server.pages.values() if not p.get("archived")
+    )[: max(1, args.titles)]
+
+    results: Dict[str, Any] = {}
+    async with contextlib.AsyncExitStack() as stack:
+        # lifespan(공용 서비스 생성)이 설정을 출력하므로 기동 로그는 버린다
+        with contextlib.redirect_stdout(io.StringIO()):
+            await stack.enter_async_context(app.router.lifespan_context(app))
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+
+            async def send(req: Request) -> bool:
+                try:
+                    if req[0] == "tool":
+                        out = await tools[req[1]].ainvoke(req[2])
+                        return not isinstance(out, dict) or out.get("ok", True)
+                    resp = await client.request(req[1], req[2], json=req[3])
+                    return resp.status_code < 400 and resp.json().get("ok", True) is not False
+                except Exception:
+                    return False
+
+            for name in names:
+                label, build = SCENARIOS[name]
+                results[name] = {"label": label, **await run_scenario(
+                    send, build, pages, server, args.requests, args.concurrency, args.warmup,
+                )}
+                r = results[name]
+                print(
+                    f"{name:<14} {r['throughput_rps']:8.1f} req/s  p50 {r['p50_ms']:8.1f}  p95 {r['p95_ms']:8.1f}  "
+                    f"p99 {r['p99_ms']:8.1f} ms  notion/req {r['notion_calls_per_req']:5.2f}  "
+                    f"429 {r['rate_limited']:3d}  err {r['errors']}"
+                )
+    set_llm_factory(None)
+    return results
+
+
+def compare(current: Dict[str, Any], path: str) -> None:
+    with open(path, encoding="utf-8") as f:
+        previous = json.load(f)
+    print(f"\n비교 기준: {path} (commit {previous.get('meta', {}).get('commit')})")
+    for name, now in current["scenarios"].items():
+        before = previous.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        deltas = []
+        for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            if before[key]:
+                deltas.append(f"{key} {(now[key] - before[key]) / before[key] * 100:+6.1f}%")
+        print(f"{name:<14} " + "  ".join(deltas))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="오프라인 E2E 벤치마크(가짜 Notion + 각본 LLM)")
+    parser.add_argument("--requests", type=int, default=100, help="시나리오별 측정 요청 수")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--only", default="", help="쉼표로 구분한 시나리오 이름(기본: 전체)")
+    parser.add_argument("--notion-latency-ms", type=float, default=20.0)
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0)
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="가짜 Notion 429 주입 확률")
+    parser.add_argument("--notion-rate", type=float, default=0.0, help="NOTION_RATE_PER_SEC(0이면 리미터 비활성)")
+    parser.add_argument("--page-count", type=int, default=200)
+    parser.add_argument("--titles", type=int, default=50, help="complete/agent 시나리오가 돌아가며 쓸 Task 수")
+    parser.add_argument("--fixture", help="기록한 픽스처 JSON(bench.fake_notion --record)")
+    parser.add_argument("--cache-ttl", type=float, default=30.0, help="TASK_CACHE_TTL_SEC")
+    parser.add_argument("--decision-cache", action="store_true", help="LLM 결정 캐시 사용")
+    parser.add_argument("--out", help="결과 JSON 경로(기본: bench/results/e2e-<commit>.json)")
+    parser.add_argument("--compare", help="이전 결과 JSON과 비교")
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.only.split(",") if n.strip()] or list(SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"알 수 없는 시나리오: {unknown} (가능: {', '.join(SCENARIOS)})")
+
+    server = FakeNotionServer(
+        latency_ms=args.notion_latency_ms,
+        page_count=args.page_count,
+        rate_limit_ratio=args.rate_limit_ratio,
+        fixture=args.fixture,
+    ).start()
+    os.environ.update(_bench_env(server, args))
+    try:
+        scenarios = asyncio.run(run_all(args, server, names))
+    finally:
+        server.stop()
+
+    commit = _git_commit()
+    result = {
+        "meta": {
+            "commit": commit,
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "args": vars(args),
+        },
+        "scenarios": scenarios,
+    }
+    out = args.out or os.path.join("bench", "results", f"e2e-{commit or 'local'}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"\n저장: {out}")
+    if args.compare:
+        compare(result, args.compare)
+
+
+if __name__ == "__main__":
+    main()
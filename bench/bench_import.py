@@ -0,0 +1,172 @@
+"""
+bench/bench_import.py
+
+역할:
+- 콜드 스타트(import) 시간을 `python -X importtime`으로 측정한다. 매번 새 프로세스에서 실행한다.
+  * rest : import app.main (REST만 쓰는 프로세스, --reload 재기동 비용)
+  * agent: app.main을 불러온 뒤 import app.interface.agent (첫 /agent 요청이 내는 지연 로딩 비용)
+- 대상별 누적 import 시간의 중앙값/최소값, 프로세스 전체 시간, 가장 무거운 최상위 패키지를 보여 주고
+  JSON으로 저장해 커밋 간 비교한다(--compare 이전 결과.json).
+- rest 대상에서 LangChain/Gemini 패키지가 import되면 경고하고, --check면 종료 코드 1로 끝난다(회귀 검사용).
+
+실행:
+    python -m bench.bench_import --runs 7
+    python -m bench.bench_import --check --compare bench/results/import-abc1234.json
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+# 대상 이름 → (실행할 코드, 시간을 잴 모듈)
+TARGETS: Dict[str, Tuple[str, str]] = {
+    "rest": ("import app.main", "app.main"),
+    "agent": ("import app.main; import app.interface.agent", "app.interface.agent"),
+}
+
+# REST 경로에서 import되면 안 되는 최상위 패키지
+HEAVY_PACKAGES = ("langchain", "langchain_core", "langchain_google_genai", "langsmith", "google")
+
+# 설정 모듈이 import 시점에 읽는 값(없어도 import는 되지만 실제 기동과 같은 조건으로 맞춤)
+_ENV = {"NOTION_TOKEN": "bench-token", "NOTION_TASKS_DB_ID": "bench-db", "GOOGLE_API_KEY": "bench"}
+
+
+def parse_importtime(stderr: str) -> List[Tuple[int, int, int, str]]:
+    """
+    -X importtime 출력 → [(self_us, cumulative_us, 깊이, 모듈)].
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cumulative), depth, name.strip()))
+    return rows
+
+
+def run_once(code: str, module: str) -> Dict[str, Any]:
+    env = {**os.environ, **_ENV}
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env, check=False,
+    )
+    wall_ms = (time.perf_counter() - t0) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"import 실패({code}):\n{proc.stderr[-2000:]}")
+    rows = parse_importtime(proc.stderr)
+    packages: Dict[str, int] = {}
+    for self_us, _, _, name in rows:
+        top = name.split(".")[0]
+        packages[top] = packages.get(top, 0) + self_us
+    return {
+        "import_ms": next((cum / 1000 for _, cum, _, name in rows if name == module), 0.0),
+        "wall_ms": wall_ms,
+        "modules": len(rows),
+        "packages": packages,
+    }
+
+
+def measure(name: str, runs: int, top: int) -> Dict[str, Any]:
+    code, module = TARGETS[name]
+    samples = [run_once(code, module) for _ in range(runs)]
+    imports = [s["import_ms"] for s in samples]
+    walls = [s["wall_ms"] for s in samples]
+    # 패키지별 self 시간은 마지막 실행 기준(순위 확인용)
+    packages = sorted(samples[-1]["packages"].items(), key=lambda kv: kv[1], reverse=True)
+    return {
+        "code": code,
+        "runs": runs,
+        "import_ms_median": round(statistics.median(imports), 1),
+        "import_ms_min": round(min(imports), 1),
+        "wall_ms_median": round(statistics.median(walls), 1),
+        "modules": samples[-1]["modules"],
+        "heavy_loaded": sorted(p for p in samples[-1]["packages"] if p in HEAVY_PACKAGES),
+        "top_packages_ms": {p: round(us / 1000, 1) for p, us in packages[:top]},
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict[str, Any], path: str) -> None:
+    with open(path, encoding="utf-8") as f:
+        previous = json.load(f)
+    print(f"\n비교 기준: {path} (commit {previous.get('meta', {}).get('commit')})")
+    for name, now in current["targets"].items():
+        before = previous.get("targets", {}).get(name)
+        if not before:
+            continue
+        deltas = []
+        for key in ("import_ms_median", "wall_ms_median"):
+            if before[key]:
+                deltas.append(f"{key} {(now[key] - before[key]) / before[key] * 100:+6.1f}%")
+        print(f"{name:<6} " + "  ".join(deltas))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="콜드 스타트 import 시간 벤치마크(python -X importtime)")
+    parser.add_argument("--runs", type=int, default=5, help="대상별 반복 횟수(매번 새 프로세스)")
+    parser.add_argument("--only", default="", help="쉼표로 구분한 대상 이름(기본: 전체)")
+    parser.add_argument("--top", type=int, default=8, help="표시할 무거운 최상위 패키지 수")
+    parser.add_argument("--check", action="store_true", help="rest 대상이 LangChain을 불러오면 종료 코드 1")
+    parser.add_argument("--out", help="결과 JSON 경로(기본: bench/results/import-<commit>.json)")
+    parser.add_argument("--compare", help="이전 결과 JSON과 비교")
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.only.split(",") if n.strip()] or list(TARGETS)
+    unknown = [n for n in names if n not in TARGETS]
+    if unknown:
+        parser.error(f"알 수 없는 대상: {unknown} (가능: {', '.join(TARGETS)})")
+
+    targets: Dict[str, Any] = {}
+    for name in names:
+        r = targets[name] = measure(name, args.runs, args.top)
+        print(
+            f"{name:<6} import {r['import_ms_median']:7.1f} ms (min {r['import_ms_min']:.1f})  "
+            f"process {r['wall_ms_median']:7.1f} ms  modules {r['modules']}"
+        )
+        print("       " + ", ".join(f"{p} {ms}" for p, ms in r["top_packages_ms"].items()))
+
+    leaked = targets.get("rest", {}).get("heavy_loaded") or []
+    if leaked:
+        print(f"\n경고: REST 경로(import app.main)가 에이전트 패키지를 불러옵니다: {leaked}")
+
+    commit = _git_commit()
+    result = {
+        "meta": {
+            "commit": commit,
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "args": vars(args),
+        },
+        "targets": targets,
+    }
+    out = args.out or os.path.join("bench", "results", f"import-{commit or 'local'}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"\n저장: {out}")
+    if args.compare:
+        compare(result, args.compare)
+    if args.check and leaked:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+bench/bench_pool.py
+
+역할:
+- 요청마다 NotionTaskService(=새 커넥션 풀)를 만드는 방식(before)과
+  공용 서비스(keep-alive 풀 재사용, after)의 처리량(requests/sec)을 비교한다.
+- 로컬 가짜 Notion 서버(bench.fake_notion)를 대상으로 하므로 자격증명이 필요 없다.
+
+실행:
+    python -m bench.bench_pool --requests 500 --concurrency 8
+"""
+
+from __future__ import annotations
+import argparse
+import dataclasses
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import Settings, get_settings
+from app.services.notion_service import NotionTaskService
+from bench.fake_notion import FakeNotionServer, FAKE_DB_ID
+
+
+def bench_settings(base_url: str) -> Settings:
+    return dataclasses.replace(
+        get_settings(),
+        notion_token="bench-token",
+        notion_tasks_db_id=FAKE_DB_ID,
+        notion_base_url=base_url,
+        task_cache_ttl_sec=0,  # 캐시 없이 HTTP 경로만 측정
+        notion_rate_per_sec=0,  # 레이트 리밋 없이 처리량 측정
+    )
+
+
+def run(label: str, total: int, concurrency: int, call) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda _: call(), range(total)))
+    elapsed = time.perf_counter() - start
+    rps = total / elapsed
+    print(f"{label:<28} {total:>6} req  {elapsed:7.3f}s  {rps:9.1f} req/s")
+    return rps
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = FakeNotionServer(latency_ms=args.latency_ms, page_count=20).start()
+    settings = bench_settings(server.base_url)
+    try:
+        def per_call() -> None:
+            svc = NotionTaskService(settings)
+            try:
+                svc.list_tasks(page_size=10)
+            finally:
+                svc.close()
+
+        shared = NotionTaskService(settings)
+
+        def pooled() -> None:
+            shared.list_tasks(page_size=10)
+
+        before = run("before (service per call)", args.requests, args.concurrency, per_call)
+        after = run("after  (shared pool)", args.requests, args.concurrency, pooled)
+        shared.close()
+        print(f"speedup: x{after / before:.2f}")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+bench/fake_llm.py
+
+역할:
+- 벤치마크용 각본(script) 채팅 모델. GOOGLE_API_KEY/네트워크 없이 에이전트·계획 모드를 끝까지 실행한다.
+- 마지막 사용자 메시지를 규칙(정규식)에 맞춰 tool_calls가 담긴 AIMessage로 답하고,
+  latency_ms만큼 기다린 뒤 usage_metadata(대략적인 토큰 수)를 붙인다.
+- 툴 결과(ToolMessage)를 받은 다음 턴에는 툴 호출 없이 짧은 요약만 돌려준다.
+
+사용:
+    from app.llm.chains import set_llm_factory
+    set_llm_factory(lambda model: ScriptedChatModel(latency_ms=800))
+"""
+
+from __future__ import annotations
+import asyncio
+import itertools
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+Call = Tuple[str, Dict[str, Any]]
+Rule = Tuple[re.Pattern, Callable[[str, re.Match], List[Call]]]
+
+_QUOTED = re.compile(r"'([^']+)'")
+
+
+def _each_title(tool: str, **extra: Any) -> Callable[[str, re.Match], List[Call]]:
+    # 따옴표 제목마다 같은 툴 호출 하나(계획 모드의 "A, B 다 완료" 같은 지시)
+    def calls(text: str, m: re.Match) -> List[Call]:
+        return [(tool, {"task_ref": title, **extra}) for title in _QUOTED.findall(text)]
+    return calls
+
+# 규칙은 위에서부터 처음 맞는 것 하나를 쓴다
+DEFAULT_RULES: List[Rule] = [
+    (re.compile(r"'[^']+'.*(추가|만들|등록)"),
+     lambda text, m: [("create_task_tool", {"title": t}) for t in _QUOTED.findall(text)]),
+    (re.compile(r"'[^']+'.*(완료|끝냈|했어)"), _each_title("complete_task_smart_tool")),
+    (re.compile(r"'[^']+'.*(삭제|지워)"), _each_title("delete_task_smart_tool", confirm=True)),
+    (re.compile(r"'[^']+'.*(진행 ?중|시작)"), _each_title("update_property_smart_tool", field="상태", value="진행 중")),
+]
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    규칙 기반으로 tool_calls를 돌려주는 가짜 채팅 모델(bind_tools는 자기 자신을 반환).
+    - 맞는 규칙이 없으면 list_tasks_tool(page_size=10)
+    """
+    latency_ms: float = 0.0
+    rules: List[Any] = DEFAULT_RULES
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-fake"
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> "ScriptedChatModel":
+        return self
+
+    def _respond(self, messages: List[BaseMessage]) -> ChatResult:
+        self.calls += 1
+        prompt_tokens = sum(len(str(m.content)) for m in messages) // 4
+        if messages and isinstance(messages[-1], ToolMessage):
+            message = AIMessage(content="처리했습니다.")
+        else:
+            text = next((str(m.content) for m in reversed(messages) if isinstance(m, HumanMessage)), "")
+            calls = self._script(text)
+            ids = itertools.count(1)
+            message = AIMessage(
+                content="",
+                tool_calls=[{"name": name, "args": args, "id": f"call_{next(ids)}"} for name, args in calls],
+            )
+        message.usage_metadata = {
+            "input_tokens": prompt_tokens,
+            "output_tokens": 12 * max(1, len(message.tool_calls)),
+            "total_tokens": prompt_tokens + 12 * max(1, len(message.tool_calls)),
+        }
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _script(self, text: str) -> List[Call]:
+        for pattern, build in self.rules:
+            m = pattern.search(text)
+            if m:
+                calls = build(text, m)
+                if calls:
+                    return calls
+        return [("list_tasks_tool", {"page_size": 10})]
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return self._respond(messages)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        return self._respond(messages)
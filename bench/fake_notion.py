@@ -0,0 +1,380 @@
+"""
+bench/fake_notion.py
+
+역할:
+- 벤치마크용 로컬 가짜 Notion API 서버(표준 라이브러리만 사용).
+- Tasks DB 조회/생성/수정과 스키마 조회 등 서비스가 사용하는 최소 엔드포인트만 흉내낸다.
+- HTTP/1.1 keep-alive를 지원하므로 커넥션 재사용 효과를 그대로 측정할 수 있다.
+- rate_limit_ratio로 429(+Retry-After) 응답을 확률적으로 섞어 리미터/재시도 경로도 측정한다.
+- fixture: 실제 DB에서 기록한 JSON({"database": ..., "pages": [...]})으로 페이지/스키마를 채운다.
+
+사용:
+    server = FakeNotionServer(latency_ms=5, page_count=200, rate_limit_ratio=0.05)
+    server.start()
+    ... server.base_url ...
+    server.stop()
+
+픽스처 기록(실제 NOTION_TOKEN/NOTION_TASKS_DB_ID 필요):
+    python -m bench.fake_notion --record bench/fixtures/tasks.json --limit 200
+"""
+
+from __future__ import annotations
+import hashlib
+import hmac
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+FAKE_DB_ID = "0" * 32
+
+
+def _now() -> str:
+    # Notion과 같이 분 단위로 반올림된 last_edited_time
+    return time.strftime("%Y-%m-%dT%H:%M:00.000Z", time.gmtime())
+
+
+def _make_page(title: str, status: str = "시작 전", date: Optional[str] = None) -> Dict[str, Any]:
+    now = _now()
+    return {
+        "object": "page",
+        "id": str(uuid.uuid4()),
+        "created_time": now,
+        "last_edited_time": now,
+        "archived": False,
+        "url": "https://www.notion.so/fake",
+        "properties": {
+            "할 일": {"type": "title", "title": [{"plain_text": title, "text": {"content": title}}]},
+            "상태": {"type": "status", "status": {"name": status}},
+            "날짜": {"type": "date", "date": {"start": date} if date else None},
+            "카테고리": {"type": "select", "select": None},
+            "메모": {"type": "rich_text", "rich_text": []},
+        },
+    }
+
+
+def webhook_delivery(
+    event_type: str,
+    page_id: str,
+    database_id: str = FAKE_DB_ID,
+    secret: Optional[str] = None,
+) -> tuple[bytes, Dict[str, str]]:
+    """
+    Notion 웹훅 전달 한 건(본문, 헤더)을 만든다. secret이 있으면 X-Notion-Signature를 붙인다.
+    """
+    entity_type = "database" if event_type.startswith(("database.", "data_source.")) else "page"
+    event = {
+        "id": str(uuid.uuid4()),
+        "timestamp": _now(),
+        "type": event_type,
+        "entity": {"id": database_id if entity_type == "database" else page_id, "type": entity_type},
+        "data": {"parent": {"id": database_id, "type": "database"}},
+    }
+    body = json.dumps(event).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
+    if secret:
+        headers["X-Notion-Signature"] = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return body, headers
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # 동시 접속 부하 테스트용 listen backlog
+
+
+def load_fixture(path: str) -> tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    기록한 픽스처를 (페이지 목록, DB 스키마)로 읽는다. databases.query 응답({"results": [...]})도 받는다.
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return data, None
+    return data.get("pages") or data.get("results") or [], data.get("database")
+
+
+def record_fixture(path: str, limit: int = 200) -> int:
+    """
+    현재 설정의 실제 Tasks DB에서 스키마와 페이지(최대 limit개)를 픽스처로 기록한다. 기록한 페이지 수를 반환.
+    """
+    from app.services.notion_service import get_notion_service
+
+    svc = get_notion_service()
+    pages: List[Dict[str, Any]] = []
+    for page in svc.iter_tasks():
+        pages.append(page)
+        if len(pages) >= limit:
+            break
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"database": svc.describe_database(), "pages": pages}, f, ensure_ascii=False, indent=1)
+    return len(pages)
+
+
+class FakeNotionServer:
+    """
+    스레드에서 구동되는 가짜 Notion 서버.
+    - latency_ms: 모든 응답 전에 인위적으로 대기할 시간(ms)
+    - page_count: 초기 적재할 Task 페이지 수(fixture가 있으면 무시)
+    - rate_limit_ratio: 이 확률로 요청을 429(rate_limited)로 거절한다(Retry-After: retry_after_sec)
+    - seed: 429 주입 난수 시드(실행 간 같은 패턴 재현)
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        page_count: int = 50,
+        port: int = 0,
+        rate_limit_ratio: float = 0.0,
+        retry_after_sec: float = 0.1,
+        seed: Optional[int] = 0,
+        fixture: Optional[str] = None,
+    ) -> None:
+        self.latency_ms = latency_ms
+        self.rate_limit_ratio = rate_limit_ratio
+        self.retry_after_sec = retry_after_sec
+        self._random = random.Random(seed)
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        self.database: Optional[Dict[str, Any]] = None
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.rate_limited_count = 0
+        if fixture:
+            pages, self.database = load_fixture(fixture)
+            self.pages = {p["id"]: p for p in pages}
+        else:
+            for i in range(page_count):
+                page = _make_page(f"작업 {i}")
+                self.pages[page["id"]] = page
+        self._httpd = _Server(("127.0.0.1", port), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeNotionServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    # -------- 요청 처리 --------
+    def handle(self, method: str, path: str, body: Dict[str, Any]) -> tuple[int, Dict[str, Any]]:
+        with self.lock:
+            self.request_count += 1
+            limited = self.rate_limit_ratio > 0 and self._random.random() < self.rate_limit_ratio
+            if limited:
+                self.rate_limited_count += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        if limited:
+            return 429, {"object": "error", "status": 429, "code": "rate_limited", "message": "fake rate limit"}
+
+        parts = [p for p in path.split("?")[0].split("/") if p]  # ["v1", "databases", id, "query"]
+        if parts[:2] == ["v1", "databases"] and len(parts) == 4 and method == "POST":
+            return 200, self._query(body)
+        if parts[:2] == ["v1", "databases"] and len(parts) == 3 and method == "GET":
+            return 200, self._describe()
+        if parts[:2] == ["v1", "pages"] and len(parts) == 2 and method == "POST":
+            return 200, self._create(body)
+        if parts[:2] == ["v1", "pages"] and len(parts) == 3 and method == "PATCH":
+            return self._update(parts[2], body)
+        if parts[:2] == ["v1", "pages"] and len(parts) == 3 and method == "GET":
+            return self._retrieve(parts[2])
+        return 404, {"object": "error", "status": 404, "code": "object_not_found", "message": path}
+
+    @staticmethod
+    def _matches(page: Dict[str, Any], flt: Optional[Dict[str, Any]]) -> bool:
+        """
+        서비스가 실제로 보내는 필터만 최소한으로 해석한다(그 외 조건은 통과 처리).
+        """
+        if not flt:
+            return True
+        if "and" in flt:
+            return all(FakeNotionServer._matches(page, f) for f in flt["and"])
+        if flt.get("timestamp") == "last_edited_time":
+            since = flt["last_edited_time"].get("on_or_after", "")
+            return page["last_edited_time"] >= since
+        if "title" in flt:
+            title = "".join(t["plain_text"] for t in page["properties"]["할 일"]["title"])
+            cond = flt["title"]
+            if "equals" in cond:
+                return title == cond["equals"]
+            if "contains" in cond:
+                return cond["contains"].casefold() in title.casefold()
+        prop = page["properties"].get(flt.get("property"), {})
+        for kind in ("status", "select"):
+            if kind in flt:
+                name = (prop.get(kind) or {}).get("name")
+                cond = flt[kind]
+                return name == cond["equals"] if "equals" in cond else name != cond.get("does_not_equal")
+        if "date" in flt:
+            start = ((prop.get("date") or {}).get("start") or "")[:10]
+            op, value = next(iter(flt["date"].items()))
+            if not start:
+                return False
+            return {
+                "equals": start == value,
+                "before": start < value,
+                "after": start > value,
+                "on_or_before": start <= value,
+                "on_or_after": start >= value,
+            }.get(op, True)
+        return True
+
+    @staticmethod
+    def _sort_value(page: Dict[str, Any], sort: Dict[str, str]) -> str:
+        if "timestamp" in sort:
+            return page.get(sort["timestamp"]) or ""
+        prop = page["properties"].get(sort.get("property"), {})
+        kind = prop.get("type")
+        if kind == "title":
+            return "".join(t["plain_text"] for t in prop["title"])
+        if kind == "date":
+            return (prop.get("date") or {}).get("start") or ""
+        return (prop.get(kind) or {}).get("name") or ""
+
+    def _query(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        with self.lock:
+            pages: List[Dict[str, Any]] = [
+                p for p in self.pages.values()
+                if not p["archived"] and self._matches(p, body.get("filter"))
+            ]
+        for sort in reversed(body.get("sorts") or []):
+            # 안정 정렬을 뒤 키부터 적용, 빈 값은 방향과 무관하게 뒤로
+            filled = [p for p in pages if self._sort_value(p, sort)]
+            empty = [p for p in pages if not self._sort_value(p, sort)]
+            filled.sort(key=lambda p: self._sort_value(p, sort), reverse=sort.get("direction") == "descending")
+            pages = filled + empty
+        page_size = int(body.get("page_size") or 100)
+        start = int(body.get("start_cursor") or 0)
+        chunk = pages[start:start + page_size]
+        more = start + page_size < len(pages)
+        return {
+            "object": "list",
+            "results": chunk,
+            "has_more": more,
+            "next_cursor": str(start + page_size) if more else None,
+        }
+
+    def _describe(self) -> Dict[str, Any]:
+        if self.database is not None:
+            return self.database
+        return {
+            "object": "database",
+            "id": FAKE_DB_ID,
+            "last_edited_time": "2025-01-01T00:00:00.000Z",
+            "properties": {
+                "할 일": {"id": "title", "name": "할 일", "type": "title", "title": {}},
+                "상태": {"id": "s", "name": "상태", "type": "status", "status": {"options": [
+                    {"name": "시작 전"}, {"name": "진행 중"}, {"name": "완료"},
+                ]}},
+                "날짜": {"id": "d", "name": "날짜", "type": "date", "date": {}},
+                "카테고리": {"id": "c", "name": "카테고리", "type": "select", "select": {"options": [
+                    {"name": "💪 Work"}, {"name": "❤️ Family"}, {"name": "⚪️ Public"},
+                ]}},
+                "메모": {"id": "m", "name": "메모", "type": "rich_text", "rich_text": {}},
+            },
+        }
+
+    def _create(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        props = body.get("properties") or {}
+        title = "".join(t["text"]["content"] for t in (props.get("할 일") or {}).get("title", []))
+        page = _make_page(title)
+        with self.lock:
+            self.pages[page["id"]] = page
+        return page
+
+    def _retrieve(self, page_id: str) -> tuple[int, Dict[str, Any]]:
+        with self.lock:
+            page = self.pages.get(page_id)
+        if page is None:
+            return 404, {"object": "error", "status": 404, "code": "object_not_found", "message": page_id}
+        return 200, page
+
+    def _update(self, page_id: str, body: Dict[str, Any]) -> tuple[int, Dict[str, Any]]:
+        with self.lock:
+            page = self.pages.get(page_id)
+            if page is None:
+                return 404, {"object": "error", "status": 404, "code": "object_not_found", "message": page_id}
+            page["properties"].update(body.get("properties") or {})
+            if "archived" in body:
+                page["archived"] = bool(body["archived"])
+            page["last_edited_time"] = _now()
+            return 200, page
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+            disable_nagle_algorithm = True
+
+            def _dispatch(self, method: str) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                body = json.loads(raw) if raw else {}
+                status, payload = server.handle(method, self.path, body)
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                if status == 429:
+                    self.send_header("Retry-After", str(server.retry_after_sec))
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self) -> None:
+                self._dispatch("GET")
+
+            def do_POST(self) -> None:
+                self._dispatch("POST")
+
+            def do_PATCH(self) -> None:
+                self._dispatch("PATCH")
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="가짜 Notion 서버 실행 / 실제 DB 픽스처 기록")
+    parser.add_argument("--record", metavar="PATH", help="실제 Tasks DB를 픽스처 JSON으로 기록하고 종료")
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--page-count", type=int, default=50)
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0)
+    parser.add_argument("--fixture")
+    args = parser.parse_args()
+
+    if args.record:
+        print(f"recorded {record_fixture(args.record, args.limit)} pages → {args.record}")
+        return
+    server = FakeNotionServer(
+        latency_ms=args.latency_ms,
+        page_count=args.page_count,
+        port=args.port,
+        rate_limit_ratio=args.rate_limit_ratio,
+        fixture=args.fixture,
+    ).start()
+    print(f"fake Notion at {server.base_url} (NOTION_BASE_URL), Ctrl+C로 종료")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
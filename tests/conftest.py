@@ -0,0 +1,50 @@
+"""
+tests/conftest.py
+
+공용 픽스처:
+- 프로세스 안의 가짜 Notion 서버(bench.fake_notion)를 띄우고, app 모듈을 import하기 전에 환경변수를 맞춘다
+  (설정은 처음 읽을 때 캐시되므로 이 파일이 가장 먼저 실행되어야 함). 자격증명/네트워크 없이 실행된다.
+- client: lifespan까지 실행한 FastAPI TestClient
+"""
+
+import os
+from typing import Iterator
+import pytest
+from bench.fake_notion import FAKE_DB_ID, FakeNotionServer
+
+WEBHOOK_SECRET = "test-webhook-secret"
+
+_server = FakeNotionServer(page_count=5).start()
+os.environ.update({
+    "NOTION_TOKEN": "test-token",
+    "NOTION_TASKS_DB_ID": FAKE_DB_ID,
+    "NOTION_BASE_URL": _server.base_url,
+    "NOTION_RATE_PER_SEC": "0",
+    "NOTION_WEBHOOK_SECRET": WEBHOOK_SECRET,
+    "GOOGLE_API_KEY": "test",
+    "MIRROR_DB_PATH": "",
+    "WRITE_JOURNAL_PATH": "",
+    "CHANGE_FEED_POLL_SEC": "0",
+    "METRICS_ENABLED": "false",
+    "TRACING_EXPORTER": "",
+    "SETTINGS_WATCH_SEC": "0",
+    "AGENT_WARMUP": "false",
+})
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    _server.stop()
+
+
+@pytest.fixture
+def notion_server() -> FakeNotionServer:
+    return _server
+
+
+@pytest.fixture
+def client() -> Iterator["TestClient"]:
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as c:
+        yield c
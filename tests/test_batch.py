@@ -0,0 +1,88 @@
+"""
+일괄 작업: 같은 task_id는 입력 순서대로, archive는 confirm 필요.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List
+from app.core.config import get_settings
+from app.services.notion_service import AsyncNotionTaskService, NotionTaskService, _batch_groups
+
+OPERATIONS = [
+    {"op": "update", "task_id": "X", "patch": {"상태": "진행 중"}},
+    {"op": "create", "title": "새 작업"},
+    {"op": "complete", "task_id": "X"},
+    {"op": "complete", "task_id": "Y"},
+    {"op": "archive", "task_id": "X"},
+]
+
+
+def test_batch_groups_serialize_same_task() -> None:
+    assert _batch_groups(OPERATIONS) == [[0, 2, 4], [1], [3]]
+    assert _batch_groups([]) == []
+
+
+def _record(calls: List[str], name: str, delay: float):
+    # update가 가장 늦게 끝나도록 해 순서가 뒤바뀌면 드러나게 한다
+    def fake(task_id: str = "", **kwargs: Any) -> Dict[str, Any]:
+        time.sleep(delay)
+        calls.append(f"{name}:{task_id or kwargs.get('title')}")
+        return {"id": task_id or "new", "properties": {}}
+    return fake
+
+
+def _arecord(calls: List[str], name: str, delay: float):
+    async def fake(task_id: str = "", **kwargs: Any) -> Dict[str, Any]:
+        await asyncio.sleep(delay)
+        calls.append(f"{name}:{task_id or kwargs.get('title')}")
+        return {"id": task_id or "new", "properties": {}}
+    return fake
+
+
+def _x_calls(calls: List[str]) -> List[str]:
+    return [c for c in calls if c.endswith(":X")]
+
+
+def test_sync_batch_keeps_order_per_task(notion_server) -> None:
+    svc = NotionTaskService(get_settings())
+    calls: List[str] = []
+    for name, delay in (("update_task", 0.05), ("create_task", 0), ("complete_task", 0), ("delete_task", 0)):
+        setattr(svc, name, _record(calls, name, delay))
+    try:
+        data = svc.batch(OPERATIONS, concurrency=5)
+    finally:
+        svc.close()
+    assert data["succeeded"] == 5
+    assert [r["index"] for r in data["results"]] == [0, 1, 2, 3, 4]
+    assert _x_calls(calls) == ["update_task:X", "complete_task:X", "delete_task:X"]
+
+
+def test_async_batch_keeps_order_per_task(notion_server) -> None:
+    async def run() -> Dict[str, Any]:
+        svc = AsyncNotionTaskService(get_settings())
+        for name, delay in (("update_task", 0.05), ("create_task", 0), ("complete_task", 0), ("delete_task", 0)):
+            setattr(svc, name, _arecord(calls, name, delay))
+        try:
+            return await svc.batch(OPERATIONS, concurrency=5)
+        finally:
+            await svc.aclose()
+
+    calls: List[str] = []
+    data = asyncio.run(run())
+    assert data["succeeded"] == 5
+    assert [r["index"] for r in data["results"]] == [0, 1, 2, 3, 4]
+    assert _x_calls(calls) == ["update_task:X", "complete_task:X", "delete_task:X"]
+
+
+def test_batch_archive_requires_confirm(client, notion_server) -> None:
+    ops = [
+        {"op": "create", "title": "확인 없이 만들면 안 됨"},
+        {"op": "archive", "task_id": "ffffffffffffffffffffffffffffffff"},
+    ]
+    before = len(notion_server.pages)
+    r = client.post("/v1/notion/tasks/batch", json={"operations": ops})
+    body = r.json()
+    assert r.status_code == 200 and body["ok"] is False and body["indexes"] == [1]
+    assert "confirm" in body["message"]
+    # 하나라도 확인이 없으면 아무것도 실행하지 않는다
+    assert len(notion_server.pages) == before
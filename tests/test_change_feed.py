@@ -0,0 +1,158 @@
+"""
+변경 피드: 웹훅 서명/수신 처리와 폴링 중복 제거.
+"""
+
+import json
+import os
+import stat
+from dataclasses import replace
+from typing import Iterator, List
+import pytest
+from bench.fake_notion import FAKE_DB_ID, webhook_delivery
+from app.services.change_feed import PAGE, ChangeFeed, PageChange, get_change_feed, verify_signature
+from tests.conftest import WEBHOOK_SECRET
+
+URL = "/v1/notion/webhooks/notion"
+
+
+def _page(page_id: str, edited: str, title: str = "A", archived: bool = False) -> dict:
+    return {
+        "object": "page",
+        "id": page_id,
+        "last_edited_time": edited,
+        "archived": archived,
+        "properties": {"할 일": {"title": [{"plain_text": title}]}},
+    }
+
+
+@pytest.fixture
+def received() -> Iterator[List[PageChange]]:
+    changes: List[PageChange] = []
+    unsubscribe = get_change_feed().subscribe(changes.extend)
+    yield changes
+    unsubscribe()
+
+
+@pytest.fixture
+def without_secret(monkeypatch: pytest.MonkeyPatch, tmp_path) -> str:
+    from app.api.v1.endpoints import notion as endpoints
+    from app.core.config import get_settings
+
+    path = str(tmp_path / "webhook-token")
+    settings = replace(get_settings(), notion_webhook_secret=None, notion_webhook_token_file=path)
+    monkeypatch.setattr(endpoints, "get_settings", lambda: settings)
+    return path
+
+
+# -------- 서명 --------
+def test_verify_signature() -> None:
+    body, headers = webhook_delivery("page.created", "p1", secret="s3cret")
+    signature = headers["X-Notion-Signature"]
+    assert verify_signature(body, signature, "s3cret")
+    assert not verify_signature(body, signature, "other")
+    assert not verify_signature(body + b" ", signature, "s3cret")
+    assert not verify_signature(body, None, "s3cret")
+    assert not verify_signature(body, "", "s3cret")
+
+
+# -------- 웹훅(앱 경유) --------
+def test_signed_page_event_is_handled(client, notion_server, received) -> None:
+    page_id = next(iter(notion_server.pages))
+    body, headers = webhook_delivery("page.properties_updated", page_id, secret=WEBHOOK_SECRET)
+    resp = client.post(URL, content=body, headers=headers)
+    assert resp.status_code == 200
+    assert resp.json()["data"] == {
+        "handled": True, "type": "page.properties_updated", "page_id": page_id, "refetch": False,
+    }
+    # 본문은 무효화만 한다(삭제로 반영하지 않음)
+    assert [(c.page_id, c.page, c.deleted) for c in received] == [(page_id, None, False)]
+
+
+@pytest.mark.parametrize("secret", [None, "wrong-secret"])
+def test_unsigned_or_badly_signed_delivery_is_rejected(client, received, secret) -> None:
+    body, headers = webhook_delivery("page.deleted", "p1", secret=secret)
+    resp = client.post(URL, content=body, headers=headers)
+    assert resp.status_code == 401
+    assert received == []
+
+
+def test_delivery_without_configured_secret_is_refused(client, without_secret, received) -> None:
+    body, headers = webhook_delivery("page.deleted", "p1", secret=WEBHOOK_SECRET)
+    resp = client.post(URL, content=body, headers=headers)
+    assert resp.status_code == 503
+    assert received == []
+
+
+def test_verification_token_is_saved_not_logged(client, without_secret, capsys) -> None:
+    token = "secret_verification_token_1234"
+    resp = client.post(URL, json={"verification_token": token})
+    assert resp.status_code == 200
+    assert token not in resp.text
+    assert token not in capsys.readouterr().out
+    with open(without_secret, encoding="utf-8") as f:
+        assert f.read().strip() == token
+    assert stat.S_IMODE(os.stat(without_secret).st_mode) == 0o600
+
+
+def test_delete_of_live_page_is_not_applied(client, notion_server, received) -> None:
+    page_id = next(p for p, page in notion_server.pages.items() if not page["archived"])
+    body, headers = webhook_delivery("page.deleted", page_id, secret=WEBHOOK_SECRET)
+    resp = client.post(URL, content=body, headers=headers)
+    assert resp.json()["data"]["refetch"] is True
+    # 재조회 결과(살아 있는 페이지)로 갱신되고 삭제로 반영되지 않는다
+    assert [(c.page is not None, c.deleted) for c in received] == [(False, False), (True, False)]
+
+
+def test_delete_of_archived_page_is_applied(client, notion_server, received) -> None:
+    page_id = next(p for p, page in notion_server.pages.items() if not page["archived"])
+    notion_server.pages[page_id]["archived"] = True
+    try:
+        body, headers = webhook_delivery("page.deleted", page_id, secret=WEBHOOK_SECRET)
+        client.post(URL, content=body, headers=headers)
+    finally:
+        notion_server.pages[page_id]["archived"] = False
+    assert received[-1].page_id == page_id and received[-1].deleted
+
+
+def test_delete_of_missing_page_is_applied(client, received) -> None:
+    page_id = "f" * 32
+    body, headers = webhook_delivery("page.deleted", page_id, secret=WEBHOOK_SECRET)
+    client.post(URL, content=body, headers=headers)
+    assert (received[-1].page_id, received[-1].page, received[-1].deleted) == (page_id, None, True)
+
+
+# -------- 웹훅 이벤트 필터 --------
+def test_page_event_without_parent_is_ignored() -> None:
+    feed = ChangeFeed(FAKE_DB_ID)
+    event = {"type": "page.deleted", "entity": {"id": "p1", "type": "page"}, "data": {}}
+    assert feed.handle_webhook(event) == {"handled": False, "type": "page.deleted"}
+    assert feed.stats()["pending_refetch"] == 0
+
+
+def test_page_event_from_other_database_is_ignored() -> None:
+    feed = ChangeFeed(FAKE_DB_ID)
+    event = json.loads(webhook_delivery("page.created", "p1", database_id="1" * 32)[0])
+    assert feed.handle_webhook(event)["handled"] is False
+
+
+# -------- 폴링 중복 제거 --------
+def test_new_changes_dedupes_same_minute_by_fingerprint() -> None:
+    feed = ChangeFeed(FAKE_DB_ID)
+    minute = "2025-01-01T09:00:00.000Z"
+    first = feed._new_changes([_page("p1", minute), _page("p2", minute)])
+    assert [c.page_id for c in first] == ["p1", "p2"]
+    # 경계 분의 같은 페이지가 다시 와도 발행하지 않는다
+    assert feed._new_changes([_page("p1", minute), _page("p2", minute)]) == []
+    # 같은 분 안의 두 번째 수정(속성 변경)과 아카이브는 발행한다
+    again = feed._new_changes([_page("p1", minute, title="B"), _page("p2", minute, archived=True)])
+    assert [(c.page_id, c.deleted) for c in again] == [("p1", False), ("p2", True)]
+    assert feed.watermark == minute
+
+
+def test_new_changes_advances_watermark() -> None:
+    feed = ChangeFeed(FAKE_DB_ID)
+    feed._new_changes([_page("p1", "2025-01-01T09:00:00.000Z")])
+    later = feed._new_changes([_page("p1", "2025-01-01T09:00:00.000Z"), _page("p1", "2025-01-01T09:01:00.000Z")])
+    assert len(later) == 1 and later[0].kind == PAGE
+    assert feed.watermark == "2025-01-01T09:01:00.000Z"
+    assert feed._new_changes([_page("p1", "2025-01-01T09:01:00.000Z")]) == []
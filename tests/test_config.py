@@ -0,0 +1,66 @@
+"""
+설정: bool 파싱, .env 다시 읽기(검증 통과 전에는 os.environ을 바꾸지 않음).
+"""
+
+import os
+from pathlib import Path
+from typing import Iterator
+import pytest
+from app.core import config
+from app.core.config import Settings, SettingsError, get_settings, reload_settings
+
+
+@pytest.mark.parametrize("raw, expected", [("true", True), (" TRUE ", True), ("False", False), ("false\n", False)])
+def test_bool_accepts_true_false(raw, expected):
+    assert Settings.from_env({"METRICS_ENABLED": raw}).metrics_enabled is expected
+
+
+@pytest.mark.parametrize("raw", ["yes", "1", "0", "on", "", "ture"])
+def test_bool_rejects_other_values(raw):
+    with pytest.raises(SettingsError, match="METRICS_ENABLED"):
+        Settings.from_env({"METRICS_ENABLED": raw})
+
+
+@pytest.fixture
+def env_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    path = tmp_path / ".env"
+    monkeypatch.setattr(config, "_env_file", str(path))
+    yield path
+    # .env에서 온 키를 걷어내고 공용 설정을 원래대로
+    path.unlink(missing_ok=True)
+    reload_settings()
+
+
+def test_reload_applies_env_file(env_file):
+    env_file.write_text("TASK_CACHE_TTL_SEC=45\n")
+    assert reload_settings().task_cache_ttl_sec == 45
+    assert os.environ["TASK_CACHE_TTL_SEC"] == "45"
+
+    env_file.write_text("")
+    assert reload_settings().task_cache_ttl_sec == Settings().task_cache_ttl_sec
+    assert "TASK_CACHE_TTL_SEC" not in os.environ
+
+
+def test_reload_invalid_env_file_changes_nothing(env_file):
+    env_file.write_text("TASK_CACHE_TTL_SEC=45\n")
+    reload_settings()
+    before_env, before = dict(os.environ), get_settings()
+
+    env_file.write_text("TASK_CACHE_TTL_SEC=60\nNOTION_SINGLE_FLIGHT=yes\n")
+    with pytest.raises(SettingsError):
+        reload_settings()
+    assert dict(os.environ) == before_env
+    assert get_settings() is before
+
+    env_file.write_text("MIRROR_FULL_SYNC_SEC=-1\n")
+    with pytest.raises(SettingsError):
+        reload_settings()
+    assert dict(os.environ) == before_env
+    assert get_settings() is before
+
+
+def test_process_env_wins_over_env_file(env_file):
+    # conftest가 app import 전에 넣은 값은 프로세스 환경변수로 취급된다
+    env_file.write_text("NOTION_RATE_PER_SEC=abc\n")
+    assert reload_settings().notion_rate_per_sec == 0
+    assert os.environ["NOTION_RATE_PER_SEC"] == "0"
@@ -0,0 +1,125 @@
+"""
+결정 캐시: 유사도 기준 미달(부정/비슷한 다른 지시), 슬롯·인자 불일치, 날짜 변경, 캐시하지 않는 툴.
+"""
+
+import types
+from typing import Any, Dict
+import pytest
+from app.llm import decision_cache
+from app.llm.decision_cache import NEVER_CACHE, DecisionCache, canonical_text, cosine, embed
+
+DAY = "2026-10-17"
+NEXT_DAY = "2026-10-18"
+COMPLETE = ("complete_task_smart_tool", {"task_ref": "보고서"})
+
+
+def _cache(similarity: float = 0.9) -> DecisionCache:
+    return DecisionCache(ttl_sec=3600, max_size=16, similarity=similarity)
+
+
+def _score(a: str, b: str) -> float:
+    return cosine(embed(canonical_text(a)), embed(canonical_text(b)))
+
+
+def test_exact_and_spacing_variants_reuse() -> None:
+    cache = _cache()
+    cache.put("'보고서' 완료 처리해줘", DAY, *COMPLETE)
+    assert cache.get("'보고서'  완료 처리해줘!", DAY) == (*COMPLETE, "exact")
+    assert cache.get("'보고서' 완료처리 해 줘", DAY) == (*COMPLETE, "similar")
+    assert cache.stats()["exact_hits"] == 1 and cache.stats()["similar_hits"] == 1
+
+
+@pytest.mark.parametrize("text", [
+    "'보고서' 완료 처리하지 마",
+    "'보고서' 완료 처리하지 말아줘",
+    "'보고서' 완료 안 해도 돼",
+    "'보고서' 완료 처리 취소해줘",
+    "'보고서' 완료 처리 해제해줘",
+    "'보고서' 완료 처리했어?",
+    "'보고서' 삭제해줘",
+    "'보고서' 진행 중으로 바꿔줘",
+])
+def test_negated_or_near_miss_below_threshold_is_not_reused(text) -> None:
+    cache = _cache()
+    cache.put("'보고서' 완료 처리해줘", DAY, *COMPLETE)
+    assert _score("'보고서' 완료 처리해줘", text) < cache.similarity
+    assert cache.get(text, DAY) is None
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.mark.parametrize("stored, text", [
+    ("'보고서' 완료 처리해줘", "'회의록' 완료 처리해줘"),
+    ("'보고서' 완료 처리해줘", "'보고서', '회의록' 완료 처리해줘"),
+    ("2026-10-20 마감인 작업 보여줘", "2026-10-21 마감인 작업 보여줘"),
+    ("작업 3개 보여줘", "작업 5개 보여줘"),
+])
+def test_slot_mismatch_blocks_reuse(stored, text) -> None:
+    # 기준을 낮춰도 슬롯(따옴표 문자열/날짜/숫자)이 다르면 재사용하지 않는다
+    cache = _cache(similarity=0.5)
+    cache.put(stored, DAY, *COMPLETE)
+    assert _score(stored, text) >= cache.similarity
+    assert cache.get(text, DAY) is None
+
+
+def test_argument_missing_from_text_blocks_reuse() -> None:
+    cache = _cache(similarity=0.5)
+    cache.put("보고서 완료 처리해줘", DAY, *COMPLETE)
+    # 슬롯이 없고 충분히 비슷하지만, 캐시된 인자 '보고서'가 새 문장에 없다
+    assert _score("보고서 완료 처리해줘", "회의록 완료 처리해줘") >= cache.similarity
+    assert cache.get("회의록 완료 처리해줘", DAY) is None
+    assert cache.get("보고서들 완료 처리해줘", DAY) == (*COMPLETE, "similar")
+
+
+def test_nested_argument_values_are_checked() -> None:
+    cache = _cache(similarity=0.5)
+    args: Dict[str, Any] = {"filters": [{"상태": "진행 중"}], "page_size": 10}
+    cache.put("진행 중인 작업 보여줘", DAY, "list_tasks_tool", args)
+    assert cache.get("진행 중인 작업 목록 보여줘", DAY) == ("list_tasks_tool", args, "similar")
+    assert cache.get("완료된 작업 보여줘", DAY) is None
+
+
+def test_day_rollover_invalidates_entries() -> None:
+    cache = _cache()
+    cache.put("오늘 할 일 목록 보여줘", DAY, "list_tasks_tool", {"page_size": 10})
+    # 다음 날에는 정확히 같은 문장도, 비슷한 문장도 재사용하지 않는다
+    assert cache.get("오늘 할일 목록 보여줘", NEXT_DAY) is None
+    assert cache.get("오늘 할 일 목록 보여줘", NEXT_DAY) is None
+    assert cache.stats()["expirations"] == 1 and cache.stats()["size"] == 0
+
+
+def test_ttl_expires_entries(monkeypatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr(decision_cache, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    cache = DecisionCache(ttl_sec=60, max_size=16, similarity=0.9)
+    cache.put("오늘 할 일 목록 보여줘", DAY, "list_tasks_tool", {"page_size": 10})
+    now[0] += 59
+    assert cache.get("오늘 할 일 목록 보여줘", DAY) is not None
+    now[0] += 1
+    assert cache.get("오늘 할일 목록 보여줘", DAY) is None
+    assert cache.get("오늘 할 일 목록 보여줘", DAY) is None
+
+
+@pytest.mark.parametrize("tool", sorted(NEVER_CACHE))
+def test_never_cache_tools_are_not_stored(tool) -> None:
+    cache = _cache()
+    cache.put("'보고서' 삭제해줘", DAY, tool, {"task_ref": "보고서", "confirm": True})
+    assert cache.stats()["size"] == 0
+    assert cache.get("'보고서' 삭제해줘", DAY) is None
+
+
+def test_agent_does_not_remember_delete_decisions(monkeypatch) -> None:
+    from app.interface import agent
+    from app.core.config import get_settings
+
+    cache = _cache()
+    monkeypatch.setattr(agent, "get_decision_cache", lambda: cache)
+
+    class _Action:
+        def __init__(self, tool: str) -> None:
+            self.tool, self.tool_input = tool, {"task_ref": "보고서", "confirm": True}
+
+    for tool in ("delete_task_smart_tool", "complete_task_smart_tool"):
+        result = {"intermediate_steps": [(_Action(tool), {"ok": True})]}
+        agent._remember_decision(f"'보고서' {tool}", get_settings(), result)
+    assert cache.stats()["size"] == 1
+    assert cache.get("'보고서' complete_task_smart_tool", agent.today_date_str(get_settings().tz)) is not None
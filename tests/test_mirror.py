@@ -0,0 +1,94 @@
+"""
+로컬 SQLite 미러: 커서 형식, 출처가 다른 커서 거절, 전체 동기화의 톰스톤 처리, watermark는 sync만 전진.
+"""
+
+from typing import Any, Dict, Iterator, List
+import pytest
+from app.services.mirror import TaskMirror, is_mirror_cursor
+
+
+def _page(page_id: str, edited: str, title: str) -> Dict[str, Any]:
+    return {
+        "object": "page",
+        "id": page_id,
+        "last_edited_time": edited,
+        "archived": False,
+        "properties": {"할 일": {"type": "title", "title": [{"plain_text": title}]}},
+    }
+
+
+class _Source:
+    """
+    mirror.sync가 쓰는 iter_tasks만 흉내 낸다(Notion처럼 아카이브된 페이지는 돌려주지 않음).
+    """
+
+    def __init__(self, pages: List[Dict[str, Any]]) -> None:
+        self.pages = pages
+
+    def iter_tasks(self, filter: Any = None, sorts: Any = None) -> Iterator[Dict[str, Any]]:
+        since = (filter or {}).get("last_edited_time", {}).get("on_or_after", "")
+        yield from (p for p in self.pages if p["last_edited_time"] >= since)
+
+
+@pytest.fixture
+def mirror(tmp_path) -> Iterator[TaskMirror]:
+    m = TaskMirror(str(tmp_path / "mirror.db"))
+    yield m
+    m.close()
+
+
+def test_cursor_is_prefixed_and_round_trips(mirror) -> None:
+    mirror.sync(_Source([_page(f"p{i}", f"2025-01-01T09:0{i}:00.000Z", f"작업 {i}") for i in range(5)]))
+    first = mirror.list_tasks(page_size=2)
+    assert first["has_more"] and first["next_cursor"] == "m:2"
+    assert is_mirror_cursor(first["next_cursor"])
+    second = mirror.list_tasks(page_size=2, start_cursor=first["next_cursor"])
+    seen = {p["id"] for p in first["results"]} | {p["id"] for p in second["results"]}
+    assert len(seen) == 4
+
+
+@pytest.mark.parametrize("cursor", ["2", "m:", "m:abc", "3c1f0e2a-notion-cursor"])
+def test_foreign_or_malformed_cursor_is_rejected(mirror, cursor) -> None:
+    with pytest.raises(ValueError):
+        mirror.list_tasks(start_cursor=cursor)
+
+
+def test_full_sync_tombstones_pages_missing_upstream(mirror) -> None:
+    source = _Source([_page("p1", "2025-01-01T09:00:00.000Z", "A"), _page("p2", "2025-01-01T09:01:00.000Z", "B")])
+    mirror.sync(source)
+    # Notion 앱에서 p1을 아카이브: query 결과에서 사라질 뿐 수정 이벤트는 없다
+    source.pages = source.pages[1:]
+    assert mirror.sync(source)["tombstoned"] == 0
+    assert mirror.stats()["active"] == 2
+    assert mirror.full_sync_due(3600)
+    result = mirror.sync(source, full=True)
+    assert result["tombstoned"] == 1
+    assert [p["id"] for p in mirror.list_tasks()["results"]] == ["p2"]
+    assert not mirror.full_sync_due(3600)
+    assert mirror.full_sync_due(0) is False
+
+
+def test_list_rejects_cursor_from_other_source(client, monkeypatch, mirror) -> None:
+    from app.api.v1.endpoints import notion as endpoints
+
+    mirror.sync(_Source([_page("p1", "2025-01-01T09:00:00.000Z", "A")]))
+    monkeypatch.setattr(endpoints, "get_task_mirror", lambda: mirror)
+    assert client.get("/v1/notion/tasks/list", params={"source": "notion", "start_cursor": "m:10"}).status_code == 422
+    assert client.get("/v1/notion/tasks/list", params={"source": "mirror", "start_cursor": "abc"}).status_code == 422
+    assert client.get("/v1/notion/tasks/list", params={"source": "mirror", "start_cursor": "m:x"}).status_code == 422
+    assert client.get("/v1/notion/tasks/list", params={"source": "mirror"}).json()["ok"] is True
+
+
+def test_local_writes_do_not_skip_external_edits(mirror) -> None:
+    source = _Source([_page("p1", "2025-01-01T09:00:00.000Z", "A")])
+    mirror.sync(source)
+    # 동기화 사이에 Notion 앱에서 p2가 생기고, 그 뒤 앱이 직접 쓴 p3 응답이 미러에 반영된다
+    source.pages.append(_page("p2", "2025-01-01T09:05:00.000Z", "B"))
+    local = _page("p3", "2025-01-01T09:10:00.000Z", "C")
+    source.pages.append(local)
+    mirror.upsert_pages([local])
+    assert mirror.watermark == "2025-01-01T09:00:00.000Z"
+
+    mirror.sync(source)
+    assert sorted(p["id"] for p in mirror.list_tasks()["results"]) == ["p1", "p2", "p3"]
+    assert mirror.watermark == "2025-01-01T09:10:00.000Z"
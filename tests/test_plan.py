@@ -0,0 +1,96 @@
+"""
+계획 모드: 같은 대상 호출의 그룹 묶기, 대상 없는 조회는 앞선 대상 호출이 모두 끝난 뒤 실행.
+"""
+
+import asyncio
+import re
+import time
+from typing import Any, Dict, Iterator, List, Tuple
+import pytest
+from bench.fake_llm import ScriptedChatModel
+from app.interface import agent
+from app.interface.agent import plan_groups, plan_stages
+
+
+def _call(name: str, **args: Any) -> Dict[str, Any]:
+    return {"name": name, "args": args}
+
+
+def test_plan_groups_same_target_in_order() -> None:
+    calls = [
+        _call("create_task_tool", title="보고서 작성"),
+        _call("complete_task_smart_tool", task_ref="회의 준비"),
+        _call("update_property_smart_tool", task_ref=" 보고서  작성 ", field="상태", value="진행 중"),
+        _call("list_tasks_tool", page_size=10),
+        _call("list_tasks_tool", page_size=5),
+    ]
+    assert plan_groups(calls) == [[0, 2], [1], [3], [4]]
+
+
+@pytest.mark.parametrize("names, stages", [
+    # "'A' 추가하고 목록 보여줘": 목록은 추가가 끝난 뒤
+    (["create", "list"], [[[0]], [[1]]]),
+    # 목록을 먼저 보여달라고 했으면 쓰기보다 먼저
+    (["list", "create"], [[[0]], [[1]]]),
+    (["list", "create", "complete", "list"], [[[0]], [[1], [2]], [[3]]]),
+    (["create", "list", "complete"], [[[0], [2]], [[1]]]),
+    (["list", "list"], [[[0], [1]]]),
+    (["create", "complete"], [[[0], [1]]]),
+    ([], []),
+])
+def test_plan_stages_run_reads_after_writes(names, stages) -> None:
+    build = {
+        "create": lambda i: _call("create_task_tool", title=f"작업 {i}"),
+        "complete": lambda i: _call("complete_task_smart_tool", task_ref=f"작업 {i}"),
+        "list": lambda i: _call("list_tasks_tool", page_size=10),
+    }
+    assert plan_stages([build[n](i) for i, n in enumerate(names)]) == stages
+
+
+class _Tool:
+    """
+    시작/끝 시점을 기록하는 툴. 쓰기 툴은 조금 늦게 끝난다.
+    """
+
+    def __init__(self, name: str, events: List[Tuple[str, str]]) -> None:
+        self.name = name
+        self.events = events
+        self.delay = 0 if name == "list_tasks_tool" else 0.05
+
+    def invoke(self, args: Dict[str, Any], config: Any = None) -> Dict[str, Any]:
+        self.events.append(("start", self.name))
+        time.sleep(self.delay)
+        self.events.append(("end", self.name))
+        return {"ok": True}
+
+    async def ainvoke(self, args: Dict[str, Any], config: Any = None) -> Dict[str, Any]:
+        self.events.append(("start", self.name))
+        await asyncio.sleep(self.delay)
+        self.events.append(("end", self.name))
+        return {"ok": True}
+
+
+@pytest.fixture
+def events(monkeypatch) -> Iterator[List[Tuple[str, str]]]:
+    from app.llm.chains import set_llm_factory
+
+    rule = (re.compile(r"추가하고 목록"), lambda text, m: [
+        ("create_task_tool", {"title": "A"}),
+        ("list_tasks_tool", {"page_size": 10}),
+    ])
+    set_llm_factory(lambda model: ScriptedChatModel(rules=[rule]))
+    log: List[Tuple[str, str]] = []
+    monkeypatch.setattr(agent, "_tool", lambda name: _Tool(name, log))
+    yield log
+    set_llm_factory(None)
+
+
+@pytest.mark.parametrize("run", [agent.run_plan, lambda text: asyncio.run(agent.arun_plan(text))])
+def test_list_after_create_sees_the_write(events, run) -> None:
+    result = run("'A' 추가하고 목록 보여줘")
+    assert result["ok"] is True
+    assert result["result"]["stages"] == [[[0]], [[1]]]
+    assert events == [
+        ("start", "create_task_tool"), ("end", "create_task_tool"),
+        ("start", "list_tasks_tool"), ("end", "list_tasks_tool"),
+    ]
@@ -0,0 +1,120 @@
+"""
+목록 조회 조건: compile_conditions(Notion filter) / TaskQuery.sql(미러) 표 테스트,
+상태·카테고리 정렬은 출처와 무관하게 DB 옵션 순서.
+"""
+
+from typing import Any, Dict, Iterator, Optional
+import pytest
+from app.services.mirror import TaskMirror
+from app.services.query import TaskQuery, compile_condition, compile_conditions
+
+STATUS_ORDER = ("시작 전", "진행 중", "완료")
+CATEGORY_ORDER = ("💪 Work", "❤️ Family", "⚪️ Public")
+
+
+@pytest.mark.parametrize("prop, op, value, expected", [
+    # 날짜: 지원하는 연산자는 그대로, 그 밖은 equals
+    ("날짜", "on_or_after", "2025-10-01", {"property": "날짜", "date": {"on_or_after": "2025-10-01"}}),
+    ("날짜", "before", "2025-10-01", {"property": "날짜", "date": {"before": "2025-10-01"}}),
+    ("날짜", "contains", "2025-10-01", {"property": "날짜", "date": {"equals": "2025-10-01"}}),
+    ("이벤트 날짜", None, "2025-10-01", {"property": "이벤트 날짜", "date": {"equals": "2025-10-01"}}),
+    # 상태(status)/select: equals 또는 does_not_equal
+    ("상태", "equals", "완료", {"property": "상태", "status": {"equals": "완료"}}),
+    ("상태", "does_not_equal", "완료", {"property": "상태", "status": {"does_not_equal": "완료"}}),
+    ("상태", "contains", "완료", {"property": "상태", "status": {"equals": "완료"}}),
+    ("카테고리", "equals", "💪 Work", {"property": "카테고리", "select": {"equals": "💪 Work"}}),
+    ("장소", "does_not_equal", "집", {"property": "장소", "select": {"does_not_equal": "집"}}),
+    # 제목: 텍스트 연산자는 그대로(equals 포함), 그 밖은 contains
+    ("할 일", "equals", "보고서", {"property": "할 일", "title": {"equals": "보고서"}}),
+    ("할 일", "starts_with", "보고", {"property": "할 일", "title": {"starts_with": "보고"}}),
+    ("할 일", None, "보고서", {"property": "할 일", "title": {"contains": "보고서"}}),
+    ("할 일", "on_or_after", "보고서", {"property": "할 일", "title": {"contains": "보고서"}}),
+])
+def test_compile_condition(prop, op, value, expected) -> None:
+    assert compile_condition(prop, op, value) == expected
+
+
+def test_compile_conditions() -> None:
+    assert compile_conditions([]) is None
+    assert compile_conditions([
+        {"property": "상태", "operator": "equals", "value": "완료"},
+        {"property": "날짜", "operator": "on_or_before", "value": "2025-10-31"},
+    ]) == {"and": [
+        {"property": "상태", "status": {"equals": "완료"}},
+        {"property": "날짜", "date": {"on_or_before": "2025-10-31"}},
+    ]}
+
+
+@pytest.mark.parametrize("query, where, params", [
+    (TaskQuery(), "archived = 0", []),
+    (TaskQuery(status="완료", category="💪 Work"), "archived = 0 AND status = ? AND category = ?", ["완료", "💪 Work"]),
+    (TaskQuery(date_from="2025-10-01", date_to="2025-10-31"),
+     "archived = 0 AND substr(date, 1, 10) >= ? AND substr(date, 1, 10) <= ?", ["2025-10-01", "2025-10-31"]),
+    (TaskQuery(title_contains="보고"), "archived = 0 AND instr(lower(title), lower(?)) > 0", ["보고"]),
+])
+def test_sql_where(query, where, params) -> None:
+    got_where, got_params, order = query.sql()
+    assert (got_where, got_params) == (where, params)
+    assert order == "last_edited_time DESC, page_id"
+
+
+def test_sql_order_params_follow_where_params() -> None:
+    query = TaskQuery(status="완료", sort=[("status", False), ("date", True)], option_order={"status": STATUS_ORDER})
+    where, params, order = query.sql()
+    assert params == ["완료", *STATUS_ORDER]
+    assert order == ("status IS NULL, CASE status WHEN ? THEN 0 WHEN ? THEN 1 WHEN ? THEN 2 ELSE 3 END ASC, "
+                     "date IS NULL, date DESC, page_id")
+
+
+@pytest.mark.parametrize("key", ["status", "category"])
+def test_sql_option_sort_requires_option_order(key) -> None:
+    with pytest.raises(ValueError):
+        TaskQuery(sort=[(key, False)]).sql()
+
+
+def _page(page_id: str, status: Optional[str], category: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "id": page_id,
+        "last_edited_time": "2025-01-01T09:00:00.000Z",
+        "archived": False,
+        "properties": {
+            "할 일": {"type": "title", "title": [{"plain_text": page_id}]},
+            "상태": {"type": "status", "status": {"name": status} if status else None},
+            "카테고리": {"type": "select", "select": {"name": category} if category else None},
+        },
+    }
+
+
+@pytest.fixture
+def mirror(tmp_path) -> Iterator[TaskMirror]:
+    m = TaskMirror(str(tmp_path / "mirror.db"))
+    m.upsert_pages([
+        _page("a", "완료", "⚪️ Public"),
+        _page("b", "시작 전", "❤️ Family"),
+        _page("c", None, None),
+        _page("d", "진행 중", "💪 Work"),
+        _page("e", "보류", None),  # 스키마에 없는 라벨은 알려진 옵션 뒤
+    ])
+    yield m
+    m.close()
+
+
+@pytest.mark.parametrize("sort, expected", [
+    ([("status", False)], ["b", "d", "a", "e", "c"]),
+    ([("status", True)], ["e", "a", "d", "b", "c"]),
+    ([("category", False)], ["d", "b", "a", "c", "e"]),
+])
+def test_mirror_sorts_by_option_order(mirror, sort, expected) -> None:
+    query = TaskQuery(sort=sort, option_order={"status": STATUS_ORDER, "category": CATEGORY_ORDER})
+    assert [p["id"] for p in mirror.list_tasks(query=query)["results"]] == expected
+
+
+def test_list_endpoint_sorts_mirror_by_schema_order(client, monkeypatch, mirror) -> None:
+    from app.api.v1.endpoints import notion as endpoints
+
+    mirror._set_meta("last_sync_at", "2025-01-01T09:00:00Z")
+    monkeypatch.setattr(endpoints, "get_task_mirror", lambda: mirror)
+    r = client.get("/v1/notion/tasks/list", params={"source": "mirror", "sort": "status", "fields": "page_id"})
+    assert r.status_code == 200
+    # 가짜 Notion 스키마의 상태 옵션 순서: 시작 전 → 진행 중 → 완료
+    assert [t["page_id"] for t in r.json()["data"]["results"]] == ["b", "d", "a", "e", "c"]
@@ -0,0 +1,184 @@
+"""
+레이트 리미터: 우선순위 순 토큰 배분, Retry-After 동안 버킷 전체 정지, 생성은 429에서만 재시도.
+시계는 가짜(monotonic/sleep)로 바꿔 실제로 기다리지 않는다.
+"""
+
+import asyncio
+import types
+from typing import Any, Dict, List, Optional
+import httpx
+import pytest
+from notion_client.errors import APIErrorCode, APIResponseError, RequestTimeoutError
+from app.services import ratelimit
+from app.services.ratelimit import BULK, INTERACTIVE, NotionLimiter, TokenBucket, request_priority
+
+_real_sleep = asyncio.sleep
+
+
+class _Clock:
+    """
+    sleep하면 그만큼 시간이 흐르는 가짜 시계(time 모듈 대역).
+    """
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: List[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    async def asleep(self, seconds: float) -> None:
+        self.sleep(seconds)
+        await _real_sleep(0)  # 다른 대기자에게 차례를 넘긴다
+
+
+@pytest.fixture
+def clock(monkeypatch) -> _Clock:
+    fake = _Clock()
+    monkeypatch.setattr(ratelimit, "time", fake)
+    monkeypatch.setattr(ratelimit, "asyncio", types.SimpleNamespace(sleep=fake.asleep))
+    return fake
+
+
+def _api_error(status: int, headers: Optional[Dict[str, str]] = None) -> APIResponseError:
+    code = APIErrorCode.RateLimited if status == 429 else APIErrorCode.InternalServerError
+    return APIResponseError(httpx.Response(status, headers=headers), f"status {status}", code)
+
+
+class _Flaky:
+    """
+    errors를 차례로 던지고 다 쓰면 "ok"를 돌려주는 호출. 호출 시각을 남긴다.
+    """
+
+    def __init__(self, clock: _Clock, *errors: Exception) -> None:
+        self.clock = clock
+        self.errors = list(errors)
+        self.called_at: List[float] = []
+
+    def __call__(self, **kwargs: Any) -> str:
+        self.called_at.append(self.clock.now)
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def test_interactive_waiter_gets_token_before_earlier_bulk(clock) -> None:
+    bucket = TokenBucket(rate=1, burst=1)
+    assert bucket.acquire() == 0.0
+    order: List[str] = []
+
+    async def take(name: str, priority: int) -> None:
+        await bucket.aacquire(priority)
+        order.append(name)
+
+    async def main() -> None:
+        # 일괄 작업 둘이 먼저 줄 서고, 대화형 호출이 나중에 온다
+        await asyncio.gather(take("bulk-1", BULK), take("bulk-2", BULK), take("interactive", INTERACTIVE))
+
+    asyncio.run(main())
+    assert order == ["interactive", "bulk-1", "bulk-2"]
+    assert bucket.queue_depth() == 0
+
+
+def test_priority_comes_from_context(clock) -> None:
+    bucket = TokenBucket(rate=1, burst=1)
+    bucket.acquire()
+    with request_priority(BULK):
+        bulk = bucket._enter(ratelimit._priority.get())
+    interactive = bucket._enter(ratelimit._priority.get())
+    clock.now += 1
+    assert bucket._poll(bulk) > 0
+    assert bucket._poll(interactive) == 0
+    clock.now += 1
+    assert bucket._poll(bulk) == 0
+
+
+def test_retry_after_pauses_the_whole_bucket(clock) -> None:
+    limiter = NotionLimiter(rate=10, burst=10, backoff_base=0)
+    fn = _Flaky(clock, _api_error(429, {"Retry-After": "2"}))
+    assert limiter.call(fn) == "ok"
+    assert fn.called_at == [0.0, 2.0]
+    assert limiter.stats()["rate_limited"] == 1 and limiter.stats()["retries"] == 1
+
+    # 멈춘 동안 다른 호출도 같이 기다린다
+    limiter.bucket.pause(3)
+    assert limiter.bucket.acquire(INTERACTIVE) == pytest.approx(3)
+    assert clock.now == pytest.approx(5)
+
+
+def test_retry_after_without_header_uses_backoff(clock) -> None:
+    limiter = NotionLimiter(rate=0, burst=1, backoff_base=0)
+    fn = _Flaky(clock, _api_error(429), _api_error(429))
+    assert limiter.call(fn) == "ok"
+    assert len(fn.called_at) == 3
+
+
+@pytest.mark.parametrize("error", [
+    _api_error(500),
+    _api_error(502),
+    _api_error(503),
+    RequestTimeoutError(),
+    httpx.ConnectError("connection reset"),
+])
+def test_non_idempotent_call_is_not_retried_on_server_error(clock, error) -> None:
+    limiter = NotionLimiter(rate=0, burst=1)
+    fn = _Flaky(clock, error)
+    with pytest.raises(type(error)):
+        limiter.call(fn, idempotent=False)
+    assert len(fn.called_at) == 1
+    assert clock.sleeps == []
+
+    # 멱등 호출은 같은 오류에서 재시도한다
+    fn = _Flaky(clock, error)
+    assert limiter.call(fn) == "ok"
+    assert len(fn.called_at) == 2
+
+
+def test_non_idempotent_call_is_retried_on_rate_limit(clock) -> None:
+    limiter = NotionLimiter(rate=0, burst=1, backoff_base=0)
+    fn = _Flaky(clock, _api_error(429, {"Retry-After": "1"}))
+    assert limiter.call(fn, idempotent=False) == "ok"
+    assert fn.called_at == [0.0, 1.0]
+
+
+def test_async_call_follows_the_same_policy(clock) -> None:
+    limiter = NotionLimiter(rate=0, burst=1, backoff_base=0)
+
+    async def fail(**kwargs: Any) -> str:
+        raise _api_error(502)
+
+    with pytest.raises(APIResponseError):
+        asyncio.run(limiter.acall(fail, idempotent=False))
+    assert clock.sleeps == []
+
+
+def test_pages_create_is_not_retried_on_5xx(clock, notion_server, monkeypatch) -> None:
+    from app.services.notion_service import get_notion_service
+
+    posted: List[str] = []
+    handle = notion_server.handle
+
+    def failing_pages(method, path, body):
+        if path.startswith("/v1/pages"):
+            posted.append(method)
+            if len(posted) == 1:
+                return 502, {"object": "error", "status": 502, "code": "internal_server_error", "message": "bad gateway"}
+        return handle(method, path, body)
+
+    monkeypatch.setattr(notion_server, "handle", failing_pages)
+    svc = get_notion_service()
+    before = len(notion_server.pages)
+    with pytest.raises(APIResponseError):
+        svc.create_task("재시도 없는 생성")
+    assert posted == ["POST"]
+    assert len(notion_server.pages) == before
+
+    # 같은 502라도 수정(PATCH)은 재시도해서 성공한다
+    posted.clear()
+    page_id = next(iter(notion_server.pages))
+    svc.complete_task(page_id)
+    assert posted == ["PATCH", "PATCH"]
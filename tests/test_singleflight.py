@@ -0,0 +1,94 @@
+"""
+SingleFlight: 동시에 들어온 같은 읽기 요청 합치기.
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+from app.services.singleflight import SingleFlight
+
+
+def test_do_coalesces_concurrent_calls() -> None:
+    flights = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def fn() -> dict:
+        calls.append(1)
+        started.set()
+        time.sleep(0.05)
+        return {"ok": True}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flights.do("k", fn)))
+    leader.start()
+    started.wait()
+    followers = [threading.Thread(target=lambda: results.append(flights.do("k", fn))) for _ in range(3)]
+    for t in followers:
+        t.start()
+    for t in [leader, *followers]:
+        t.join()
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert flights.stats()["upstream_calls"] == 1 and flights.stats()["coalesced"] == 3
+
+
+def test_ado_coalesces_and_shares_errors() -> None:
+    flights = SingleFlight()
+    calls = []
+
+    async def fn() -> dict:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def main() -> list:
+        return await asyncio.gather(*(flights.ado("k", fn) for _ in range(4)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_ado_leader_cancellation_does_not_reach_waiters() -> None:
+    flights = SingleFlight()
+    calls = []
+
+    async def fn() -> dict:
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"ok": True}
+
+    async def main() -> tuple:
+        leader = asyncio.create_task(flights.ado("k", fn))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flights.ado("k", fn))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        result = await waiter
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return result, flights.stats()
+
+    result, stats = asyncio.run(main())
+    assert result == {"ok": True}
+    assert len(calls) == 1
+    assert stats["in_flight"] == 0 and stats["upstream_calls"] == 1 and stats["coalesced"] == 1
+
+
+def test_ado_disabled_runs_every_call() -> None:
+    flights = SingleFlight(enabled=False)
+    calls = []
+
+    async def fn() -> int:
+        calls.append(1)
+        n = len(calls)
+        await asyncio.sleep(0)
+        return n
+
+    async def main() -> list:
+        return await asyncio.gather(*(flights.ado("k", fn) for _ in range(3)))
+
+    assert sorted(asyncio.run(main())) == [1, 2, 3]
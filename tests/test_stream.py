@@ -0,0 +1,64 @@
+"""
+/tasks/stream: 첫 페이지 오류는 공통 오류 응답으로, limit만큼만 조회.
+"""
+
+import json
+import httpx
+from notion_client.errors import APIErrorCode, APIResponseError
+from app.services.notion_service import AsyncNotionTaskService
+
+
+def _lines(r) -> list:
+    return [json.loads(line) for line in r.text.splitlines() if line]
+
+
+def test_stream_all_pages(client, notion_server) -> None:
+    r = client.get("/v1/notion/tasks/stream")
+    assert r.status_code == 200
+    assert len(_lines(r)) == len(notion_server.pages)
+
+
+def _record_queries(notion_server, monkeypatch) -> list:
+    bodies = []
+    handle = notion_server.handle
+
+    def recording(method, path, body):
+        if path.endswith("/query"):
+            bodies.append(body)
+        return handle(method, path, body)
+
+    monkeypatch.setattr(notion_server, "handle", recording)
+    return bodies
+
+
+def test_stream_queries_only_what_limit_needs(client, notion_server, monkeypatch) -> None:
+    bodies = _record_queries(notion_server, monkeypatch)
+    r = client.get("/v1/notion/tasks/stream", params={"limit": 2})
+    assert r.status_code == 200
+    assert len(_lines(r)) == 2
+    # page_size=2로 한 번만 조회하고, 다음 페이지(has_more)는 당기지 않는다
+    assert [b["page_size"] for b in bodies] == [2]
+
+
+def test_stream_limit_at_page_boundary_does_not_fetch_next_page(client, notion_server, monkeypatch) -> None:
+    bodies = _record_queries(notion_server, monkeypatch)
+    r = client.get("/v1/notion/tasks/stream", params={"limit": len(notion_server.pages) - 1})
+    assert len(_lines(r)) == len(notion_server.pages) - 1
+    assert len(bodies) == 1
+
+
+def test_stream_rejects_non_positive_limit(client, notion_server) -> None:
+    before = notion_server.request_count
+    for limit in (0, -1):
+        assert client.get("/v1/notion/tasks/stream", params={"limit": limit}).status_code == 422
+    assert notion_server.request_count == before
+
+
+def test_stream_first_page_error_is_not_a_200_stream(client, monkeypatch) -> None:
+    async def not_found(self, *args, **kwargs):
+        raise APIResponseError(httpx.Response(404), "database not found", APIErrorCode.ObjectNotFound)
+        yield  # pragma: no cover - 비동기 제너레이터로 만들기 위함
+
+    monkeypatch.setattr(AsyncNotionTaskService, "iter_tasks", not_found)
+    r = client.get("/v1/notion/tasks/stream")
+    assert r.status_code == 404
@@ -0,0 +1,101 @@
+"""
+normalize_korean_relative_dates 표현별 기대값(기준일 2025-10-15 수요일 고정).
+bench/bench_dates.py도 같은 CORPUS로 검증/측정한다.
+"""
+
+from datetime import date
+
+import pytest
+
+from app.core.time import normalize_korean_relative_dates
+
+TODAY = "2025-10-15"
+
+# (입력, 기대 출력)
+CORPUS = [
+    ("오늘 할 일 보여줘", "2025-10-15 할 일 보여줘"),
+    ("내일부터 운동", "2025-10-16부터 운동"),
+    ("모레 '보고서' 추가", "2025-10-17 '보고서' 추가"),
+    ("내일모레까지", "2025-10-17까지"),
+    ("글피에 회의", "2025-10-18에 회의"),
+    ("어제 한 일", "2025-10-14 한 일"),
+    ("그저께 만든 작업", "2025-10-13 만든 작업"),
+    ("다음주 금요일에 '건강검진 예약' 추가해줘", "2025-10-24에 '건강검진 예약' 추가해줘"),
+    ("다음 주 월요일", "2025-10-20"),
+    ("이번 주 금요일까지", "2025-10-17까지"),
+    ("이번주 월요일", "2025-10-13"),
+    ("지난주 목요일", "2025-10-09"),
+    ("저번 주 일요일", "2025-10-12"),
+    ("다다음주 화요일", "2025-10-28"),
+    ("담주 수욜", "2025-10-22"),
+    ("차주 목요일", "2025-10-23"),
+    ("다음 금요일", "2025-10-24"),
+    ("이번 주말", "2025-10-18"),
+    ("다음 주말에 여행", "2025-10-25에 여행"),
+    ("금요일에 제출", "2025-10-17에 제출"),
+    ("수요일", "2025-10-15"),
+    ("월요일까지", "2025-10-20까지"),
+    ("매주 금요일 회의", "매주 금요일 회의"),
+    ("매주금요일", "매주금요일"),
+    ("매 주 월요일", "매 주 월요일"),
+    ("매주 월요일", "매주 월요일"),
+    ("3일 후", "2025-10-18"),
+    ("10일 뒤에 마감", "2025-10-25에 마감"),
+    ("2일 전", "2025-10-13"),
+    ("2주 후", "2025-10-29"),
+    ("1주일 뒤", "2025-10-22"),
+    ("일주일 후", "2025-10-22"),
+    ("일주일 뒤에 회의", "2025-10-22에 회의"),
+    ("일주일 전", "2025-10-08"),
+    ("3개월 후", "2026-01-15"),
+    ("이틀 후", "2025-10-17"),
+    ("열흘 뒤", "2025-10-25"),
+    ("사흘 전", "2025-10-12"),
+    ("11월 3일에 '치과' 추가", "2025-11-03에 '치과' 추가"),
+    ("2026년 1월 2일", "2026-01-02"),
+    ("1월 1일", "2026-01-01"),
+    ("10월 1일까지", "2026-10-01까지"),
+    ("10월 15일", "2025-10-15"),
+    ("2024년 2월 29일", "2024-02-29"),
+    ("2월 30일", "2월 30일"),
+    ("다음 달 5일", "2025-11-05"),
+    ("다음달 말까지", "2025-11-30까지"),
+    ("내달 1일", "2025-11-01"),
+    ("이번 달 말", "2025-10-31"),
+    ("지난달 20일", "2025-09-20"),
+    ("다음 달", "다음 달"),
+    ("'보고서 작성' 완료 처리해줘", "'보고서 작성' 완료 처리해줘"),
+    ("2025-10-20으로 미뤄줘", "2025-10-20으로 미뤄줘"),
+    ("내일 '운동', 다음주 월요일 '회의' 추가", "2025-10-16 '운동', 2025-10-20 '회의' 추가"),
+    # 따옴표 안(작업 제목)은 그대로
+    ("'월요일 회의 준비' 완료 처리해줘", "'월요일 회의 준비' 완료 처리해줘"),
+    ("'3월 1일 기념식 준비' 내일까지 추가", "'3월 1일 기념식 준비' 2025-10-16까지 추가"),
+    ("\"내일 할 일\" 삭제", "\"내일 할 일\" 삭제"),
+    ("「다음 주 금요일 발표」 완료", "「다음 주 금요일 발표」 완료"),
+    ("'그제서야'", "'그제서야'"),
+    # 반복 일정은 그대로
+    ("월요일마다 운동", "월요일마다 운동"),
+    ("금요일 마다", "금요일 마다"),
+    ("매 월요일 회의", "매 월요일 회의"),
+    # 단독 단어는 조사만 붙었을 때 바꾼다
+    ("그제서야 알았다", "그제서야 알았다"),
+    ("오늘날의 일정", "오늘날의 일정"),
+    ("내일이면 끝", "2025-10-16이면 끝"),
+    ("오늘은 쉬기", "2025-10-15은 쉬기"),
+    ("어제랑 오늘", "2025-10-14랑 2025-10-15"),
+    ("금요일에도 회의", "2025-10-17에도 회의"),
+]
+
+
+@pytest.mark.parametrize("text, expected", CORPUS)
+def test_corpus(text, expected):
+    assert normalize_korean_relative_dates(text, today=TODAY) == expected
+
+
+def test_accepts_date_object():
+    assert normalize_korean_relative_dates("내일", today=date(2025, 12, 31)) == "2026-01-01"
+
+
+def test_leap_day_rolls_to_next_valid_year():
+    # 올해 2월 29일이 없으면 내년 것을 쓴다
+    assert normalize_korean_relative_dates("2월 29일", today="2027-03-01") == "2028-02-29"
@@ -0,0 +1,112 @@
+"""
+제목 인덱스: 매칭, 전체 재구성, 원천에서 사라진 페이지 제거, watermark는 갱신만 전진.
+"""
+
+from typing import Any, Dict, List
+import pytest
+from notion_client.errors import APIResponseError
+from app.core.config import Settings
+from app.services.notion_service import NotionTaskService
+from app.services.title_index import TitleIndex
+
+
+def _page(page_id: str, title: str, edited: str = "2025-01-01T09:00:00.000Z", archived: bool = False) -> Dict[str, Any]:
+    return {
+        "id": page_id,
+        "last_edited_time": edited,
+        "archived": archived,
+        "properties": {"할 일": {"title": [{"plain_text": title}]}},
+    }
+
+
+def test_lookup_tolerates_spacing_and_particles() -> None:
+    index = TitleIndex()
+    index.apply([_page("p1", "보고서 작성"), _page("p2", "장보기")])
+    assert index.lookup("보고서작성") == "p1"
+    assert index.lookup("'장보기'를") == "p2"
+    assert index.lookup("없는 작업") is None
+
+
+def test_replace_drops_pages_missing_from_full_listing() -> None:
+    index = TitleIndex()
+    index.apply([_page("p1", "A"), _page("p2", "B")])
+    # 증분 갱신은 아카이브된 페이지를 받지 못하므로 p1이 남는다
+    index.apply([_page("p2", "B", edited="2025-01-01T09:05:00.000Z")])
+    assert index.lookup("A") == "p1"
+    index.replace([_page("p2", "B", edited="2025-01-01T09:05:00.000Z")])
+    assert index.lookup("A") is None and index.lookup("B") == "p2"
+    assert index.watermark == "2025-01-01T09:05:00.000Z"
+
+
+def _query(pages: List[Dict[str, Any]], body: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # delta_query 본문의 on_or_after 필터만 흉내 낸다
+    since = (body.get("filter") or {}).get("last_edited_time", {}).get("on_or_after", "")
+    return [p for p in pages if p["last_edited_time"] >= since]
+
+
+def test_local_writes_do_not_skip_external_edits() -> None:
+    upstream = [_page("p1", "A", edited="2025-01-01T09:00:00.000Z")]
+    index = TitleIndex()
+    index.replace(_query(upstream, index.delta_query(full=True)))
+    index.mark_refreshed(full=True)
+    # 갱신 사이에 Notion 앱에서 p2가 생기고, 그 뒤 앱이 직접 쓴 p3 응답과 검색 결과가 반영된다
+    upstream.append(_page("p2", "외부 작업", edited="2025-01-01T09:05:00.000Z"))
+    local = _page("p3", "로컬 작업", edited="2025-01-01T09:10:00.000Z")
+    upstream.append(local)
+    index.apply([local])
+    assert index.watermark == "2025-01-01T09:00:00.000Z"
+
+    index.apply(_query(upstream, index.delta_query()), advance_watermark=True)
+    assert index.lookup("외부 작업") == "p2" and index.lookup("로컬 작업") == "p3"
+    assert index.watermark == "2025-01-01T09:10:00.000Z"
+
+
+def test_rebuild_due_and_full_query() -> None:
+    index = TitleIndex(rebuild_sec=600)
+    assert index.rebuild_due()
+    index.replace([_page("p1", "A")])
+    index.mark_refreshed(full=True)
+    assert not index.rebuild_due()
+    assert "filter" in index.delta_query()
+    assert "filter" not in index.delta_query(full=True)
+    index.last_rebuild -= 601
+    assert index.rebuild_due()
+    never = TitleIndex(rebuild_sec=0)
+    never.mark_refreshed(full=True)
+    never.last_rebuild -= 10 ** 6
+    assert not never.rebuild_due()
+
+
+def test_write_to_missing_page_evicts_it_from_index(notion_server) -> None:
+    index = TitleIndex()
+    svc = NotionTaskService(Settings.from_env(), index=index)
+    try:
+        svc.refresh_title_index()
+        ghost = "e" * 32
+        index.apply([_page(ghost, "사라진 작업", edited="2099-01-01T00:00:00.000Z")])
+        assert svc.resolve_task_id("사라진 작업") == ghost
+        with pytest.raises(APIResponseError):
+            svc.complete_task(ghost)
+        assert index.lookup("사라진 작업") is None
+    finally:
+        svc.close()
+
+
+def test_full_rebuild_removes_pages_archived_upstream(notion_server) -> None:
+    index = TitleIndex(rebuild_sec=600)
+    svc = NotionTaskService(Settings.from_env(), index=index)
+    page_id, page = next((i, p) for i, p in notion_server.pages.items() if not p["archived"])
+    title = "".join(t["plain_text"] for t in page["properties"]["할 일"]["title"])
+    try:
+        svc.refresh_title_index()
+        assert index.lookup(title) == page_id
+        page["archived"] = True
+        svc.refresh_title_index()  # 증분: 아카이브를 알 수 없다
+        assert index.lookup(title) == page_id
+        index.last_rebuild -= 601
+        svc.refresh_title_index()  # 전체 재구성
+        assert index.lookup(title) != page_id
+        assert index.stats()["rebuilds"] == 2
+    finally:
+        page["archived"] = False
+        svc.close()
@@ -0,0 +1,163 @@
+"""
+트레이싱: 요청 → 에이전트 → 툴 → 서비스 메서드 → Notion 호출의 부모-자식 연결,
+traceparent 해석/전파, 오류 상태. 가짜 Notion과 각본 LLM으로 오프라인 실행한다.
+"""
+
+from typing import Dict, Iterator, List
+import pytest
+from notion_client.errors import APIResponseError
+from bench.fake_llm import ScriptedChatModel
+from app.core.config import get_settings
+from app.core.tracing import InMemoryExporter, Span, parse_traceparent, set_exporter, span
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+TRACEPARENT = f"00-{TRACE_ID}-{PARENT_ID}-01"
+
+
+@pytest.fixture
+def exporter() -> Iterator[InMemoryExporter]:
+    exporter = InMemoryExporter()
+    set_exporter(exporter)
+    yield exporter
+    set_exporter(None)
+
+
+@pytest.fixture
+def traced_client(exporter: InMemoryExporter) -> Iterator["TestClient"]:
+    # 트레이싱 미들웨어는 앱을 만들 때 등록되므로 exporter를 바꾼 뒤 새 앱을 만든다
+    from fastapi.testclient import TestClient
+    from app.llm.chains import set_llm_factory
+    from app.main import create_app
+
+    set_llm_factory(lambda model: ScriptedChatModel())
+    with TestClient(create_app()) as c:
+        exporter.clear()
+        yield c
+    set_llm_factory(None)
+
+
+def _by_name(spans: List[Span]) -> Dict[str, Span]:
+    return {s.name: s for s in spans}
+
+
+def _chain(spans: List[Span], leaf: Span) -> List[str]:
+    # leaf에서 루트까지 parent_id를 따라 올라간 span 이름들
+    by_id = {s.span_id: s for s in spans}
+    names = []
+    node = leaf
+    while node is not None:
+        names.append(node.name)
+        node = by_id.get(node.parent_id)
+    return names
+
+
+# -------- traceparent --------
+def test_parse_traceparent():
+    assert parse_traceparent(TRACEPARENT) == (TRACE_ID, PARENT_ID)
+    assert parse_traceparent(f"  {TRACEPARENT.upper()}  ") == (TRACE_ID, PARENT_ID)
+
+
+@pytest.mark.parametrize("header", [
+    None,
+    "",
+    f"01-{TRACE_ID}-{PARENT_ID}-01",
+    f"00-{TRACE_ID[:-1]}-{PARENT_ID}-01",
+    f"00-{TRACE_ID}-{PARENT_ID}",
+    f"00-{TRACE_ID}-{PARENT_ID}-01-extra",
+    f"00-{'z' * 32}-{PARENT_ID}-01",
+])
+def test_parse_traceparent_rejects_malformed(header):
+    assert parse_traceparent(header) is None
+
+
+# -------- span 연결 --------
+@pytest.mark.parametrize("text, tool", [
+    ("'보고서' 추가해줘", "create_task_tool"),  # fast-path
+    ("요즘 뭐 하고 있었지", "list_tasks_tool"),  # LLM(각본) 경로
+])
+def test_agent_request_chain(traced_client, exporter, text, tool):
+    r = traced_client.post("/v1/notion/agent", json={"text": text}, headers={"traceparent": TRACEPARENT})
+    assert r.status_code == 200
+
+    spans = exporter.spans
+    assert spans and all(s.trace_id == TRACE_ID for s in spans)
+    names = _by_name(spans)
+    root = next(s for s in spans if s.parent_id == PARENT_ID)
+    assert root.attributes["http.route"].endswith("/agent")
+    assert root.attributes["http.status_code"] == 200
+
+    http = next(s for s in spans if s.name == "notion.http")
+    service = next(n for n in _chain(spans, http)[1:] if n.startswith("notion."))
+    assert _chain(spans, http) == ["notion.http", service, f"tool.{tool}", "agent.run", root.name]
+    assert names[f"tool.{tool}"].attributes["tool.ok"] is True
+    assert all(s.status == "ok" for s in spans)
+
+    # 응답 traceparent는 같은 trace의 요청 span을 가리킨다
+    assert parse_traceparent(r.headers["traceparent"]) == (TRACE_ID, root.span_id)
+
+
+def test_request_without_traceparent_starts_new_trace(traced_client, exporter):
+    r = traced_client.get("/v1/notion/tasks/list")
+    assert r.status_code == 200
+
+    trace_id, span_id = parse_traceparent(r.headers["traceparent"])
+    root = next(s for s in exporter.spans if s.span_id == span_id)
+    assert root.parent_id is None and root.trace_id == trace_id
+    assert all(s.trace_id == trace_id for s in exporter.spans)
+
+
+def test_invalid_traceparent_is_ignored(traced_client, exporter):
+    r = traced_client.get("/v1/notion/tasks/list", headers={"traceparent": "garbage"})
+    trace_id, span_id = parse_traceparent(r.headers["traceparent"])
+    root = next(s for s in exporter.spans if s.span_id == span_id)
+    assert root.parent_id is None and trace_id != TRACE_ID
+
+
+# -------- 오류 상태 --------
+def test_span_records_exception(exporter):
+    with pytest.raises(RuntimeError):
+        with span("outer"):
+            with span("inner"):
+                raise RuntimeError("boom")
+
+    names = _by_name(exporter.spans)
+    assert names["inner"].status == names["outer"].status == "error"
+    assert names["inner"].error == "RuntimeError: boom"
+    assert names["inner"].parent_id == names["outer"].span_id
+
+
+def test_notion_error_marks_service_and_http_spans(exporter):
+    from app.services.notion_service import NotionTaskService
+
+    svc = NotionTaskService(get_settings())
+    try:
+        with pytest.raises(APIResponseError):
+            svc.get_task("ffffffffffffffffffffffffffffffff")
+    finally:
+        svc.close()
+
+    names = _by_name(exporter.spans)
+    assert names["notion.get_task"].status == "error"
+    assert "APIResponseError" in names["notion.get_task"].error
+    assert names["notion.http"].status == "error"
+    assert names["notion.http"].parent_id == names["notion.get_task"].span_id
+
+
+def test_server_error_marks_request_span(traced_client, exporter, monkeypatch):
+    from app.api.v1.endpoints import notion as endpoints
+
+    class _BrokenAgent:
+        async def arun_agent(self, text: str) -> dict:
+            raise RuntimeError("boom")
+
+    async def broken_agent():
+        return _BrokenAgent()
+
+    monkeypatch.setattr(endpoints, "aload_agent", broken_agent)
+    r = traced_client.post("/v1/notion/agent", json={"text": "아무거나"})
+    assert r.status_code == 500
+
+    root = next(s for s in exporter.spans if s.parent_id is None)
+    assert root.status == "error"
+    assert root.attributes["http.status_code"] == 500
@@ -0,0 +1,227 @@
+"""
+지연 쓰기 저널: 반영(flush) 순서/백오프/실패 처리, 중단된 작업 복구와 수동 재시도.
+"""
+
+import asyncio
+import sqlite3
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+import pytest
+from notion_client.errors import APIErrorCode, APIResponseError, RequestTimeoutError
+from app.services.write_queue import DONE, FAILED, PENDING, REVIEW, WriteQueue
+
+
+@pytest.fixture
+def journal(tmp_path) -> str:
+    return str(tmp_path / "journal.db")
+
+
+def _api_error(status: int) -> APIResponseError:
+    code = APIErrorCode.RateLimited if status == 429 else APIErrorCode.InternalServerError
+    if status == 400:
+        code = APIErrorCode.ValidationError
+    return APIResponseError(httpx.Response(status), f"status {status}", code)
+
+
+class _Service:
+    """
+    flush가 부르는 서비스 메서드만 흉내 낸다. errors[(메서드, 대상)]에 넣은 예외를 차례로 던진다.
+    """
+
+    def __init__(self, errors: Optional[Dict[Tuple[str, str], List[Exception]]] = None) -> None:
+        self.calls: List[Tuple[str, str]] = []
+        self.errors = errors or {}
+
+    async def _run(self, method: str, target: str) -> Dict[str, Any]:
+        self.calls.append((method, target))
+        await asyncio.sleep(0.01 if method == "update_task" else 0)  # 먼저 시작한 작업이 늦게 끝나도록
+        pending = self.errors.get((method, target))
+        if pending:
+            raise pending.pop(0)
+        return {"id": target, "properties": {}}
+
+    async def create_task(self, title: str, **kwargs: Any) -> Dict[str, Any]:
+        return await self._run("create_task", title)
+
+    async def update_task(self, task_id: str, patch: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._run("update_task", task_id)
+
+    async def complete_task(self, task_id: str) -> Dict[str, Any]:
+        return await self._run("complete_task", task_id)
+
+    async def delete_task(self, task_id: str) -> Dict[str, Any]:
+        return await self._run("delete_task", task_id)
+
+
+def _ready_now(path: str) -> None:
+    # 백오프 대기를 건너뛴다
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE ops SET next_attempt_at = 0")
+
+
+def test_flush_applies_ops(journal) -> None:
+    queue = WriteQueue(journal)
+    try:
+        ids = [
+            queue.enqueue({"op": "create", "title": "새 작업"})["op_id"],
+            queue.enqueue({"op": "complete", "task_id": "p1"})["op_id"],
+            queue.enqueue({"op": "archive", "task_id": "p2"})["op_id"],
+        ]
+        svc = _Service()
+        assert asyncio.run(queue.flush(svc)) == 3
+        assert sorted(svc.calls) == [("complete_task", "p1"), ("create_task", "새 작업"), ("delete_task", "p2")]
+        assert all(queue.get(i)["status"] == DONE for i in ids)
+        assert queue.get(ids[1])["result"]["id"] == "p1"
+        assert asyncio.run(queue.flush(svc)) == 0
+    finally:
+        queue.close()
+
+
+def test_flush_keeps_journal_order_per_task(journal) -> None:
+    queue = WriteQueue(journal)
+    try:
+        queue.enqueue({"op": "update", "task_id": "p1", "patch": {"상태": "진행 중"}})
+        queue.enqueue({"op": "complete", "task_id": "p1"})
+        queue.enqueue({"op": "complete", "task_id": "p2"})
+        svc = _Service()
+        # 한 묶음에는 task_id마다 가장 앞선 작업 하나만
+        assert asyncio.run(queue.flush(svc)) == 2
+        assert asyncio.run(queue.flush(svc)) == 1
+        assert [c for c in svc.calls if c[1] == "p1"] == [("update_task", "p1"), ("complete_task", "p1")]
+        assert queue.stats()[DONE] == 3
+    finally:
+        queue.close()
+
+
+def test_transient_error_backs_off_then_fails(journal) -> None:
+    queue = WriteQueue(journal, max_attempts=2, backoff_base_sec=60)
+    try:
+        op_id = queue.enqueue({"op": "complete", "task_id": "p1"})["op_id"]
+        later = queue.enqueue({"op": "update", "task_id": "p1", "patch": {"상태": "완료"}})["op_id"]
+        svc = _Service({("complete_task", "p1"): [_api_error(502), _api_error(502)]})
+
+        assert asyncio.run(queue.flush(svc)) == 1
+        op = queue.get(op_id)
+        assert op["status"] == PENDING and op["attempts"] == 1 and "502" in op["error"]
+        # 백오프 중에는 다시 가져가지 않고, 같은 task_id의 뒤 작업도 기다린다
+        assert asyncio.run(queue.flush(svc)) == 0
+        assert queue.get(later)["status"] == PENDING
+
+        _ready_now(journal)
+        assert asyncio.run(queue.flush(svc)) == 1
+        assert queue.get(op_id)["status"] == FAILED and queue.get(op_id)["attempts"] == 2
+        # 앞 작업이 실패로 끝나면 뒤 작업이 진행된다
+        assert asyncio.run(queue.flush(svc)) == 1
+        assert queue.get(later)["status"] == DONE
+    finally:
+        queue.close()
+
+
+def test_permanent_error_fails_immediately(journal) -> None:
+    queue = WriteQueue(journal, max_attempts=5)
+    try:
+        op_id = queue.enqueue({"op": "complete", "task_id": "p1"})["op_id"]
+        asyncio.run(queue.flush(_Service({("complete_task", "p1"): [_api_error(400)]})))
+        op = queue.get(op_id)
+        assert op["status"] == FAILED and op["attempts"] == 1
+    finally:
+        queue.close()
+
+
+@pytest.mark.parametrize("error, status", [
+    (RequestTimeoutError(), REVIEW),
+    (httpx.ConnectError("connection reset"), REVIEW),
+    (_api_error(502), REVIEW),
+    (_api_error(429), PENDING),
+    (_api_error(400), FAILED),
+])
+def test_create_retries_only_on_rate_limit(journal, error, status) -> None:
+    queue = WriteQueue(journal, backoff_base_sec=60)
+    try:
+        op_id = queue.enqueue({"op": "create", "title": "새 작업"})["op_id"]
+        asyncio.run(queue.flush(_Service({("create_task", "새 작업"): [error]})))
+        assert queue.get(op_id)["status"] == status
+        if status == REVIEW:
+            assert "생성 여부" in queue.get(op_id)["error"]
+            _ready_now(journal)
+            assert queue._claim() == []
+    finally:
+        queue.close()
+
+
+def test_async_create_rejects_unknown_category(client) -> None:
+    r = client.post(
+        "/v1/notion/tasks/create",
+        params={"async_write": "true"},
+        json={"title": "새 작업", "priority": "없는 카테고리"},
+    )
+    assert r.status_code == 422
+    assert r.json()["error"] == "schema_validation"
+
+
+def _interrupt(path: str) -> None:
+    # 워커가 반영 도중 프로세스가 죽은 상태를 만든다(모든 작업이 running)
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE ops SET status = 'running'")
+
+
+def test_interrupted_create_is_held_for_review(journal) -> None:
+    queue = WriteQueue(journal)
+    create = queue.enqueue({"op": "create", "title": "새 작업"})["op_id"]
+    update = queue.enqueue({"op": "complete", "task_id": "p1"})["op_id"]
+    queue.close()
+    _interrupt(journal)
+
+    queue = WriteQueue(journal)
+    try:
+        assert queue.get(create)["status"] == REVIEW
+        assert "생성 여부" in queue.get(create)["error"]
+        assert queue.get(update)["status"] == PENDING
+        # review 작업은 워커가 다시 가져가지 않는다
+        assert [op["op"] for _, op in queue._claim()] == ["complete"]
+        assert queue.stats()[REVIEW] == 1
+    finally:
+        queue.close()
+
+
+def test_requeue_only_review_or_failed(journal) -> None:
+    queue = WriteQueue(journal)
+    op_id = queue.enqueue({"op": "create", "title": "새 작업"})["op_id"]
+    queue.close()
+    _interrupt(journal)
+    queue = WriteQueue(journal)
+    try:
+        assert queue.requeue(op_id) == {"op_id": op_id, "status": PENDING}
+        with pytest.raises(ValueError):
+            queue.requeue(op_id)
+        assert queue.requeue("missing") is None
+        claimed = queue._claim()
+        assert [i for i, _ in claimed] == [op_id]
+        queue._finish(op_id, {"id": "p1", "properties": {}})
+        assert queue.get(op_id)["status"] == DONE
+    finally:
+        queue.close()
+
+
+def test_shutdown_closes_journal_and_mirror(monkeypatch, tmp_path) -> None:
+    from dataclasses import replace
+    from fastapi.testclient import TestClient
+    from app import main
+    from app.core.config import get_settings
+    from app.services import mirror, write_queue
+
+    settings = replace(
+        get_settings(),
+        write_journal_path=str(tmp_path / "journal.db"),
+        mirror_db_path=str(tmp_path / "mirror.db"),
+    )
+    for module in (main, mirror, write_queue):
+        monkeypatch.setattr(module, "get_settings", lambda: settings)
+    with TestClient(main.app):
+        queue, task_mirror = write_queue.get_write_queue(), mirror.get_task_mirror()
+        assert queue is not None and task_mirror is not None
+    assert write_queue._queue is None and mirror._mirror is None
+    with pytest.raises(sqlite3.ProgrammingError):
+        queue.stats()
+    with pytest.raises(sqlite3.ProgrammingError):
+        task_mirror.stats()